@@ -25,8 +25,14 @@ def create_app():
     db.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
-    from .commands import create_admin_command
+    from .commands import (create_admin_command, check_query_plans_command, seed_synthetic_command, run_workers_command,
+                           holidays_command, scheduler_command)
     app.cli.add_command(create_admin_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(seed_synthetic_command)
+    app.cli.add_command(run_workers_command)
+    app.cli.add_command(holidays_command)
+    app.cli.add_command(scheduler_command)
     
     from . import models
     from .routes.main_routes import main_bp
@@ -36,6 +42,7 @@ def create_app():
     from .routes.mentee_routes import mentee_bp
     from .routes.api_routes import api_bp
     from .utils.__init__ import init_app_utils
+    from .utils.sql_instrumentation import init_sql_instrumentation
 
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp) # FIX: Removed url_prefix='/auth'
@@ -45,6 +52,7 @@ def create_app():
     app.register_blueprint(api_bp, url_prefix='/api')
 
     init_app_utils(app) 
+    init_sql_instrumentation(app)
     app.jinja_env.globals['timedelta'] = timedelta
     app.jinja_env.filters['nl2br'] = nl2br
     
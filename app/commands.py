@@ -1,10 +1,21 @@
 # app/commands.py
 
+import time
 import click
+from datetime import date
 from flask.cli import with_appcontext
+from sqlalchemy import select, text
 from werkzeug.security import generate_password_hash
-from .models import User
+from .models import (
+    User, AttendanceRecord, LeaveRequest, Session, MentorAssignment, PlacementInformation, ResearchRecord,
+    AcademicSemesterMarkDetails, HonorsMinorMarksDetails, MentorMeetingDetails, AwardsAndAchievements,
+    CocurricularActivityRecord, ExtracurricularActivityRecord, InternshipInformation, Holiday
+)
 from . import db
+from .utils.synthetic_data import generate_synthetic_data, synthetic_data_exists
+from .utils.bulk_reports import get_report_worker_count
+from .utils.report_jobs import run_report_workers
+from .utils.periodic_jobs import PERIODIC_JOBS, acquire_scheduler_lock, run_periodic_job, run_scheduler
 
 @click.command(name='create-admin')
 @with_appcontext
@@ -25,4 +36,152 @@ def create_admin_command():
     )
     db.session.add(admin_user)
     db.session.commit()
-    print('Admin user created successfully.')
\ No newline at end of file
+    print('Admin user created successfully.')
+
+def hot_queries():
+    """(label, statement) pairs for the lookups the routes and report generator run most often."""
+    queries = []
+    for model in (AttendanceRecord, LeaveRequest, PlacementInformation, ResearchRecord, AcademicSemesterMarkDetails,
+                  HonorsMinorMarksDetails, MentorMeetingDetails, AwardsAndAchievements, CocurricularActivityRecord,
+                  ExtracurricularActivityRecord, InternshipInformation):
+        table = model.__tablename__
+        queries.append((f"{table} by session and mentee", select(model).where(model.session_id == 1, model.mentee_id == 1)))
+        queries.append((f"{table} by mentee", select(model).where(model.mentee_id == 1)))
+    queries.append(("sessions by assignment", select(Session).where(Session.mentor_assignment_id == 1).order_by(Session.start_time)))
+    queries.append(("open sessions by start time", select(Session).where(Session.has_effective_status('Upcoming', 'Live'))))
+    queries.append(("active assignment by batch", select(MentorAssignment).where(MentorAssignment.batch_id == 1, MentorAssignment.is_active == True)))
+    return queries
+
+def explain_plan(statement):
+    """Returns the plan lines for a statement and whether any of them is a full table scan."""
+    dialect_name = db.engine.dialect.name
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+
+    if dialect_name == 'sqlite':
+        lines = [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        return lines, any(line.startswith('SCAN ') for line in lines)
+
+    if dialect_name == 'postgresql':
+        # Tiny tables are cheaper to scan than to probe, so ask whether an index is usable at all.
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    lines = [row[0] for row in db.session.execute(text(f"EXPLAIN {sql}"))]
+    return lines, any('Seq Scan' in line for line in lines)
+
+@click.command(name='check-query-plans')
+@click.option('--verbose', is_flag=True, help='Print the full plan of every query.')
+@with_appcontext
+def check_query_plans_command(verbose):
+    """Runs EXPLAIN on the hot queries and fails if any of them needs a sequential scan."""
+    failures = []
+    for label, statement in hot_queries():
+        lines, has_scan = explain_plan(statement)
+        print(f"{'SCAN' if has_scan else 'ok  '} {label}")
+        if verbose or has_scan:
+            for line in lines:
+                print(f"       {line}")
+        if has_scan:
+            failures.append(label)
+    db.session.rollback()
+
+    if failures:
+        print(f"{len(failures)} hot queries fall back to a sequential scan.")
+        raise SystemExit(1)
+    print('All hot queries use an index.')
+
+@click.command(name='seed-synthetic')
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed and anchor date give identical data.')
+@click.option('--classes', default=200, show_default=True)
+@click.option('--mentees', default=50000, show_default=True)
+@click.option('--mentors', default=800, show_default=True)
+@click.option('--weeks', default=104, show_default=True, help='Weekly sessions per batch, half before and half after the anchor date.')
+@click.option('--batch-size', default=25, show_default=True)
+@click.option('--record-rate', default=0.05, show_default=True, help='Share of attended (session, mentee) pairs with a record.')
+@click.option('--anchor-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Date the schedule is centred on. Defaults to today.')
+@click.option('--password', default='password', show_default=True, help='Password for every generated user.')
+@click.option('--chunk-size', default=5000, show_default=True)
+@with_appcontext
+def seed_synthetic_command(seed, classes, mentees, mentors, weeks, batch_size, record_rate, anchor_date, password, chunk_size):
+    """Bulk-loads a synthetic dataset for load testing and benchmarks."""
+    if synthetic_data_exists():
+        print('Synthetic data already exists in this database. Use a fresh database to reseed.')
+        return
+
+    started = time.perf_counter()
+    print(f"Generating synthetic data with seed {seed}...")
+    counts = generate_synthetic_data(
+        seed=seed, classes=classes, mentees=mentees, mentors=mentors, weeks=weeks, batch_size=batch_size,
+        record_rate=record_rate, anchor_date=anchor_date.date() if anchor_date else None, password=password,
+        chunk_size=chunk_size
+    )
+    db.session.commit()
+    total_rows = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {total_rows} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/s).")
+
+@click.command(name='run-workers')
+@click.option('--workers', type=int, default=None, help='Worker processes. Defaults to REPORT_EXPORT_WORKERS or the CPU count.')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Seconds between checks for queued jobs.')
+@with_appcontext
+def run_workers_command(workers, poll_interval):
+    """Runs queued report jobs on a pool of worker processes until interrupted."""
+    run_report_workers(workers or get_report_worker_count(), poll_interval)
+
+@click.group(name='scheduler')
+def scheduler_command():
+    """Runs the periodic maintenance jobs, such as marking missed sessions."""
+
+@scheduler_command.command(name='run')
+@click.option('--once', is_flag=True, help='Run every job once and exit, for use from cron.')
+@with_appcontext
+def run_scheduler_command(once):
+    """Runs the periodic jobs until interrupted; only one scheduler runs them at a time."""
+    if not once:
+        run_scheduler()
+        return
+    release = acquire_scheduler_lock()
+    if release is None:
+        print('Another scheduler holds the lock; nothing to do.')
+        return
+    try:
+        for name, _, job in PERIODIC_JOBS:
+            run_periodic_job(name, job)
+    finally:
+        release()
+
+@click.group(name='holidays')
+def holidays_command():
+    """Manages the institution holidays that session schedules skip."""
+
+@holidays_command.command(name='add')
+@click.argument('holiday_date', type=click.DateTime(formats=['%Y-%m-%d']))
+@click.argument('name')
+@with_appcontext
+def add_holiday_command(holiday_date, name):
+    """Adds a holiday, or renames the one already on that date."""
+    holiday = Holiday.query.filter_by(date=holiday_date.date()).first()
+    if holiday:
+        holiday.name = name
+    else:
+        db.session.add(Holiday(date=holiday_date.date(), name=name))
+    db.session.commit()
+    print(f"{holiday_date.date()} {name} saved. Sessions scheduled from now on will skip it.")
+
+@holidays_command.command(name='remove')
+@click.argument('holiday_date', type=click.DateTime(formats=['%Y-%m-%d']))
+@with_appcontext
+def remove_holiday_command(holiday_date):
+    """Removes the holiday on a date."""
+    deleted = Holiday.query.filter_by(date=holiday_date.date()).delete()
+    db.session.commit()
+    print(f"Removed the holiday on {holiday_date.date()}." if deleted else f"No holiday on {holiday_date.date()}.")
+
+@holidays_command.command(name='list')
+@click.option('--all', 'show_all', is_flag=True, help='Include past holidays.')
+@with_appcontext
+def list_holidays_command(show_all):
+    """Lists upcoming holidays."""
+    query = Holiday.query.order_by(Holiday.date)
+    if not show_all:
+        query = query.filter(Holiday.date >= date.today())
+    for holiday in query:
+        print(f"{holiday.date}  {holiday.name}")
@@ -2,8 +2,49 @@ from . import db, login_manager
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 import datetime
+import functools
+from flask import current_app
+from sqlalchemy import and_, or_, bindparam, case, text
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.orm import foreign
 
+# Stored statuses a session can still leave; the sweep and ending a session move it out of them.
+SESSION_OPEN_STATUSES = ('Upcoming', 'In Progress')
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def _live_since():
+    """Sessions that started after this are still within their scheduled slot."""
+    return _utc_now() - datetime.timedelta(minutes=current_app.config['SESSION_DURATION_MINUTES'])
+
+# Evaluated when a statement executes, so the status expressions are built once and compile to one cached statement.
+_NOW = bindparam('effective_status_now', callable_=_utc_now, type_=db.DateTime(timezone=True))
+_LIVE_SINCE = bindparam('effective_status_live_since', callable_=_live_since, type_=db.DateTime(timezone=True))
+# Rendered inline: planners can only match a partial index predicate against literal values.
+_OPEN_STATUSES = bindparam('open_statuses', SESSION_OPEN_STATUSES, expanding=True, literal_execute=True)
+
+@functools.lru_cache(maxsize=64)
+def _effective_status_case(entity):
+    return case(
+        (entity.actual_end_time.isnot(None), 'Completed'),
+        (entity.actual_start_time.isnot(None), 'Live'),
+        (entity.start_time > _NOW, 'Upcoming'),
+        (entity.start_time > _LIVE_SINCE, 'Live'),
+        else_='Missed'
+    )
+
+@functools.lru_cache(maxsize=64)
+def _effective_status_condition(entity, statuses):
+    condition = _effective_status_case(entity).in_(statuses)
+    if set(statuses) <= {'Upcoming', 'Live'}:
+        not_finished = and_(entity.status.in_(_OPEN_STATUSES), entity.start_time > _LIVE_SINCE)
+        if 'Live' in statuses:
+            # The open status is repeated in each branch so both can use their partial index.
+            not_finished = or_(not_finished, and_(entity.status.in_(_OPEN_STATUSES), entity.actual_start_time.isnot(None)))
+        condition = and_(not_finished, condition)
+    return condition
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -121,7 +162,11 @@ class MentorAssignment(db.Model):
     sessions = db.relationship('Session', backref='assignment', lazy='dynamic', cascade='all, delete-orphan')
     mentor = db.relationship('User', foreign_keys=[mentor_id], backref=db.backref('assignments', lazy='dynamic'))
     original_mentor = db.relationship('User', foreign_keys=[original_mentor_id], backref=db.backref('original_assignments', lazy='dynamic'))
-    __table_args__ = (db.UniqueConstraint('mentor_id', 'batch_id', 'is_active', name='_mentor_batch_active_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('mentor_id', 'batch_id', 'is_active', name='_mentor_batch_active_uc'),
+        db.Index('ix_mentor_assignments_batch_id_is_active', 'batch_id', 'is_active'),
+        db.Index('ix_mentor_assignments_active_batch_id', 'batch_id', postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active = 1')),
+    )
 
 class Session(db.Model):
     __tablename__ = 'sessions'
@@ -132,9 +177,55 @@ class Session(db.Model):
     status = db.Column(db.String(50), default='Upcoming')
     actual_start_time = db.Column(db.DateTime(timezone=True), nullable=True)
     actual_end_time = db.Column(db.DateTime(timezone=True), nullable=True)
+    change_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     leave_requests = db.relationship('LeaveRequest', backref='session', lazy='dynamic', cascade='all, delete-orphan')
     attendance_records = db.relationship('AttendanceRecord', backref='session', lazy='dynamic', cascade='all, delete-orphan')
     meeting_details = db.relationship('MentorMeetingDetails', backref='session', lazy='dynamic', cascade='all, delete-orphan')
+    __table_args__ = (
+        db.Index('ix_sessions_mentor_assignment_id_start_time', 'mentor_assignment_id', 'start_time'),
+        db.Index('ix_sessions_open_start_time', 'start_time',
+                 postgresql_where=text("status IN ('Upcoming', 'In Progress')"),
+                 sqlite_where=text("status IN ('Upcoming', 'In Progress')")),
+        db.Index('ix_sessions_open_actual_start_time', 'actual_start_time',
+                 postgresql_where=text("status IN ('Upcoming', 'In Progress')"),
+                 sqlite_where=text("status IN ('Upcoming', 'In Progress')")),
+    )
+
+    @hybrid_property
+    def effective_status(self):
+        """Upcoming, Live, Completed or Missed as of now, derived from the times rather than the stored status.
+
+        A session is Completed once it was ended, and Live from the moment it was started until then, however
+        long it overruns. One that was never started is Live for its scheduled duration and Missed after it,
+        whether or not the sweep has updated the stored status yet.
+        """
+        start_time = self.start_time if self.start_time.tzinfo else self.start_time.replace(tzinfo=datetime.timezone.utc)
+        if self.actual_end_time is not None:
+            return 'Completed'
+        if self.actual_start_time is not None:
+            return 'Live'
+        if start_time > _utc_now():
+            return 'Upcoming'
+        if start_time > _live_since():
+            return 'Live'
+        return 'Missed'
+
+    @effective_status.inplace.expression
+    @classmethod
+    def _effective_status_expression(cls):
+        return _effective_status_case(cls)
+
+    @hybrid_method
+    def has_effective_status(self, *statuses):
+        return self.effective_status in statuses
+
+    @has_effective_status.inplace.expression
+    @classmethod
+    def _has_effective_status_expression(cls, *statuses):
+        """Only open sessions that are still in their slot, or were started and not ended, can be Upcoming or
+        Live, so those lookups also filter on exactly that, which ix_sessions_open_start_time and
+        ix_sessions_open_actual_start_time answer without visiting past sessions."""
+        return _effective_status_condition(cls, statuses)
 
 class LeaveRequest(db.Model):
     __tablename__ = 'leave_requests'
@@ -146,6 +237,10 @@ class LeaveRequest(db.Model):
     requested_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
     actioned_at = db.Column(db.DateTime(timezone=True), nullable=True)
     mentee = db.relationship('User', backref='leave_requests')
+    __table_args__ = (
+        db.Index('ix_leave_requests_session_id_mentee_id', 'session_id', 'mentee_id'),
+        db.Index('ix_leave_requests_mentee_id', 'mentee_id'),
+    )
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
@@ -163,6 +258,10 @@ class AttendanceRecord(db.Model):
     mentee_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     status = db.Column(db.String(50), nullable=False)
     mentee = db.relationship('User', backref='attendance')
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_attendance_session_mentee_uc'),
+        db.Index('ix_attendance_records_mentee_id', 'mentee_id'),
+    )
 
 class PlacementInformation(db.Model):
     __tablename__ = 'placement_information'
@@ -177,6 +276,10 @@ class PlacementInformation(db.Model):
     annual_ctc = db.Column(db.Float)
     stipend_amount = db.Column(db.Float)
     interview_status = db.Column(db.String(100))
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_placement_session_mentee_uc'),
+        db.Index('ix_placement_information_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class ResearchRecord(db.Model):
     __tablename__ = 'research_records'
@@ -189,6 +292,10 @@ class ResearchRecord(db.Model):
     publication_date = db.Column(db.Date)
     publication_type = db.Column(db.String(100))
     publication_status = db.Column(db.String(100))
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_research_session_mentee_uc'),
+        db.Index('ix_research_records_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class AcademicSemesterMarkDetails(db.Model):
     __tablename__ = 'academic_semester_mark_details'
@@ -211,6 +318,10 @@ class AcademicSemesterMarkDetails(db.Model):
     gpa = db.Column(db.Float)
     cgpa = db.Column(db.Float)
     suggestions_by_mentor = db.Column(db.Text)
+    __table_args__ = (
+        db.Index('ix_academic_semester_mark_details_session_id_mentee_id', 'session_id', 'mentee_id'),
+        db.Index('ix_academic_semester_mark_details_mentee_id_semester', 'mentee_id', 'semester'),
+    )
 
 class HonorsMinorMarksDetails(db.Model):
     __tablename__ = 'honors_minor_marks_details'
@@ -233,6 +344,10 @@ class HonorsMinorMarksDetails(db.Model):
     gpa = db.Column(db.Float)
     cgpa = db.Column(db.Float)
     suggestions_by_mentor = db.Column(db.Text)
+    __table_args__ = (
+        db.Index('ix_honors_minor_marks_details_session_id_mentee_id', 'session_id', 'mentee_id'),
+        db.Index('ix_honors_minor_marks_details_mentee_id_semester', 'mentee_id', 'semester'),
+    )
 
 class MentorMeetingDetails(db.Model):
     __tablename__ = 'mentor_meeting_details'
@@ -241,6 +356,10 @@ class MentorMeetingDetails(db.Model):
     mentee_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     points_discussed = db.Column(db.Text)
     remarks_given = db.Column(db.Text)
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_meeting_session_mentee_uc'),
+        db.Index('ix_mentor_meeting_details_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class AwardsAndAchievements(db.Model):
     __tablename__ = 'awards_and_achievements'
@@ -251,6 +370,10 @@ class AwardsAndAchievements(db.Model):
     award_achievement_type = db.Column(db.String(100))
     conducted_by = db.Column(db.String(255))
     date = db.Column(db.Date)
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_awards_session_mentee_uc'),
+        db.Index('ix_awards_and_achievements_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class CocurricularActivityRecord(db.Model):
     __tablename__ = 'cocurricular_activity_records'
@@ -261,6 +384,10 @@ class CocurricularActivityRecord(db.Model):
     activity_type = db.Column(db.String(100))
     conducted_by = db.Column(db.String(255))
     date = db.Column(db.Date)
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_cocurricular_session_mentee_uc'),
+        db.Index('ix_cocurricular_activity_records_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class ExtracurricularActivityRecord(db.Model):
     __tablename__ = 'extracurricular_activity_records'
@@ -271,6 +398,10 @@ class ExtracurricularActivityRecord(db.Model):
     activity_type = db.Column(db.String(100))
     conducted_by = db.Column(db.String(255))
     date = db.Column(db.Date)
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_extracurricular_session_mentee_uc'),
+        db.Index('ix_extracurricular_activity_records_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
 
 class InternshipInformation(db.Model):
     __tablename__ = 'internship_information'
@@ -284,4 +415,54 @@ class InternshipInformation(db.Model):
     technology_domain = db.Column(db.String(255))
     internship_project_details = db.Column(db.Text)
     company_location = db.Column(db.String(255))
-    internship_status = db.Column(db.String(100))
\ No newline at end of file
+    internship_status = db.Column(db.String(100))
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'mentee_id', name='_internship_session_mentee_uc'),
+        db.Index('ix_internship_information_mentee_id_session_id', 'mentee_id', 'session_id'),
+    )
+
+class SessionChange(db.Model):
+    __tablename__ = 'session_changes'
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id', ondelete='CASCADE'), nullable=False)
+    mentee_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    __table_args__ = (db.Index('ix_session_changes_session_id_version', 'session_id', 'version'),)
+
+class SyncOperation(db.Model):
+    __tablename__ = 'sync_operations'
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(64), nullable=False)
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id', ondelete='CASCADE'), nullable=False)
+    result = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), index=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    __table_args__ = (db.UniqueConstraint('session_id', 'idempotency_key', name='_sync_operation_session_key_uc'),)
+
+class ReportJob(db.Model):
+    __tablename__ = 'report_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    target_id = db.Column(db.Integer, nullable=False)
+    requested_by = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(50), nullable=False, default='Queued')
+    total_items = db.Column(db.Integer, nullable=False, default=0)
+    completed_items = db.Column(db.Integer, nullable=False, default=0)
+    message = db.Column(db.Text, nullable=True)
+    artifact_path = db.Column(db.String(255), nullable=True)
+    artifact_name = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    started_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    __table_args__ = (
+        db.Index('ix_report_jobs_status_id', 'status', 'id'),
+        db.Index('ix_report_jobs_requested_by', 'requested_by'),
+    )
+
+class Holiday(db.Model):
+    __tablename__ = 'holidays'
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False, unique=True)
+    name = db.Column(db.String(120), nullable=False)
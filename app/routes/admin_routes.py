@@ -1,27 +1,27 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, session, jsonify, Response
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, abort
 from flask_login import login_required, current_user
-from ..utils import role_required, timestamp_to_local
-from ..utils import report_generator
+from ..utils import role_required
+from ..utils.report_cache import mentee_report_response
+from ..utils.session_snapshot import build_session_details
+from ..utils.bulk_reports import bulk_reports_response, get_mentee_ids
+from ..utils.excel_exports import EXPORT_TYPES, excel_export_response
+from ..utils.scheduling import find_schedule_collisions, collision_message, parse_schedule, build_schedule, insert_sessions
+from ..utils.import_reader import RosterFileError
+from ..utils.import_validation import review_roster_upload
+from ..utils.bulk_import import IMPORT_CHUNK_SIZE, import_users, throughput_message
+from ..utils.import_staging import load_import_staging, iter_staged_chunks, discard_import_staging, read_import_progress
 from .. import db
 from ..models import (User, Class, Batch, MenteeProfile, MentorProfile, MentorAssignment, Session,
                      PlacementInformation, ResearchRecord, AcademicSemesterMarkDetails, 
                      MentorMeetingDetails, AwardsAndAchievements, CocurricularActivityRecord, 
-                     ExtracurricularActivityRecord, InternshipInformation, HonorsMinorMarksDetails,
-                     AttendanceRecord, LeaveRequest)
-import pandas as pd
+                     ExtracurricularActivityRecord, InternshipInformation, HonorsMinorMarksDetails)
 import math
 import re
-from datetime import datetime, timedelta, timezone, date
-import pytz
-from sqlalchemy import func
+from datetime import datetime, timezone, date
+from sqlalchemy import func, case
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
-LOCAL_TIMEZONE = pytz.timezone('Asia/Kolkata')
-
-def is_third_saturday(d):
-    return d.weekday() == 5 and 15 <= d.day <= 21
-
 def model_to_dict(model_instance):
     d = {}
     for column in model_instance.__table__.columns:
@@ -32,22 +32,6 @@ def model_to_dict(model_instance):
             d[column.name] = val
     return d
 
-def check_for_collision(mentor_id, session_datetimes, existing_assignment_id=None):
-    query = Session.query.join(MentorAssignment).filter(
-        MentorAssignment.mentor_id == mentor_id,
-        Session.start_time.in_(session_datetimes)
-    )
-    if existing_assignment_id:
-        query = query.filter(MentorAssignment.id != existing_assignment_id)
-    
-    existing_session = query.first()
-
-    if existing_session:
-        colliding_batch = existing_session.assignment.batch
-        colliding_class = colliding_batch.class_model
-        return f"Schedule conflict detected! Mentor is already assigned to {colliding_class.name} - {colliding_batch.name} at one of the selected times."
-    return None
-
 @admin_bp.route('/dashboard')
 @login_required
 @role_required('admin')
@@ -85,15 +69,52 @@ def view_mentor_profile(user_id):
 @login_required
 @role_required('admin')
 def download_mentee_report(user_id):
-    pdf_bytes, filename = report_generator.generate_mentee_full_report(user_id)
-    if pdf_bytes is None:
+    response = mentee_report_response(user_id)
+    if response is None:
         flash("Could not generate report for this mentee.", "danger")
         return redirect(url_for('admin.view_mentee_profile', user_id=user_id))
-    
-    response = Response(pdf_bytes, mimetype='application/pdf')
-    response.headers['Content-Disposition'] = f'attachment;filename={filename}'
     return response
 
+@admin_bp.route('/class/<int:class_id>/download_reports')
+@login_required
+@role_required('admin')
+def download_class_reports(class_id):
+    target_class = Class.query.get_or_404(class_id)
+    mentee_ids = get_mentee_ids(class_id=class_id)
+    if not mentee_ids:
+        flash("This class has no active mentees to generate reports for.", "warning")
+        return redirect(url_for('admin.manage_class', class_id=class_id))
+    return bulk_reports_response(mentee_ids, f"{target_class.name.replace(' ', '_')}_reports.zip")
+
+@admin_bp.route('/batch/<int:batch_id>/download_reports')
+@login_required
+@role_required('admin')
+def download_batch_reports(batch_id):
+    batch = Batch.query.get_or_404(batch_id)
+    mentee_ids = get_mentee_ids(batch_id=batch_id)
+    if not mentee_ids:
+        flash("This batch has no active mentees to generate reports for.", "warning")
+        return redirect(url_for('admin.manage_class', class_id=batch.class_id))
+    return bulk_reports_response(mentee_ids, f"{batch.class_model.name.replace(' ', '_')}_{batch.name.replace(' ', '_')}_reports.zip")
+
+@admin_bp.route('/class/<int:class_id>/export/<export_type>')
+@login_required
+@role_required('admin')
+def export_class_records(class_id, export_type):
+    target_class = Class.query.get_or_404(class_id)
+    if export_type not in EXPORT_TYPES:
+        abort(404)
+    return excel_export_response(export_type, target_class.name.replace(' ', '_'), class_id=class_id)
+
+@admin_bp.route('/batch/<int:batch_id>/export/<export_type>')
+@login_required
+@role_required('admin')
+def export_batch_records(batch_id, export_type):
+    batch = Batch.query.get_or_404(batch_id)
+    if export_type not in EXPORT_TYPES:
+        abort(404)
+    return excel_export_response(export_type, f"{batch.class_model.name.replace(' ', '_')}_{batch.name.replace(' ', '_')}", batch_id=batch_id)
+
 @admin_bp.route('/manage_mentors', methods=['GET'])
 @login_required
 @role_required('admin')
@@ -137,101 +158,51 @@ def upload_review_mentors():
         flash("Please upload a valid CSV or Excel file.", "danger")
         return redirect(url_for('admin.manage_mentors'))
 
+    existing_mentor_emails_db = {item[0].lower() for item in User.query.filter_by(role='mentor').with_entities(User.email).all()}
     try:
-        df = pd.read_csv(file, dtype=str) if file.filename.endswith('.csv') else pd.read_excel(file, dtype=str)
-        df.columns = [col.strip() for col in df.columns]
-
-        if 'Level' in df.columns and 'level' not in df.columns:
-            df.rename(columns={'Level': 'level'}, inplace=True)
-
-        required_columns = {'Name', 'level', 'Email'}
-        if not required_columns.issubset(df.columns):
-            missing_cols = required_columns - set(df.columns)
-            flash(f"File is missing required columns: {', '.join(missing_cols)}", "danger")
-            return redirect(url_for('admin.manage_mentors'))
+        review = review_roster_upload('mentors', file, {'Name', 'level', 'Email'}, existing_mentor_emails_db, current_user.id,
+                                      upload_id=request.form.get('upload_id'), column_aliases={'Level': 'level'})
+    except RosterFileError as e:
+        flash(str(e), "danger")
+        return redirect(url_for('admin.manage_mentors'))
     except Exception as e:
         flash(f"Error reading file: {e}", "danger")
         return redirect(url_for('admin.manage_mentors'))
 
-    df.dropna(how='all', inplace=True)
-    df.fillna('', inplace=True)
+    return render_template('admin/confirm_mentor_import.html', review=review,
+                           valid_mentors=review['valid_rows'],
+                           invalid_rows=review['invalid_rows'],
+                           db_duplicates=review['db_duplicates'])
 
-    existing_mentor_emails_db = {item[0].lower() for item in User.query.filter_by(role='mentor').with_entities(User.email).all()}
-    
-    valid_mentors, invalid_rows, db_duplicates = [], [], []
-    seen_emails_in_file = set()
-
-    for index, row in df.iterrows():
-        errors = []
-        name = row.get('Name', '').strip()
-        level = row.get('level', '').strip().upper()
-        email = row.get('Email', '').strip().lower()
-
-        if not name: errors.append("Name is missing.")
-        if any(char.isdigit() for char in name): errors.append("Name cannot contain numbers.")
-        
-        if not level: errors.append("Level is missing.")
-        if level not in ['BTECH', 'MTECH']: errors.append("Level must be 'BTECH' or 'MTECH'.")
-        
-        if not email: errors.append("Email is missing.")
-        elif '@' not in email or '.' not in email.split('@')[1]: errors.append("Invalid email format.")
-        
-        if email:
-            if email in seen_emails_in_file: errors.append("Email is duplicated in this file.")
-            seen_emails_in_file.add(email)
-            if email in existing_mentor_emails_db:
-                db_duplicates.append({'Name': name, 'level': level, 'Email': email})
-                continue
-
-        mentor_data = {'Name': name, 'level': level, 'Email': email}
-        
-        if errors:
-            invalid_rows.append({'data': mentor_data, 'errors': errors})
-        else:
-            valid_mentors.append(mentor_data)
-            
-    session['valid_mentors_to_import'] = valid_mentors
-    
-    return render_template('admin/confirm_mentor_import.html', 
-                           valid_mentors=valid_mentors,
-                           invalid_rows=invalid_rows,
-                           db_duplicates=db_duplicates)
+@admin_bp.route('/import_progress/<upload_id>')
+@login_required
+@role_required('admin')
+def import_progress(upload_id):
+    progress = read_import_progress(upload_id, current_user.id)
+    if progress is None:
+        return jsonify(success=False, message="No upload in progress."), 404
+    return jsonify(success=True, progress=progress)
 
 @admin_bp.route('/confirm_mentor_import', methods=['POST'])
 @login_required
 @role_required('admin')
 def confirm_mentor_import():
-    mentors_to_import = session.get('valid_mentors_to_import', [])
+    import_token = request.form.get('import_token')
+    staging = load_import_staging(import_token, 'mentors', current_user.id)
 
-    if not mentors_to_import:
+    if not staging or not staging['row_count']:
         flash("No valid mentor data to import or session expired.", "danger")
         return redirect(url_for('admin.manage_mentors'))
     
     try:
-        for mentor_data in mentors_to_import:
-            email = mentor_data.get('Email').lower()
-            user = User(
-                email=email,
-                name=mentor_data.get('Name'),
-                role='mentor',
-                must_change_password=True
-            )
-            user.set_password(email)
-
-            mentor_profile = MentorProfile(
-                user=user,
-                level=mentor_data['level'],
-                profile_complete=False
-            )
-            db.session.add(user)
-        
-        db.session.commit()
-        flash(f"{len(mentors_to_import)} new mentors have been successfully imported.", "success")
+        count, elapsed = import_users('mentor', iter_staged_chunks(import_token, IMPORT_CHUNK_SIZE), MentorProfile, 'Email',
+                                      lambda row: {'level': row['level'], 'profile_complete': False})
+        flash(f"{count} new mentors have been successfully imported ({throughput_message(count, elapsed)}).", "success")
     except Exception as e:
         db.session.rollback()
         flash(f"An error occurred during import: {e}", "danger")
     finally:
-        session.pop('valid_mentors_to_import', None)
+        discard_import_staging(import_token)
 
     return redirect(url_for('admin.manage_mentors'))
 
@@ -253,13 +224,29 @@ def manage_classes():
         return redirect(url_for('admin.manage_classes'))
     
     classes_query = Class.query.filter_by(is_archived=False).order_by(Class.name).all()
-    
+    class_ids = [c.id for c in classes_query]
+
+    has_active_assignment = db.session.query(MentorAssignment.id).filter(
+        MentorAssignment.batch_id == Batch.id, MentorAssignment.is_active == True
+    ).exists()
+    batch_counts = {
+        class_id: (total, unassigned or 0)
+        for class_id, total, unassigned in db.session.query(
+            Batch.class_id, func.count(Batch.id), func.sum(case((has_active_assignment, 0), else_=1))
+        ).filter(Batch.class_id.in_(class_ids)).group_by(Batch.class_id).all()
+    }
+    mentee_counts = dict(
+        db.session.query(MenteeProfile.class_id, func.count(MenteeProfile.id))
+        .filter(MenteeProfile.class_id.in_(class_ids)).group_by(MenteeProfile.class_id).all()
+    )
+
     classes_with_status = []
     for c in classes_query:
-        total_batches = c.batches.count()
-        unassigned_batches = sum(1 for batch in c.batches if not batch.mentor_assignment)
+        total_batches, unassigned_batches = batch_counts.get(c.id, (0, 0))
         classes_with_status.append({
             'class_obj': c,
+            'mentee_count': mentee_counts.get(c.id, 0),
+            'batch_count': total_batches,
             'unassigned_count': unassigned_batches
         })
 
@@ -288,14 +275,12 @@ def manage_class(class_id):
     unbatched_students = MenteeProfile.query.filter_by(class_id=class_id, batch_id=None).join(User).order_by(User.name).all()
     created_batches = Batch.query.filter_by(class_id=class_id).order_by(Batch.name).all()
     
-    now_utc = datetime.now(timezone.utc)
     upcoming_sessions_map = {}
     for batch in created_batches:
         if batch.mentor_assignment:
             sessions = Session.query.filter(
                 Session.mentor_assignment_id == batch.mentor_assignment.id,
-                Session.start_time >= now_utc,
-                Session.status.in_(['Upcoming', 'In Progress'])
+                Session.has_effective_status('Upcoming')
             ).order_by(Session.start_time.asc()).all()
             upcoming_sessions_map[batch.id] = sessions
 
@@ -314,10 +299,11 @@ def assign_mentor(class_id):
     if request.method == 'POST':
         mentor_id = int(request.form.get('mentor_id'))
         batch_id = int(request.form.get('batch_id'))
-        start_date = datetime.strptime(request.form.get('start_date'), '%Y-%m-%d').date()
-        day_of_week = int(request.form.get('day_of_week'))
-        session_time = datetime.strptime(request.form.get('time'), '%H:%M').time()
-        num_weeks = int(request.form.get('num_weeks'))
+        try:
+            schedule = parse_schedule(request.form, request.form.getlist('day_of_week'))
+        except ValueError as e:
+            flash(str(e), "danger")
+            return redirect(url_for('admin.assign_mentor', class_id=class_id))
 
         mentor = User.query.get(mentor_id)
         batch = Batch.query.get(batch_id)
@@ -332,32 +318,22 @@ def assign_mentor(class_id):
         if existing_assignment_in_class:
             flash(f"Assignment failed: Mentor {mentor.name} is already assigned to batch {existing_assignment_in_class.batch.name} in this class.", "danger")
             return redirect(url_for('admin.assign_mentor', class_id=class_id))
-        
-        days_ahead = (day_of_week - start_date.weekday() + 7) % 7
-        current_date = start_date + timedelta(days=days_ahead)
-        sessions_to_create_dates = []
-        while len(sessions_to_create_dates) < num_weeks:
-            if not is_third_saturday(current_date):
-                sessions_to_create_dates.append(current_date)
-            current_date += timedelta(weeks=1)
-        
-        session_datetimes = [LOCAL_TIMEZONE.localize(datetime.combine(d, session_time)).astimezone(timezone.utc) for d in sessions_to_create_dates]
 
-        collision_message = check_for_collision(mentor_id, session_datetimes)
-        if collision_message:
-            flash(collision_message, "danger")
+        session_datetimes = build_schedule(**schedule)
+
+        collisions = find_schedule_collisions(mentor_id, session_datetimes)
+        if collisions:
+            flash(collision_message(collisions), "danger")
             return redirect(url_for('admin.assign_mentor', class_id=class_id))
         
         try:
             new_assignment = MentorAssignment(mentor_id=mentor_id, batch_id=batch_id, is_active=True)
             db.session.add(new_assignment)
+            db.session.flush()
+            insert_sessions(new_assignment.id, session_datetimes)
 
-            for i, dt in enumerate(session_datetimes):
-                new_session = Session(session_number=i + 1, start_time=dt, status='Upcoming')
-                new_assignment.sessions.append(new_session)
-            
             db.session.commit()
-            flash(f"Successfully assigned {mentor.name} to {batch.name} and scheduled {num_weeks} sessions.", "success")
+            flash(f"Successfully assigned {mentor.name} to {batch.name} and scheduled {len(session_datetimes)} sessions.", "success")
             return redirect(url_for('admin.manage_class', class_id=class_id))
         except Exception as e:
             db.session.rollback()
@@ -391,98 +367,43 @@ def upload_and_review_students(class_id):
         flash("Please upload a valid CSV or Excel file.", "danger")
         return redirect(url_for('admin.manage_class', class_id=class_id))
 
+    existing_reg_nums_db = {str(item[0]) for item in MenteeProfile.query.with_entities(MenteeProfile.reg_num).all()}
     try:
-        df = pd.read_csv(file) if file.filename.endswith('.csv') else pd.read_excel(file)
-        df.columns = [col.strip() for col in df.columns]
-        required_columns = {'Reg_num', 'Name'}
-        if not required_columns.issubset(df.columns):
-            missing_cols = required_columns - set(df.columns)
-            flash(f"File is missing required columns: {', '.join(missing_cols)}", "danger")
-            return redirect(url_for('admin.manage_class', class_id=class_id))
+        review = review_roster_upload('students', file, {'Reg_num', 'Name'}, existing_reg_nums_db, current_user.id,
+                                      upload_id=request.form.get('upload_id'), class_id=class_id)
+    except RosterFileError as e:
+        flash(str(e), "danger")
+        return redirect(url_for('admin.manage_class', class_id=class_id))
     except Exception as e:
         flash(f"Error reading file: {e}", "danger")
         return redirect(url_for('admin.manage_class', class_id=class_id))
 
-    df.dropna(how='all', inplace=True)
-    df['Reg_num'] = df['Reg_num'].astype(str)
-    df['Name'] = df['Name'].astype(str)
-    
-    existing_reg_nums_db = {str(item[0]) for item in MenteeProfile.query.with_entities(MenteeProfile.reg_num).all()}
-    
-    valid_students, invalid_rows, db_duplicates = [], [], []
-    seen_reg_nums_in_file, seen_names_in_file = set(), set()
-
-    for index, row in df.iterrows():
-        errors = []
-        reg_num = row.get('Reg_num', '').strip()
-        name = row.get('Name', '').strip()
-
-        if not reg_num: errors.append("Reg_num is missing.")
-        if not name: errors.append("Name is missing.")
-        if not reg_num.isdigit(): errors.append("Reg_num must be numeric.")
-        if any(char.isdigit() for char in name): errors.append("Name cannot contain numbers.")
-
-        if reg_num in seen_reg_nums_in_file: errors.append("Reg_num is duplicated within this file.")
-        seen_reg_nums_in_file.add(reg_num)
-        
-        if name.lower() in seen_names_in_file: errors.append("Name is duplicated within this file.")
-        seen_names_in_file.add(name.lower())
-
-        student_data = {'Reg_num': reg_num, 'Name': name}
-        
-        if reg_num in existing_reg_nums_db:
-            db_duplicates.append(student_data)
-        elif errors:
-            invalid_rows.append({'data': student_data, 'errors': errors})
-        else:
-            valid_students.append(student_data)
-    
-    session['valid_students_to_import'] = valid_students
-    session['import_class_id'] = class_id
-    
-    return render_template('admin/confirm_import.html', 
-                           valid_students=valid_students,
-                           invalid_rows=invalid_rows,
-                           db_duplicates=db_duplicates, 
+    return render_template('admin/confirm_import.html', review=review,
+                           valid_students=review['valid_rows'],
+                           invalid_rows=review['invalid_rows'],
+                           db_duplicates=review['db_duplicates'], 
                            class_id=class_id)
 
 @admin_bp.route('/class/<int:class_id>/confirm_import', methods=['POST'])
 @login_required
 @role_required('admin')
 def confirm_student_import(class_id):
-    students_to_import = session.get('valid_students_to_import', [])
-    import_class_id = session.get('import_class_id')
+    import_token = request.form.get('import_token')
+    staging = load_import_staging(import_token, 'students', current_user.id)
 
-    if not students_to_import or import_class_id != class_id:
+    if not staging or not staging['row_count'] or staging.get('class_id') != class_id:
         flash("No valid student data to import or session expired. Please upload again.", "danger")
         return redirect(url_for('admin.manage_classes'))
 
     try:
-        for student_data in students_to_import:
-            reg_num_str = str(student_data.get('Reg_num'))
-            user = User(
-                name=student_data.get('Name'),
-                role='mentee',
-                must_change_password=True
-            )
-            user.set_password(reg_num_str)
-            
-            mentee_profile = MenteeProfile(
-                user=user,
-                reg_num=reg_num_str,
-                class_id=class_id,
-                profile_complete=False
-            )
-            db.session.add(user)
-        
-        db.session.commit()
-        flash(f"{len(students_to_import)} new students have been successfully imported. They will be prompted to complete their profiles on first login.", "success")
+        count, elapsed = import_users('mentee', iter_staged_chunks(import_token, IMPORT_CHUNK_SIZE), MenteeProfile, 'Reg_num',
+                                      lambda row: {'reg_num': row['Reg_num'], 'class_id': class_id, 'profile_complete': False})
+        flash(f"{count} new students have been successfully imported ({throughput_message(count, elapsed)}). They will be prompted to complete their profiles on first login.", "success")
     except Exception as e:
         db.session.rollback()
         flash(f"An error occurred during import: {e}. No students were added.", "danger")
     finally:
-        session.pop('valid_students_to_import', None)
-        session.pop('import_class_id', None)
+        discard_import_staging(import_token)
 
     return redirect(url_for('admin.manage_class', class_id=class_id))
 
@@ -619,27 +540,19 @@ def update_assignment(assignment_id):
             flash(f"Mentor for batch {assignment.batch.name} has been unassigned and future sessions deleted.", "success")
 
         elif action in ['reschedule', 'reassign']:
-            start_date = datetime.strptime(request.form.get('start_date'), '%Y-%m-%d').date()
-            day_of_week = int(request.form.get('day_of_week'))
-            session_time = datetime.strptime(request.form.get('time'), '%H:%M').time()
-            num_weeks = int(request.form.get('num_weeks'))
-            
+            try:
+                schedule = parse_schedule(request.form, request.form.getlist('day_of_week'))
+            except ValueError as e:
+                flash(str(e), "danger")
+                return redirect(url_for('admin.edit_assignment', assignment_id=assignment_id))
+
             mentor_id_for_check = int(request.form.get('mentor_id')) if action == 'reassign' else assignment.mentor_id
 
-            days_ahead = (day_of_week - start_date.weekday() + 7) % 7
-            current_date = start_date + timedelta(days=days_ahead)
-            
-            sessions_to_create_dates = []
-            while len(sessions_to_create_dates) < num_weeks:
-                if not is_third_saturday(current_date):
-                    sessions_to_create_dates.append(current_date)
-                current_date += timedelta(weeks=1)
-            
-            session_datetimes = [LOCAL_TIMEZONE.localize(datetime.combine(d, session_time)).astimezone(timezone.utc) for d in sessions_to_create_dates]
+            session_datetimes = build_schedule(**schedule)
 
-            collision_message = check_for_collision(mentor_id_for_check, session_datetimes, existing_assignment_id=assignment_id)
-            if collision_message:
-                flash(collision_message, "danger")
+            collisions = find_schedule_collisions(mentor_id_for_check, session_datetimes, exclude_assignment_id=assignment_id)
+            if collisions:
+                flash(collision_message(collisions), "danger")
                 return redirect(url_for('admin.edit_assignment', assignment_id=assignment_id))
 
             upcoming_sessions_to_delete.delete(synchronize_session=False)
@@ -652,10 +565,9 @@ def update_assignment(assignment_id):
             else:
                 assignment_to_update = assignment
 
-            for i, dt in enumerate(session_datetimes):
-                new_session = Session(session_number=i + 1, start_time=dt, status='Upcoming')
-                assignment_to_update.sessions.append(new_session)
-            
+            db.session.flush()
+            insert_sessions(assignment_to_update.id, session_datetimes)
+
             flash("Assignment has been successfully updated.", "success")
             
         db.session.commit()
@@ -671,7 +583,7 @@ def update_assignment(assignment_id):
 @role_required('admin')
 def completed_sessions():
     sessions = Session.query.filter(
-        Session.status.in_(['Completed', 'Missed'])
+        Session.has_effective_status('Completed', 'Missed')
     ).order_by(Session.start_time.desc()).all()
     
     return render_template('completed_sessions.html', sessions=sessions)
@@ -690,28 +602,6 @@ def session_details(session_id):
         'Honors Minor Marks Details': HonorsMinorMarksDetails
     }
     
-    all_mentees_in_session = session.assignment.batch.mentees.join(User).order_by(User.name).all() 
-    all_data = {}
-
-    for mentee_profile in all_mentees_in_session:
-        mentee_user = mentee_profile.user
-        mentee_records = {}
-        
-        for name, model in models_to_check.items():
-            records = model.query.filter_by(session_id=session.id, mentee_id=mentee_user.id).all()
-            if records:
-                mentee_records[name] = [model_to_dict(r) for r in records]
-
-        approved_leave = LeaveRequest.query.filter_by(session_id=session.id, mentee_id=mentee_user.id, status='Approved').first()
-        marked_absent = AttendanceRecord.query.filter_by(session_id=session.id, mentee_id=mentee_user.id, status='Absent').first()
-        status_info = None
-        if approved_leave:
-            status_info = { "status": "Leave Approved", "details": f"Requested on {timestamp_to_local(approved_leave.requested_at, 'date_only')}, Approved on {timestamp_to_local(approved_leave.actioned_at, 'date_only')}"}
-        elif marked_absent:
-            status_info = { "status": "Marked Absent", "details": f"Marked as absent by mentor."}
-        else:
-            status_info = { "status": "Present", "details": ""}
-            
-        all_data[mentee_user.id] = {'name': mentee_user.name, 'records': mentee_records, 'attendance': status_info}
+    all_data = build_session_details(session, models_to_check)
 
     return render_template('session_details.html', session=session, all_data=all_data)
\ No newline at end of file
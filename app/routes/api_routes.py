@@ -1,34 +1,46 @@
-from flask import Blueprint, jsonify, request, url_for
+from flask import Blueprint, jsonify, request, url_for, send_file
 from flask_login import login_required, current_user
 from ..utils import role_required, timestamp_to_local
+from ..utils.session_snapshot import build_live_snapshot, record_session_change, record_session_changes
+from ..utils.record_writer import write_attendance, upsert_session_record, sync_multi_records, ATTENDANCE_STATUSES
+from ..utils.report_cache import invalidate_mentee_report
+from ..utils.scheduling import (find_schedule_collisions, collision_message, collision_to_dict, parse_schedule,
+                                build_schedule, insert_sessions)
+from ..utils.meetings import parse_meeting_range, load_meetings, meetings_etag
+from ..utils.report_jobs import (REPORT_JOB_TYPES, can_request_report, report_job_mentee_ids, submit_report_job,
+                                 cancel_report_job, report_job_status, report_job_artifact_available)
 from .. import db
 from ..models import (User, Class, Batch, MentorAssignment, Session, LeaveRequest, Notification,
                      MenteeProfile, MentorProfile, AttendanceRecord, PlacementInformation, ResearchRecord, 
                      AcademicSemesterMarkDetails, MentorMeetingDetails, AwardsAndAchievements, 
                      CocurricularActivityRecord, ExtracurricularActivityRecord, InternshipInformation,
-                     HonorsMinorMarksDetails)
-from datetime import datetime, time, timedelta, timezone, date
-import pytz
+                     HonorsMinorMarksDetails, SyncOperation, ReportJob)
+from datetime import datetime, time, timezone, date
+import json
 from sqlalchemy import or_
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-LOCAL_TIMEZONE = pytz.timezone('Asia/Kolkata')
+SINGLE_RECORD_FORM_MODELS = {
+    'placement_information': PlacementInformation, 'research_record': ResearchRecord,
+    'mentor_meeting_details': MentorMeetingDetails, 'awards_achievements': AwardsAndAchievements, 
+    'cocurricular_activity': CocurricularActivityRecord, 'extracurricular_activity': ExtracurricularActivityRecord, 
+    'internship_information': InternshipInformation
+}
 
-def is_third_saturday(d):
-    return d.weekday() == 5 and 15 <= d.day <= 21
+MULTI_RECORD_FORM_MODELS = {
+    'academic_mark_details': AcademicSemesterMarkDetails,
+    'honors_minor_marks': HonorsMinorMarksDetails
+}
 
-def check_for_collision(mentor_id, session_datetimes):
-    existing_sessions = Session.query.join(MentorAssignment).filter(
-        MentorAssignment.mentor_id == mentor_id,
-        Session.start_time.in_(session_datetimes)
-    ).first()
+MAX_SYNC_OPERATIONS = 200
 
-    if existing_sessions:
-        colliding_batch = existing_sessions.assignment.batch
-        colliding_class = colliding_batch.class_model
-        return f"Schedule conflict detected! Mentor is already assigned to {colliding_class.name} - {colliding_batch.name} at that time."
-    return None
+LIVE_SESSION_RECORD_MODELS = {
+    'placement_information': PlacementInformation, 'research_record': ResearchRecord, 
+    'academic_mark_details': AcademicSemesterMarkDetails, 'awards_achievements': AwardsAndAchievements, 
+    'cocurricular_activity': CocurricularActivityRecord, 'extracurricular_activity': ExtracurricularActivityRecord,
+    'internship_information': InternshipInformation, 'honors_minor_marks': HonorsMinorMarksDetails 
+}
 
 def validate_record_data(form_type, data):
     required_fields = {
@@ -193,33 +205,24 @@ def assign_and_schedule():
         return jsonify(success=False, message="Invalid mentor selected."), 404
 
     try:
-        start_date = datetime.strptime(schedule_data['start_date'], '%Y-%m-%d').date()
-        session_day_of_week = int(schedule_data['day_of_week'])
-        session_time = datetime.strptime(schedule_data['time'], '%H:%M').time()
-        num_weeks = int(schedule_data['num_weeks'])
+        schedule = parse_schedule(schedule_data, schedule_data.get('days_of_week') or [schedule_data.get('day_of_week')])
+    except ValueError as e:
+        return jsonify(success=False, message=str(e)), 400
 
-        days_ahead = (session_day_of_week - start_date.weekday() + 7) % 7
-        current_date = start_date + timedelta(days=days_ahead)
-        
-        sessions_to_create_dates = []
-        while len(sessions_to_create_dates) < num_weeks:
-            if not is_third_saturday(current_date):
-                sessions_to_create_dates.append(current_date)
-            current_date += timedelta(weeks=1)
-        
-        session_datetimes_utc = [LOCAL_TIMEZONE.localize(datetime.combine(d, session_time)).astimezone(timezone.utc) for d in sessions_to_create_dates]
+    try:
+        session_datetimes_utc = build_schedule(**schedule)
 
-        collision_message = check_for_collision(mentor_id, session_datetimes_utc)
-        if collision_message:
-            return jsonify(success=False, collision=True, message=collision_message), 409
+        collisions = find_schedule_collisions(mentor_id, session_datetimes_utc)
+        if collisions:
+            return jsonify(success=False, collision=True, message=collision_message(collisions),
+                           collisions=[collision_to_dict(collision) for collision in collisions]), 409
 
         for batch_id in batch_ids:
             assignment = MentorAssignment(mentor_id=mentor_id, batch_id=batch_id, original_mentor_id=mentor_id, is_active=True)
-            for i, dt in enumerate(session_datetimes_utc):
-                new_session = Session(session_number=i + 1, start_time=dt, status='Upcoming')
-                assignment.sessions.append(new_session)
             db.session.add(assignment)
-        
+            db.session.flush()
+            insert_sessions(assignment.id, session_datetimes_utc)
+
         db.session.commit()
         return jsonify(success=True, message="Batches assigned and sessions scheduled successfully.")
 
@@ -238,6 +241,68 @@ def get_batch_students(batch_id):
     student_list = [{'name': student.user.name, 'reg_num': student.reg_num} for student in students]
     return jsonify(success=True, students=student_list, batch_name=batch.name)
 
+def get_session_ownership(session_id):
+    return db.session.query(MentorAssignment.mentor_id, MentorAssignment.batch_id)\
+        .join(Session, Session.mentor_assignment_id == MentorAssignment.id)\
+        .filter(Session.id == session_id).first()
+
+def get_batch_mentee_ids(batch_id):
+    return {row[0] for row in db.session.query(MenteeProfile.user_id).filter(MenteeProfile.batch_id == batch_id).all()}
+
+def save_session_record(session_id, mentee_id, form_type, data):
+    ModelClass = SINGLE_RECORD_FORM_MODELS[form_type]
+
+    if 'internship_provided' in data:
+        data['internship_provided'] = data['internship_provided'] == 'true'
+    
+    for key, value in list(data.items()):
+        if value == '': data[key] = None
+
+    upsert_session_record(ModelClass, session_id, mentee_id, data)
+    record_session_change(session_id, mentee_id)
+    invalidate_mentee_report(mentee_id)
+
+def save_multi_session_record(session_id, mentee_id, form_type, records_data, course_type=None):
+    ModelClass = MULTI_RECORD_FORM_MODELS[form_type]
+
+    for record_data in records_data:
+        if form_type == 'honors_minor_marks':
+            record_data['semester'] = course_type or 'N/A'
+        
+        if 'course_acceleration_deceleration' in record_data and record_data['course_acceleration_deceleration'] == True:
+             record_data['course_acceleration_deceleration'] = 'Acceleration/De-Acceleration'
+        else:
+            record_data.pop('course_acceleration_deceleration', None)
+
+        for key, value in list(record_data.items()):
+            if value == '':
+                record_data[key] = None
+
+    inserted, updated, deleted = sync_multi_records(ModelClass, session_id, mentee_id, records_data)
+    if inserted or updated or deleted:
+        record_session_change(session_id, mentee_id)
+        invalidate_mentee_report(mentee_id)
+    return inserted, updated, deleted
+
+def parse_attendance_map(payload):
+    """Returns ({mentee_id: status}, None) from a single or bulk attendance payload, or (None, error_message)."""
+    attendance = payload.get('attendance')
+    if attendance is None and payload.get('mentee_id') is not None:
+        attendance = {payload.get('mentee_id'): payload.get('status')}
+    if not isinstance(attendance, dict) or not attendance:
+        return None, "An attendance map of mentee_id to status is required."
+    try:
+        status_map = {int(mentee_id): status for mentee_id, status in attendance.items()}
+    except (TypeError, ValueError):
+        return None, "Mentee ids must be integers."
+    if any(status not in ATTENDANCE_STATUSES for status in status_map.values()):
+        return None, "Invalid status"
+    return status_map, None
+
+def save_attendance(session_id, status_map):
+    write_attendance(session_id, status_map)
+    record_session_changes(session_id, list(status_map))
+
 @api_bp.route('/mentor/session/add_record', methods=['POST'])
 @login_required
 @role_required('mentor')
@@ -256,45 +321,15 @@ def add_session_record():
     if not all([mentee_id, session_id, form_type]):
         return jsonify(success=False, message="Missing essential record identification (mentee, session, form type)."), 400
 
-    form_map = {
-        'placement_information': PlacementInformation, 'research_record': ResearchRecord,
-        'mentor_meeting_details': MentorMeetingDetails, 'awards_achievements': AwardsAndAchievements, 
-        'cocurricular_activity': CocurricularActivityRecord, 'extracurricular_activity': ExtracurricularActivityRecord, 
-        'internship_information': InternshipInformation
-    }
-
-    if form_type not in form_map:
+    if form_type not in SINGLE_RECORD_FORM_MODELS:
         return jsonify(success=False, message="Invalid form type specified."), 400
     
-    ModelClass = form_map[form_type]
-    
     session_obj = Session.query.get_or_404(session_id)
     if session_obj.assignment.mentor_id != current_user.id:
         return jsonify(success=False, message="Unauthorized"), 403
 
     try:
-        if 'internship_provided' in data:
-            data['internship_provided'] = data['internship_provided'] == 'true'
-        
-        for key, value in list(data.items()):
-            if value == '': data[key] = None
-        
-        for key, value in list(data.items()):
-            if value == '': data[key] = None
-
-        existing_record = ModelClass.query.filter_by(session_id=session_id, mentee_id=mentee_id).first()
-        
-        if existing_record:
-            for key, value in data.items():
-                if hasattr(existing_record, key) and key != 'id':
-                    setattr(existing_record, key, value)
-        else:
-            new_record_data = data.copy()
-            new_record_data['mentee_id'] = mentee_id
-            new_record_data['session_id'] = session_id
-            new_record = ModelClass(**new_record_data)
-            db.session.add(new_record)
-        
+        save_session_record(session_id, mentee_id, form_type, data)
         db.session.commit()
         return jsonify(success=True)
     except Exception as e:
@@ -310,12 +345,7 @@ def add_multi_session_record():
     form_type = data.get('form_type')
     records_data = data.get('records', [])
     
-    ModelClass = None
-    if form_type == 'academic_mark_details':
-        ModelClass = AcademicSemesterMarkDetails
-    elif form_type == 'honors_minor_marks':
-        ModelClass = HonorsMinorMarksDetails
-    else:
+    if form_type not in MULTI_RECORD_FORM_MODELS:
         return jsonify(success=False, message="Invalid form type for multi-record."), 400
 
     session_obj = Session.query.get_or_404(data.get('session_id'))
@@ -323,29 +353,12 @@ def add_multi_session_record():
         return jsonify(success=False, message="Unauthorized"), 403
 
     try:
-        ModelClass.query.filter_by(session_id=data['session_id'], mentee_id=data['mentee_id']).delete()
-        
-        for record_data in records_data:
-            record_data['mentee_id'] = data['mentee_id']
-            record_data['session_id'] = data['session_id']
-            
-            if form_type == 'honors_minor_marks':
-                record_data['semester'] = data.get('course_type', 'N/A')
-            
-            if 'course_acceleration_deceleration' in record_data and record_data['course_acceleration_deceleration'] == True:
-                 record_data['course_acceleration_deceleration'] = 'Acceleration/De-Acceleration'
-            else:
-                record_data.pop('course_acceleration_deceleration', None)
+        inserted, updated, deleted = save_multi_session_record(data['session_id'], data['mentee_id'], form_type, records_data, data.get('course_type'))
+        if not (inserted or updated or deleted):
+            return jsonify(success=True, changed=False)
 
-            for key, value in list(record_data.items()):
-                if value == '':
-                    record_data[key] = None
-
-            new_record = ModelClass(**record_data)
-            db.session.add(new_record)
-        
         db.session.commit()
-        return jsonify(success=True)
+        return jsonify(success=True, changed=True, inserted=inserted, updated=updated, deleted=deleted)
     except Exception as e:
         db.session.rollback()
         print(f"Error saving multi-record: {e}")
@@ -364,19 +377,12 @@ def update_attendance():
     if session_obj.assignment.mentor_id != current_user.id:
         return jsonify(success=False, message="Unauthorized"), 403
 
+    if status not in ATTENDANCE_STATUSES:
+        return jsonify(success=False, message="Invalid status"), 400
+
     try:
-        if status == "Absent":
-            existing_record = AttendanceRecord.query.filter_by(session_id=session_id, mentee_id=mentee_id).first()
-            if not existing_record:
-                record = AttendanceRecord(session_id=session_id, mentee_id=mentee_id, status='Absent')
-                db.session.add(record)
-            else:
-                existing_record.status = 'Absent'
-        elif status == "Present":
-            AttendanceRecord.query.filter_by(session_id=session_id, mentee_id=mentee_id).delete()
-        else:
-            return jsonify(success=False, message="Invalid status"), 400
-            
+        write_attendance(session_id, {mentee_id: status})
+        record_session_change(session_id, mentee_id)
         db.session.commit()
         return jsonify(success=True)
     except Exception as e:
@@ -384,6 +390,134 @@ def update_attendance():
         print(f"Error updating attendance: {e}")
         return jsonify(success=False, message="An error occurred while updating attendance."), 500
 
+@api_bp.route('/mentor/session/<int:session_id>/attendance/bulk', methods=['POST'])
+@login_required
+@role_required('mentor')
+def update_attendance_bulk(session_id):
+    data = request.get_json() or {}
+    if not isinstance(data.get('attendance'), dict):
+        return jsonify(success=False, message="An attendance map of mentee_id to status is required."), 400
+
+    session_row = get_session_ownership(session_id)
+    if not session_row:
+        return jsonify(success=False, message="Session not found."), 404
+    if session_row.mentor_id != current_user.id:
+        return jsonify(success=False, message="Unauthorized"), 403
+
+    status_map, error_message = parse_attendance_map(data)
+    if error_message:
+        return jsonify(success=False, message=error_message), 400
+
+    unknown_ids = set(status_map) - get_batch_mentee_ids(session_row.batch_id)
+    if unknown_ids:
+        return jsonify(success=False, message=f"Mentees {sorted(unknown_ids)} are not part of this session's batch."), 400
+
+    try:
+        save_attendance(session_id, status_map)
+        db.session.commit()
+        return jsonify(success=True, updated=len(status_map))
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating bulk attendance: {e}")
+        return jsonify(success=False, message="An error occurred while updating attendance."), 500
+
+def apply_sync_operation(session_id, batch_mentee_ids, operation):
+    """Applies one queued live-session write. Returns a per-operation result dict."""
+    op_type = operation.get('type')
+    payload = dict(operation.get('payload') or {})
+
+    if op_type == 'attendance':
+        status_map, error_message = parse_attendance_map(payload)
+        if error_message:
+            return {'status': 'error', 'message': error_message}
+        unknown_ids = set(status_map) - batch_mentee_ids
+        if unknown_ids:
+            return {'status': 'error', 'message': f"Mentees {sorted(unknown_ids)} are not part of this session's batch."}
+        save_attendance(session_id, status_map)
+        return {'status': 'ok', 'updated': len(status_map)}
+
+    try:
+        mentee_id = int(payload.pop('mentee_id', None))
+    except (TypeError, ValueError):
+        return {'status': 'error', 'message': "A valid mentee_id is required."}
+    if mentee_id not in batch_mentee_ids:
+        return {'status': 'error', 'message': "Mentee is not part of this session's batch."}
+    payload.pop('session_id', None)
+    form_type = payload.pop('form_type', None)
+
+    if op_type == 'record':
+        if form_type not in SINGLE_RECORD_FORM_MODELS:
+            return {'status': 'error', 'message': "Invalid form type specified."}
+        validation_error = validate_record_data(form_type, payload)
+        if validation_error:
+            return {'status': 'error', 'message': validation_error}
+        save_session_record(session_id, mentee_id, form_type, payload)
+        return {'status': 'ok'}
+
+    if op_type == 'multi_record':
+        if form_type not in MULTI_RECORD_FORM_MODELS:
+            return {'status': 'error', 'message': "Invalid form type for multi-record."}
+        inserted, updated, deleted = save_multi_session_record(session_id, mentee_id, form_type, payload.get('records', []), payload.get('course_type'))
+        return {'status': 'ok', 'changed': bool(inserted or updated or deleted)}
+
+    return {'status': 'error', 'message': f"Unknown operation type '{op_type}'."}
+
+@api_bp.route('/mentor/session/<int:session_id>/sync', methods=['POST'])
+@login_required
+@role_required('mentor')
+def sync_session_operations(session_id):
+    data = request.get_json() or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify(success=False, message="A list of operations is required."), 400
+    if len(operations) > MAX_SYNC_OPERATIONS:
+        return jsonify(success=False, message=f"At most {MAX_SYNC_OPERATIONS} operations can be synced at once."), 400
+
+    keys = [operation.get('key') if isinstance(operation, dict) else None for operation in operations]
+    if not all(isinstance(key, str) and 0 < len(key) <= 64 for key in keys):
+        return jsonify(success=False, message="Every operation needs an idempotency key of at most 64 characters."), 400
+
+    session_row = get_session_ownership(session_id)
+    if not session_row:
+        return jsonify(success=False, message="Session not found."), 404
+    if session_row.mentor_id != current_user.id:
+        return jsonify(success=False, message="Unauthorized"), 403
+
+    applied_results = {
+        op.idempotency_key: json.loads(op.result)
+        for op in SyncOperation.query.filter(SyncOperation.idempotency_key.in_(set(keys)), SyncOperation.session_id == session_id).all()
+    }
+    batch_mentee_ids = get_batch_mentee_ids(session_row.batch_id)
+
+    results = []
+    try:
+        for key, operation in zip(keys, operations):
+            if key in applied_results:
+                results.append(dict(applied_results[key], key=key, replayed=True))
+                continue
+
+            try:
+                with db.session.begin_nested():
+                    result = apply_sync_operation(session_id, batch_mentee_ids, operation)
+            except Exception as e:
+                # Unexpected failures may be transient, so the key is not recorded and the client keeps the
+                # operation queued. Later operations are left unanswered too, so they still apply in order.
+                print(f"Error applying sync operation {key}: {e}")
+                results.append({'status': 'error', 'key': key, 'replayed': False, 'retryable': True,
+                                'message': "An error occurred while applying this change; it will be retried."})
+                break
+
+            db.session.add(SyncOperation(idempotency_key=key, session_id=session_id, result=json.dumps(result)))
+            applied_results[key] = result
+            results.append(dict(result, key=key, replayed=False))
+
+        db.session.commit()
+        return jsonify(success=True, results=results)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error syncing session operations: {e}")
+        return jsonify(success=False, message="An error occurred while syncing changes."), 500
+
 @api_bp.route('/mentor/session/<int:session_id>/start', methods=['POST'])
 @login_required
 @role_required('mentor')
@@ -427,25 +561,26 @@ def get_session_records():
             val = getattr(model_instance, column.name)
             d[column.name] = val.isoformat() if isinstance(val, (datetime, date)) else val
         return d
-        
-    models_to_check = { 
-        'placement_information': PlacementInformation, 'research_record': ResearchRecord, 
-        'academic_mark_details': AcademicSemesterMarkDetails, 'awards_achievements': AwardsAndAchievements, 
-        'cocurricular_activity': CocurricularActivityRecord, 'extracurricular_activity': ExtracurricularActivityRecord,
-        'internship_information': InternshipInformation, 'mentor_meeting_details': MentorMeetingDetails,
-        'honors_minor_marks': HonorsMinorMarksDetails 
-    }
 
-    for name, model in models_to_check.items():
-        if name == 'mentor_meeting_details':
-            continue 
-            
+    for name, model in LIVE_SESSION_RECORD_MODELS.items():
         record_results = model.query.filter_by(session_id=session_id, mentee_id=mentee_id).all()
         if record_results: 
             records[name] = [model_to_dict(r) for r in record_results]
 
     return jsonify(success=True, records=records)
 
+@api_bp.route('/mentor/session/<int:session_id>/snapshot', methods=['GET'])
+@login_required
+@role_required('mentor')
+def get_session_snapshot(session_id):
+    session_obj = Session.query.get_or_404(session_id)
+    if session_obj.assignment.mentor_id != current_user.id:
+        return jsonify(success=False, message="Unauthorized"), 403
+
+    since = request.args.get('since', type=int)
+    snapshot = build_live_snapshot(session_obj, LIVE_SESSION_RECORD_MODELS, since_version=since)
+    return jsonify(success=True, **snapshot)
+
 @api_bp.route('/mentor/session/get_attendance', methods=['GET'])
 @login_required
 @role_required('mentor')
@@ -497,6 +632,7 @@ def request_leave(session_id):
         )
         db.session.add(new_request)
         db.session.add(notification)
+        record_session_change(session_id, current_user.id)
         db.session.commit()
         return jsonify(success=True, message="Leave request submitted successfully.")
     except Exception as e:
@@ -526,6 +662,7 @@ def action_leave_request(request_id):
             message=f"Your leave request for the session on {session.start_time.strftime('%d-%b-%Y')} has been {leave_request.status}.",
         )
         db.session.add(notification)
+        record_session_change(session.id, leave_request.mentee_id)
         db.session.commit()
         return jsonify(success=True, message=f"Request has been {leave_request.status}.")
     except Exception as e:
@@ -568,4 +705,86 @@ def get_session_details(session_id):
         'cabin_details': cabin_details_str,
     }
     
-    return jsonify(success=True, details=details)
\ No newline at end of file
+    return jsonify(success=True, details=details)
+
+def report_job_response(job):
+    job_status = report_job_status(job)
+    job_status['status_url'] = url_for('api.get_report_job', job_id=job.id)
+    job_status['download_url'] = url_for('api.download_report_job', job_id=job.id) if job.status == 'Completed' else None
+    return job_status
+
+def get_owned_report_job(job_id):
+    job = db.session.get(ReportJob, job_id)
+    if job is None or (job.requested_by != current_user.id and current_user.role != 'admin'):
+        return None
+    return job
+
+@api_bp.route('/meetings', methods=['GET'])
+@login_required
+def meetings():
+    try:
+        range_start, range_end = parse_meeting_range(request.args)
+    except ValueError as e:
+        return jsonify(success=False, message=str(e)), 400
+
+    meeting_list = load_meetings(current_user, range_start, range_end,
+                                 mentor_id=request.args.get('mentor_id', type=int),
+                                 class_id=request.args.get('class_id', type=int),
+                                 batch_id=request.args.get('batch_id', type=int))
+    response = jsonify(success=True, meetings=meeting_list, range_start=range_start.isoformat(), range_end=range_end.isoformat())
+    # Revalidated on every navigation; months that have not changed come back as an empty 304.
+    response.set_etag(meetings_etag(meeting_list), weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@api_bp.route('/report_jobs', methods=['POST'])
+@login_required
+def create_report_job():
+    data = request.get_json() or {}
+    job_type = data.get('job_type')
+    try:
+        target_id = int(data.get('target_id'))
+    except (TypeError, ValueError):
+        return jsonify(success=False, message="A numeric target_id is required."), 400
+    if job_type not in REPORT_JOB_TYPES:
+        return jsonify(success=False, message=f"job_type must be one of: {', '.join(REPORT_JOB_TYPES)}."), 400
+    if not can_request_report(current_user, job_type, target_id):
+        return jsonify(success=False, message="Unauthorized"), 403
+    if not report_job_mentee_ids(job_type, target_id):
+        return jsonify(success=False, message="There are no active mentees to generate reports for."), 404
+
+    job = submit_report_job(current_user, job_type, target_id)
+    return jsonify(success=True, job=report_job_response(job)), 202
+
+@api_bp.route('/report_jobs/<int:job_id>', methods=['GET'])
+@login_required
+def get_report_job(job_id):
+    job = get_owned_report_job(job_id)
+    if job is None:
+        return jsonify(success=False, message="Report job not found."), 404
+    return jsonify(success=True, job=report_job_response(job))
+
+@api_bp.route('/report_jobs/<int:job_id>', methods=['DELETE'])
+@login_required
+def delete_report_job(job_id):
+    job = get_owned_report_job(job_id)
+    if job is None:
+        return jsonify(success=False, message="Report job not found."), 404
+    if not cancel_report_job(job.id):
+        db.session.refresh(job)
+        return jsonify(success=False, message="This report job is no longer queued.", job=report_job_response(job)), 409
+    db.session.refresh(job)
+    return jsonify(success=True, job=report_job_response(job))
+
+@api_bp.route('/report_jobs/<int:job_id>/download', methods=['GET'])
+@login_required
+def download_report_job(job_id):
+    job = get_owned_report_job(job_id)
+    if job is None:
+        return jsonify(success=False, message="Report job not found."), 404
+    if job.status in ('Queued', 'Running'):
+        return jsonify(success=False, message="The report is not ready yet."), 409
+    if not report_job_artifact_available(job):
+        return jsonify(success=False, message="This report has expired or failed. Please request it again."), 410
+    return send_file(job.artifact_path, as_attachment=True, download_name=job.artifact_name, max_age=0)
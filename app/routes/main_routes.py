@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, redirect, url_for, abort, request,
 from flask_login import current_user, login_required
 from ..models import User
 from .. import db
+from ..utils.report_cache import invalidate_mentee_report
 import os
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -44,6 +45,8 @@ def profile():
                     profile_pic.save(file_path)
                     current_user.profile_picture = f'/static/img/profiles/{unique_filename}'
                     db.session.commit()
+                    if current_user.role == 'mentee':
+                        invalidate_mentee_report(current_user.id)
                     flash('Profile picture updated successfully!', 'success')
                 except Exception as e:
                     db.session.rollback()
@@ -134,6 +137,7 @@ def profile():
                 mentee_profile.residence_address = request.form.get('residence_address')
 
                 db.session.commit()
+                invalidate_mentee_report(current_user.id)
                 flash('Your profile has been updated successfully!', 'success')
             except Exception as e:
                 db.session.rollback()
@@ -1,13 +1,14 @@
-from flask import Blueprint, render_template, abort, redirect, url_for, request, flash, Response, current_app
+from flask import Blueprint, render_template, abort, redirect, url_for, request, flash, current_app
 from flask_login import login_required, current_user
-from ..utils.__init__ import role_required, timestamp_to_local
+from ..utils.__init__ import role_required
 from ..models import (User, MenteeProfile, Session, MentorAssignment, LeaveRequest, PlacementInformation, ResearchRecord, 
                      AcademicSemesterMarkDetails, MentorMeetingDetails, AwardsAndAchievements, 
                      CocurricularActivityRecord, ExtracurricularActivityRecord, InternshipInformation,
-                     HonorsMinorMarksDetails, AttendanceRecord, Class, Batch)
-from datetime import datetime, timezone, date, timedelta
+                     HonorsMinorMarksDetails, Class, Batch)
+from datetime import datetime, date
 from .. import db
-from ..utils.report_generator import generate_mentee_full_report
+from ..utils.report_cache import mentee_report_response, invalidate_mentee_report
+from ..utils.session_snapshot import load_session_records, load_attendance_status, present_status
 
 mentee_bp = Blueprint('mentee', __name__, url_prefix='/mentee')
 
@@ -85,6 +86,7 @@ def dashboard():
             mentee_profile.profile_complete = True
             
             db.session.commit()
+            invalidate_mentee_report(current_user.id)
             flash('Profile updated successfully! Welcome to your dashboard.', 'success')
             return redirect(url_for('mentee.dashboard'))
         except Exception as e:
@@ -100,14 +102,12 @@ def dashboard():
 
     sessions_with_status = []
     if mentee_profile.batch_id:
-        now_utc = datetime.now(timezone.utc)
         upcoming_sessions = db.session.query(Session).join(
             MentorAssignment, Session.mentor_assignment_id == MentorAssignment.id
         ).filter(
             MentorAssignment.batch_id == mentee_profile.batch_id,
             MentorAssignment.is_active == True,
-            Session.status.in_(['Upcoming', 'In Progress']),
-            Session.start_time >= now_utc
+            Session.has_effective_status('Upcoming')
         ).order_by(Session.start_time.asc()).all()
 
         if upcoming_sessions:
@@ -137,7 +137,7 @@ def completed_sessions():
         if assignment:
             sessions = Session.query.filter(
                 Session.mentor_assignment_id == assignment.id,
-                Session.status.in_(['Completed', 'Missed'])
+                Session.has_effective_status('Completed', 'Missed')
             ).order_by(Session.start_time.desc()).all()
             
     return render_template('completed_sessions.html', sessions=sessions)
@@ -160,21 +160,8 @@ def session_details(session_id):
         'Honors Minor Marks Details': HonorsMinorMarksDetails
     }
     
-    mentee_records = {}
-    for name, model in models_to_check.items():
-        records = model.query.filter_by(session_id=session.id, mentee_id=current_user.id).all()
-        if records:
-            mentee_records[name] = [model_to_dict(r) for r in records]
-
-    approved_leave = LeaveRequest.query.filter_by(session_id=session.id, mentee_id=current_user.id, status='Approved').first()
-    marked_absent = AttendanceRecord.query.filter_by(session_id=session.id, mentee_id=current_user.id, status='Absent').first()
-    status_info = None
-    if approved_leave:
-        status_info = { "status": "Leave Approved", "details": f"Requested on {timestamp_to_local(approved_leave.requested_at, 'date_only')}, Approved on {timestamp_to_local(approved_leave.actioned_at, 'date_only')}"}
-    elif marked_absent:
-        status_info = { "status": "Marked Absent", "details": f"Marked as absent by mentor."}
-    else:
-        status_info = { "status": "Present", "details": ""}
+    mentee_records = load_session_records(session.id, models_to_check, [current_user.id]).get(current_user.id, {})
+    status_info = load_attendance_status(session.id, [current_user.id]).get(current_user.id, present_status())
             
     return render_template('mentee/session_details.html', 
                            session=session, 
@@ -191,15 +178,9 @@ def download_mentee_full_report():
     if not mentee_profile:
         abort(404)
 
-    pdf_bytes, filename = generate_mentee_full_report(mentee_user.id) 
+    response = mentee_report_response(mentee_user.id)
 
-    if pdf_bytes is None:
+    if response is None:
         flash("Could not generate report.", "danger")
         return redirect(url_for('mentee.dashboard'))
-
-    response = Response(
-        pdf_bytes,
-        mimetype='application/pdf'
-    )
-    response.headers['Content-Disposition'] = f'attachment;filename={filename}' 
     return response
\ No newline at end of file
@@ -1,14 +1,15 @@
-from flask import Blueprint, render_template, abort, redirect, url_for, flash, Response, current_app
+from flask import Blueprint, render_template, abort, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
-from ..utils.__init__ import role_required, timestamp_to_local
+from ..utils.__init__ import role_required
 from ..models import (User, Batch, MenteeProfile, MentorAssignment, Session, Class, LeaveRequest,
-                     AttendanceRecord, AcademicSemesterMarkDetails, PlacementInformation, ResearchRecord, 
+                     AcademicSemesterMarkDetails, PlacementInformation, ResearchRecord, 
                      HonorsMinorMarksDetails, MentorMeetingDetails, AwardsAndAchievements, 
                      CocurricularActivityRecord, ExtracurricularActivityRecord, InternshipInformation)
-from datetime import datetime, timedelta, timezone, date
+from datetime import datetime, date
 from sqlalchemy import distinct, or_
 from .. import db
-from ..utils.report_generator import generate_mentee_full_report
+from ..utils.report_cache import mentee_report_response
+from ..utils.session_snapshot import build_session_details
 
 mentor_bp = Blueprint('mentor', __name__, url_prefix='/mentor')
 
@@ -32,24 +33,13 @@ def dashboard():
 @login_required
 @role_required('mentor')
 def sessions():
-    now = datetime.now(timezone.utc)
-    session_duration = timedelta(hours=1)
-    
     base_query = Session.query.join(MentorAssignment).filter(
         MentorAssignment.mentor_id == current_user.id,
         MentorAssignment.is_active == True
     )
 
-    live_sessions = base_query.filter(
-        Session.start_time <= now,
-        Session.start_time > (now - session_duration),
-        Session.status.in_(['Upcoming', 'In Progress'])
-    ).order_by(Session.start_time.asc()).all()
-
-    upcoming_sessions = base_query.filter(
-        Session.start_time > now,
-        Session.status == 'Upcoming'
-    ).order_by(Session.start_time.asc()).all()
+    live_sessions = base_query.filter(Session.has_effective_status('Live')).order_by(Session.start_time.asc()).all()
+    upcoming_sessions = base_query.filter(Session.has_effective_status('Upcoming')).order_by(Session.start_time.asc()).all()
     
     filter_data_query = db.session.query(
         Class.name.label('class_name'),
@@ -78,9 +68,8 @@ def live_session(session_id):
     if session.assignment.mentor_id != current_user.id:
         abort(403)
         
-    now = datetime.now(timezone.utc)
-    session_end_time = session.start_time + timedelta(hours=1)
-    if not (session.status == "In Progress" or (session.start_time <= now < session_end_time and session.status == "Upcoming")):
+    # A started session stays open past its scheduled slot until the mentor ends it.
+    if not (session.status == "In Progress" or session.effective_status == 'Live'):
         flash("This session is not currently live or has already been completed.", "warning")
         return redirect(url_for('mentor.sessions'))
 
@@ -114,7 +103,7 @@ def leave_requests():
 def completed_sessions():
     completed_and_missed_sessions = Session.query.join(MentorAssignment).filter(
         MentorAssignment.mentor_id == current_user.id,
-        Session.status.in_(['Completed', 'Missed'])
+        Session.has_effective_status('Completed', 'Missed')
     ).order_by(Session.start_time.desc()).all()
     
     return render_template('completed_sessions.html', sessions=completed_and_missed_sessions)
@@ -135,25 +124,7 @@ def session_details(session_id):
         'Honors Or Minors Marks': HonorsMinorMarksDetails
     }
     
-    mentees_in_batch = session.assignment.batch.mentees.join(User).order_by(User.name).all()
-    all_data = {}
-
-    for mentee_profile in mentees_in_batch:
-        mentee_user = mentee_profile.user
-        mentee_records = {}
-        for name, model in models_to_check.items():
-            records = model.query.filter_by(session_id=session.id, mentee_id=mentee_user.id).all()
-            if records: mentee_records[name] = [model_to_dict(r) for r in records]
-        approved_leave = LeaveRequest.query.filter_by(session_id=session.id, mentee_id=mentee_user.id, status='Approved').first()
-        marked_absent = AttendanceRecord.query.filter_by(session_id=session.id, mentee_id=mentee_user.id, status='Absent').first()
-        status_info = None
-        if approved_leave:
-            status_info = { "status": "Leave Approved", "details": f"Requested on {timestamp_to_local(approved_leave.requested_at, 'date_only')}, Approved on {timestamp_to_local(approved_leave.actioned_at, 'date_only')}"}
-        elif marked_absent:
-            status_info = { "status": "Marked Absent", "details": f"Marked as absent by mentor."}
-        else:
-            status_info = { "status": "Present", "details": ""}
-        all_data[mentee_user.id] = {'name': mentee_user.name, 'records': mentee_records, 'attendance': status_info}
+    all_data = build_session_details(session, models_to_check)
             
     return render_template('session_details.html', session=session, all_data=all_data)
 
@@ -203,15 +174,9 @@ def download_report(user_id):
     if not is_assigned:
         abort(403)
 
-    pdf_bytes, filename = generate_mentee_full_report(user_id)
+    response = mentee_report_response(user_id)
 
-    if pdf_bytes is None:
+    if response is None:
         flash("Could not generate report.", "danger")
         return redirect(url_for('mentor.view_mentee', user_id=user_id))
-
-    response = Response(
-        pdf_bytes,
-        mimetype='application/pdf'
-    )
-    response.headers['Content-Disposition'] = f'attachment;filename={filename}'
     return response
\ No newline at end of file
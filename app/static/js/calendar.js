@@ -15,8 +15,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function fetchMeetingsForMonth(year, month) {
         try {
-            // Month is 0-indexed in JS, but API might expect 1-indexed
-            const response = await getData(`/api/meetings?year=${year}&month=${month + 1}`);
+            // Month is 0-indexed in JS; the API takes a [from, to) window of local dates.
+            const isoDate = date => `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+            const from = isoDate(new Date(year, month, 1));
+            const to = isoDate(new Date(year, month + 1, 1));
+            const response = await fetchData(`/api/meetings?from=${from}&to=${to}`);
             if (response.success) {
                 return response.meetings;
             } else {
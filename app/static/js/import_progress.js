@@ -0,0 +1,39 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const POLL_INTERVAL_MS = 1000;
+
+    function newUploadId() {
+        const bytes = new Uint8Array(16);
+        crypto.getRandomValues(bytes);
+        return Array.from(bytes, byte => byte.toString(16).padStart(2, '0')).join('');
+    }
+
+    function describe(progress) {
+        if (progress.phase === 'validating') {
+            return `Validating... ${progress.rows} of ${progress.total_rows} rows (${progress.percent}%)`;
+        }
+        return progress.percent === null ? 'Reading file...' : `Reading file... ${progress.percent}%`;
+    }
+
+    document.querySelectorAll('form[data-import-progress]').forEach(form => {
+        form.addEventListener('submit', function() {
+            const uploadId = newUploadId();
+            const progressUrl = form.dataset.importProgress.replace('__upload_id__', uploadId);
+            const status = form.querySelector('[data-import-progress-status]');
+            form.querySelector('input[name="upload_id"]').value = uploadId;
+            form.querySelector('button[type="submit"]').disabled = true;
+            status.textContent = 'Uploading...';
+
+            // The page is replaced by the review page when the upload request finishes, which ends the polling.
+            setInterval(async function() {
+                try {
+                    const data = await fetchData(progressUrl);
+                    if (data.success) {
+                        status.textContent = describe(data.progress);
+                    }
+                } catch (error) {
+                    console.error('Error fetching import progress:', error);
+                }
+            }, POLL_INTERVAL_MS);
+        });
+    });
+});
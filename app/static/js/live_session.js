@@ -3,6 +3,11 @@ document.addEventListener('DOMContentLoaded', () => {
     let selectedMenteeName = null;
     const sessionId = window.location.pathname.split('/')[3];
     let menteeDataState = {}; 
+    let attendanceState = {};
+    let snapshotVersion = null;
+    let sessionStarted = false;
+    const SNAPSHOT_REFRESH_MS = 30000;
+    const multiRecordTypes = ['academic_mark_details', 'honors_minor_marks'];
 
     const menteeListItems = document.querySelectorAll('.mentee-list li');
     const initialStateDiv = document.getElementById('panel-initial-state');
@@ -15,6 +20,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const menteeActionsDiv = document.querySelector('.mentee-actions');
     const recordEntrySection = document.getElementById('record-entry-section');
     const leaveApprovedMessageDiv = document.getElementById('leave-approved-message');
+    const markAllPresentBtn = document.getElementById('mark-all-present-btn');
+    const markAllAbsentBtn = document.getElementById('mark-all-absent-btn');
 
     const singleSubjectFormHTML = `
         <div class="subject-entry-form" style="border-top: 1px solid var(--live-border-color); margin-top: 1rem; padding-top: 1rem;">
@@ -160,10 +167,9 @@ document.addEventListener('DOMContentLoaded', () => {
         const formWrapper = dynamicFormContainer.querySelector('[data-form-type]');
         if (!formWrapper) return;
         
-        await fetchMenteeRecordsAndSetInitialState();
         let localData = menteeDataState[selectedMenteeId] ? menteeDataState[selectedMenteeId][formType] : null;
 
-        const isMultiRecord = ['academic_mark_details', 'honors_minor_marks'].includes(formType);
+        const isMultiRecord = multiRecordTypes.includes(formType);
 
         if (isMultiRecord) {
             const subjectsContainer = formWrapper.querySelector('.subjects-container');
@@ -223,38 +229,183 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    async function fetchMenteeRecordsAndSetInitialState() {
-        if (!selectedMenteeId) return;
-        menteeDataState[selectedMenteeId] = {}; 
-        
+    const QUEUE_DB_NAME = 'live-session-write-queue';
+    const QUEUE_STORE_NAME = 'operations';
+    const memoryQueue = new Map();
+    let queueDbPromise = null;
+    let flushInFlight = null;
+
+    function openQueueDb() {
+        if (!window.indexedDB) return Promise.resolve(null);
+        if (!queueDbPromise) {
+            queueDbPromise = new Promise(resolve => {
+                const request = indexedDB.open(QUEUE_DB_NAME, 1);
+                request.onupgradeneeded = () => {
+                    request.result.createObjectStore(QUEUE_STORE_NAME, { keyPath: 'key' });
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => {
+                    console.error("IndexedDB unavailable, keeping the write queue in memory:", request.error);
+                    resolve(null);
+                };
+            });
+        }
+        return queueDbPromise;
+    }
+
+    function queueTransaction(mode, action) {
+        return openQueueDb().then(queueDb => {
+            if (!queueDb) return action(null);
+            return new Promise((resolve, reject) => {
+                const tx = queueDb.transaction(QUEUE_STORE_NAME, mode);
+                const result = action(tx.objectStore(QUEUE_STORE_NAME));
+                tx.oncomplete = () => resolve(result && result.result !== undefined ? result.result : result);
+                tx.onerror = () => reject(tx.error);
+            });
+        });
+    }
+
+    function queuePut(operation) {
+        return queueTransaction('readwrite', store => store ? store.put(operation) : memoryQueue.set(operation.key, operation));
+    }
+
+    function queueGetAll() {
+        return queueTransaction('readonly', store => store ? store.getAll() : Array.from(memoryQueue.values()));
+    }
+
+    function queueDelete(keys) {
+        return queueTransaction('readwrite', store => keys.forEach(key => store ? store.delete(key) : memoryQueue.delete(key)));
+    }
+
+    function newIdempotencyKey() {
+        if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+    }
+
+    async function pendingOperations() {
+        const operations = await queueGetAll();
+        return operations.filter(op => op.session_id === sessionId).sort((a, b) => a.queued_at - b.queued_at);
+    }
+
+    // Matches MAX_SYNC_OPERATIONS on the server.
+    const SYNC_BATCH_SIZE = 200;
+
+    async function syncBatch(operations) {
+        const response = await fetch(`/api/mentor/session/${sessionId}/sync`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ operations: operations.map(({ key, type, payload }) => ({ key, type, payload })) })
+        });
+        const result = await response.json();
+        if (result.success) return result.results;
+        if (response.status >= 400 && response.status < 500 && response.status !== 408 && response.status !== 429) {
+            // The server rejected the batch as a whole and would reject it again; drop it rather than let it
+            // block every later change, and report the reason against each of its operations.
+            const message = result.message || 'The server rejected these changes.';
+            return operations.map(({ key }) => ({ key, status: 'error', message: message, replayed: false }));
+        }
+        throw new Error(result.message || 'Failed to sync changes.');
+    }
+
+    // Sends the queue oldest first in batches the server accepts. Operations the server marks retryable, and
+    // those after them, stay queued so they are replayed in order on the next flush.
+    function flushQueue() {
+        if (flushInFlight) return flushInFlight;
+        flushInFlight = (async () => {
+            const operations = await pendingOperations();
+            const resultsByKey = {};
+            for (let start = 0; start < operations.length; start += SYNC_BATCH_SIZE) {
+                const batch = operations.slice(start, start + SYNC_BATCH_SIZE);
+                const results = await syncBatch(batch);
+                results.forEach(opResult => { resultsByKey[opResult.key] = opResult; });
+                await queueDelete(results.filter(opResult => !opResult.retryable).map(opResult => opResult.key));
+                if (results.length < batch.length || results.some(opResult => opResult.retryable)) break;
+            }
+            return resultsByKey;
+        })().finally(() => { flushInFlight = null; });
+        return flushInFlight;
+    }
+
+    // Queues a write and tries to sync it. Resolves to { queued: true } when the network is down;
+    // the operation stays in the queue and is replayed with the same idempotency key later.
+    async function submitOperation(type, payload) {
+        const operation = { key: newIdempotencyKey(), session_id: sessionId, type: type, payload: payload, queued_at: Date.now() };
+        await queuePut(operation);
+        let results;
         try {
-            const response = await fetch(`/api/mentor/session/get_records?session_id=${sessionId}&mentee_id=${selectedMenteeId}`);
-            const result = await response.json();
-            if (result.success && result.records) {
-                for (const formType in result.records) {
-                    if (result.records[formType] && result.records[formType].length > 0) {
-                        menteeDataState[selectedMenteeId][formType] = ['academic_mark_details', 'honors_minor_marks'].includes(formType) 
-                                                                        ? result.records[formType] 
-                                                                        : result.records[formType][0];
-                    }
+            results = await flushQueue();
+            if (!results[operation.key]) results = await flushQueue();
+        } catch (error) {
+            if (error instanceof TypeError) return { queued: true };
+            throw error;
+        }
+        const opResult = results[operation.key];
+        if (!opResult || opResult.retryable) return { queued: true };
+        if (opResult.status !== 'ok') throw new Error(opResult.message || 'Failed to save changes.');
+        return { queued: false, result: opResult };
+    }
+
+    async function refreshFromServer() {
+        try {
+            await flushQueue();
+        } catch (error) {
+            console.error("Failed to sync queued changes:", error);
+        }
+        if ((await pendingOperations()).length === 0) {
+            await loadSnapshot();
+        }
+    }
+
+    function applySnapshot(snapshot) {
+        for (const menteeId in snapshot.mentees) {
+            const menteeSnapshot = snapshot.mentees[menteeId];
+            const records = {};
+            for (const formType in menteeSnapshot.records) {
+                const formRecords = menteeSnapshot.records[formType];
+                if (formRecords && formRecords.length > 0) {
+                    records[formType] = multiRecordTypes.includes(formType) ? formRecords : formRecords[0];
                 }
             }
+            menteeDataState[menteeId] = records;
+            attendanceState[menteeId] = menteeSnapshot.attendance;
+
+            const menteeItem = document.querySelector(`.mentee-list li[data-mentee-id="${menteeId}"]`);
+            if (menteeItem) {
+                menteeItem.dataset.hasLeave = String(menteeSnapshot.attendance.has_leave);
+            }
+        }
+        snapshotVersion = snapshot.version;
+    }
+
+    async function loadSnapshot() {
+        const query = snapshotVersion === null ? '' : `?since=${snapshotVersion}`;
+        try {
+            const response = await fetch(`/api/mentor/session/${sessionId}/snapshot${query}`);
+            const result = await response.json();
+            if (result.success) {
+                applySnapshot(result);
+            }
         } catch (error) {
-            console.error("Failed to fetch records:", error);
-            menteeDataState[selectedMenteeId] = {};
+            console.error("Failed to load session snapshot:", error);
         }
     }
-    
+
+    const snapshotReady = refreshFromServer();
+
     async function selectMentee(menteeItem) {
         menteeListItems.forEach(item => item.classList.remove('selected'));
         menteeItem.classList.add('selected');
         selectedMenteeId = menteeItem.dataset.menteeId;
         selectedMenteeName = menteeItem.dataset.menteeName;
-        const hasLeave = menteeItem.dataset.hasLeave === 'true';
         
-        await fetch('/api/mentor/session/' + sessionId + '/start', { method: 'POST' });
+        if (!sessionStarted) {
+            await fetch('/api/mentor/session/' + sessionId + '/start', { method: 'POST' });
+            sessionStarted = true;
+        }
 
-        await fetchMenteeRecordsAndSetInitialState(); 
+        await snapshotReady;
+        if (!menteeDataState[selectedMenteeId]) menteeDataState[selectedMenteeId] = {};
+        const hasLeave = menteeItem.dataset.hasLeave === 'true';
 
         selectedMenteeNameElem.textContent = `Recording for: ${selectedMenteeName}`;
         initialStateDiv.style.display = 'none';
@@ -276,8 +427,7 @@ document.addEventListener('DOMContentLoaded', () => {
             leaveApprovedMessageDiv.style.display = 'none';
             absentCheckbox.disabled = false;
 
-            const attendanceResponse = await fetch(`/api/mentor/session/get_attendance?session_id=${sessionId}&mentee_id=${selectedMenteeId}`);
-            const attendanceData = await attendanceResponse.json();
+            const attendanceData = attendanceState[selectedMenteeId] || { is_absent: false };
             absentCheckbox.checked = attendanceData.is_absent;
             recordTypeSelector.disabled = attendanceData.is_absent;
         }
@@ -291,19 +441,8 @@ document.addEventListener('DOMContentLoaded', () => {
             resetRecordTypeSelector();
         }
         try {
-            const response = await fetch('/api/mentor/session/attendance', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    session_id: sessionId,
-                    mentee_id: selectedMenteeId,
-                    status: isChecked ? 'Absent' : 'Present'
-                })
-            });
-            const result = await response.json();
-            if (!result.success) {
-                throw new Error(result.message || "Failed to update attendance.");
-            }
+            await submitOperation('attendance', { mentee_id: selectedMenteeId, status: isChecked ? 'Absent' : 'Present' });
+            attendanceState[selectedMenteeId] = { ...(attendanceState[selectedMenteeId] || {}), is_absent: isChecked };
         } catch (error) {
             console.error('Failed to update attendance:', error);
             alert('Could not update attendance. Please try again.');
@@ -312,6 +451,42 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
     
+    async function handleMarkAll(status) {
+        if (!confirm(`Mark every mentee without an approved leave as ${status}?`)) return;
+
+        const attendance = {};
+        menteeListItems.forEach(item => {
+            if (item.dataset.hasLeave !== 'true') {
+                attendance[item.dataset.menteeId] = status;
+            }
+        });
+        if (Object.keys(attendance).length === 0) return;
+
+        markAllPresentBtn.disabled = true;
+        markAllAbsentBtn.disabled = true;
+        try {
+            await submitOperation('attendance', { attendance: attendance });
+            const isAbsent = status === 'Absent';
+            for (const menteeId in attendance) {
+                attendanceState[menteeId] = { ...(attendanceState[menteeId] || {}), is_absent: isAbsent };
+            }
+            if (selectedMenteeId && attendance[selectedMenteeId]) {
+                absentCheckbox.checked = isAbsent;
+                recordTypeSelector.disabled = isAbsent;
+                if (isAbsent) {
+                    dynamicFormContainer.innerHTML = '';
+                    resetRecordTypeSelector();
+                }
+            }
+        } catch (error) {
+            console.error('Failed to update attendance:', error);
+            alert('Could not update attendance. Please try again.');
+        } finally {
+            markAllPresentBtn.disabled = false;
+            markAllAbsentBtn.disabled = false;
+        }
+    }
+
     async function handleMultiSubjectFormSubmit(formWrapper) {
         const formType = formWrapper.dataset.formType;
         const records = [];
@@ -353,19 +528,10 @@ document.addEventListener('DOMContentLoaded', () => {
         }
 
         try {
-            const response = await fetch('/api/mentor/session/add_multi_record', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(payload)
-            });
-            const result = await response.json();
-            if (result.success) {
-                alert('Records saved successfully!');
-                menteeDataState[selectedMenteeId][formType] = records.map(record => ({...record}));
-                await showForm(formType); 
-            } else {
-                throw new Error(result.message || 'Failed to save multi-record.');
-            }
+            const submission = await submitOperation('multi_record', payload);
+            alert(submission.queued ? 'You are offline. Records are saved on this device and will sync automatically.' : 'Records saved successfully!');
+            menteeDataState[selectedMenteeId][formType] = records.map(record => ({...record}));
+            await showForm(formType); 
         } catch (error) {
             alert(`Error: ${error.message}`);
         } finally {
@@ -398,19 +564,10 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         
         try {
-            const response = await fetch('/api/mentor/session/add_record', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(data)
-            });
-            const result = await response.json();
-            if (result.success) {
-                alert('Record saved successfully!');
-                menteeDataState[selectedMenteeId][formType] = {...data};
-                await showForm(formType); 
-            } else {
-                throw new Error(result.message || 'Failed to save record.');
-            }
+            const submission = await submitOperation('record', data);
+            alert(submission.queued ? 'You are offline. The record is saved on this device and will sync automatically.' : 'Record saved successfully!');
+            menteeDataState[selectedMenteeId][formType] = {...data};
+            await showForm(formType); 
         } catch (error) {
             alert(`Error: ${error.message}`);
         } finally {
@@ -531,6 +688,10 @@ document.addEventListener('DOMContentLoaded', () => {
         await showForm(e.target.value); 
     });
     absentCheckbox.addEventListener('change', handleAttendanceChange);
+    markAllPresentBtn.addEventListener('click', () => handleMarkAll('Present'));
+    markAllAbsentBtn.addEventListener('click', () => handleMarkAll('Absent'));
+    window.addEventListener('online', refreshFromServer);
+    setInterval(refreshFromServer, SNAPSHOT_REFRESH_MS);
     dynamicFormContainer.addEventListener('submit', handleFormSubmit);
     endSessionBtn.addEventListener('click', handleEndSession);
 });
\ No newline at end of file
@@ -0,0 +1,74 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const POLL_INTERVAL_MS = 2000;
+    // If no worker picks the job up in this time, cancel it and fall back to the button's direct download link.
+    const QUEUE_FALLBACK_MS = 30000;
+
+    function delay(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function runReportJob(button) {
+        const originalHtml = button.innerHTML;
+        button.classList.add('disabled');
+        button.setAttribute('aria-disabled', 'true');
+        try {
+            let data = await fetchData('/api/report_jobs', 'POST', {
+                job_type: button.dataset.reportJobType,
+                target_id: button.dataset.reportJobTarget
+            });
+            if (!data.success) {
+                showAlert(data.message, 'danger');
+                return;
+            }
+
+            const queuedSince = Date.now();
+            let job = data.job;
+            while (job.status === 'Queued' || job.status === 'Running') {
+                if (job.status === 'Queued' && Date.now() - queuedSince > QUEUE_FALLBACK_MS) {
+                    data = await fetchData(job.status_url, 'DELETE');
+                    if (data.success) {
+                        window.location.href = button.href;
+                        return;
+                    }
+                    // A worker claimed the job while we were cancelling it; keep following it.
+                    if (!data.job) {
+                        showAlert(data.message, 'danger');
+                        return;
+                    }
+                    job = data.job;
+                    continue;
+                }
+                button.textContent = job.status === 'Queued' ? 'Queued...' : `Generating... ${job.progress}%`;
+                await delay(POLL_INTERVAL_MS);
+                data = await fetchData(job.status_url);
+                if (!data.success) {
+                    showAlert(data.message, 'danger');
+                    return;
+                }
+                job = data.job;
+            }
+
+            if (job.status === 'Completed') {
+                window.location.href = job.download_url;
+            } else {
+                showAlert(job.message || 'Report generation failed. Please try again.', 'danger');
+            }
+        } catch (error) {
+            console.error('Error running report job:', error);
+            showAlert('A network error occurred. Please try again.', 'danger');
+        } finally {
+            button.innerHTML = originalHtml;
+            button.classList.remove('disabled');
+            button.removeAttribute('aria-disabled');
+        }
+    }
+
+    document.querySelectorAll('[data-report-job-type]').forEach(button => {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            if (!button.classList.contains('disabled')) {
+                runReportJob(button);
+            }
+        });
+    });
+});
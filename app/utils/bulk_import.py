@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from .. import db
+from ..models import User
+
+IMPORT_CHUNK_SIZE = 1000
+# Below this many passwords per worker, starting the spawn pool costs more than hashing in-process.
+HASH_POOL_MIN_PER_WORKER = 8
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def get_hash_worker_count():
+    return current_app.config.get('IMPORT_HASH_WORKERS') or os.cpu_count() or 1
+
+def get_hash_pool():
+    """Returns this process's password hashing pool, starting it on first use."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=get_hash_worker_count(),
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return _hash_pool
+
+def _discard_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+def hash_passwords(passwords):
+    """Hashes passwords in order, spread over the hashing pool. Each hash is a deliberately slow KDF run."""
+    passwords = list(passwords)
+    worker_count = get_hash_worker_count()
+    if worker_count == 1 or len(passwords) < worker_count * HASH_POOL_MIN_PER_WORKER:
+        return [generate_password_hash(password) for password in passwords]
+    chunksize = max(1, -(-len(passwords) // (worker_count * 4)))
+    try:
+        return list(get_hash_pool().map(generate_password_hash, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        _discard_hash_pool()
+        raise
+
+def insert_users_with_profiles(user_rows, Profile, profile_rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """Inserts users and their profiles, one executemany per chunk, without committing.
+
+    user_rows and profile_rows are parallel lists of column dicts; each profile gets the id of its user.
+    """
+    users, profiles = User.__table__, Profile.__table__
+    for offset in range(0, len(user_rows), chunk_size):
+        user_ids = db.session.execute(
+            insert(users).returning(users.c.id, sort_by_parameter_order=True),
+            user_rows[offset:offset + chunk_size]
+        ).scalars().all()
+        db.session.execute(insert(profiles), [
+            dict(profile_row, user_id=user_id)
+            for user_id, profile_row in zip(user_ids, profile_rows[offset:offset + chunk_size])
+        ])
+    return len(user_rows)
+
+def import_users(role, row_chunks, Profile, credential_key, profile_row):
+    """Creates one user plus profile per import row and commits once at the end; the row's credential_key value is its initial password.
+
+    row_chunks is an iterable of row lists, so only one chunk is held in memory at a time.
+    Returns (row count, elapsed seconds) so callers can report throughput.
+    """
+    started = time.perf_counter()
+    count = 0
+    for rows in row_chunks:
+        password_hashes = hash_passwords(row[credential_key] for row in rows)
+        user_rows = [
+            {'email': row.get('Email'), 'name': row['Name'], 'role': role, 'password_hash': password_hash,
+             'must_change_password': True}
+            for row, password_hash in zip(rows, password_hashes)
+        ]
+        count += insert_users_with_profiles(user_rows, Profile, [profile_row(row) for row in rows])
+    db.session.commit()
+    elapsed = time.perf_counter() - started
+    current_app.logger.info("Imported %d %s users in %.2fs (%.0f rows/s)", count, role, elapsed, count / elapsed if elapsed else 0)
+    return count, elapsed
+
+def throughput_message(count, elapsed):
+    return f"{count} rows in {elapsed:.1f}s, {count / elapsed if elapsed else count:.0f} rows/s"
@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app, Response
+from .. import db
+from ..models import MenteeProfile
+
+REPORTS_PER_TASK = 8
+
+_report_pool = None
+_report_pool_lock = threading.Lock()
+
+def _init_report_worker():
+    """Runs once in each pool process: builds the app, keeps its context pushed and parses the report fonts and watermark."""
+    from .. import create_app
+    from .report_generator import get_report_resources
+    app = create_app()
+    app.app_context().push()
+    get_report_resources()
+
+def _render_reports(user_ids):
+    """Loads the data for a group of mentees with one query per table, then renders each report."""
+    from .report_generator import load_mentee_report_data, report_filename
+    from .report_cache import open_cached_report
+    try:
+        report_data = load_mentee_report_data(user_ids)
+        db.session.expunge_all()
+    finally:
+        db.session.remove()
+    results = []
+    for user_id in user_ids:
+        if user_id in report_data:
+            pdf_file, _ = open_cached_report(report_data[user_id])
+            with pdf_file:
+                results.append((user_id, pdf_file.read(), report_filename(report_data[user_id])))
+        else:
+            results.append((user_id, None, None))
+    return results
+
+def get_report_worker_count():
+    return current_app.config.get('REPORT_EXPORT_WORKERS') or os.cpu_count() or 1
+
+def get_report_pool():
+    """Returns this process's report pool, starting it on first use."""
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is None:
+            # spawn, not fork: forked children would share the parent's open database connections.
+            _report_pool = ProcessPoolExecutor(
+                max_workers=get_report_worker_count(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_report_worker
+            )
+        return _report_pool
+
+def _discard_report_pool():
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is not None:
+            _report_pool.shutdown(wait=False, cancel_futures=True)
+        _report_pool = None
+
+def get_mentee_ids(class_id=None, batch_id=None):
+    query = db.session.query(MenteeProfile.user_id).filter(MenteeProfile.is_active == True)
+    if class_id is not None:
+        query = query.filter(MenteeProfile.class_id == class_id)
+    if batch_id is not None:
+        query = query.filter(MenteeProfile.batch_id == batch_id)
+    return [user_id for user_id, in query.order_by(MenteeProfile.reg_num).all()]
+
+class _ZipStream:
+    """Write-only sink for ZipFile. Having no seek() makes ZipFile write data descriptors instead of seeking back."""
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def _unique_name(filename, used_names):
+    base, extension = os.path.splitext(filename)
+    candidate, counter = filename, 1
+    while candidate in used_names:
+        counter += 1
+        candidate = f"{base}_{counter}{extension}"
+    used_names.add(candidate)
+    return candidate
+
+def stream_reports_zip(mentee_ids, pool, max_in_flight):
+    """Yields a ZIP archive of mentee reports chunk by chunk, adding PDFs as soon as a worker finishes a group.
+
+    At most max_in_flight groups of REPORTS_PER_TASK mentees are queued or rendered at once, so memory
+    stays bounded by that window.
+    """
+    stream = _ZipStream()
+    used_names, failed_ids = set(), []
+    mentee_ids = list(mentee_ids)
+    remaining_groups = iter([mentee_ids[i:i + REPORTS_PER_TASK] for i in range(0, len(mentee_ids), REPORTS_PER_TASK)])
+    pending = {}
+
+    def refill():
+        while len(pending) < max_in_flight:
+            group = next(remaining_groups, None)
+            if group is None:
+                return
+            pending[pool.submit(_render_reports, group)] = group
+
+    try:
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as archive:
+            refill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        _discard_report_pool()
+                        raise
+                    except Exception as e:
+                        current_app.logger.exception("Reports for mentees %s failed: %s", group, e)
+                        failed_ids.extend(str(user_id) for user_id in group)
+                        continue
+                    for user_id, pdf_bytes, filename in results:
+                        if pdf_bytes is None:
+                            failed_ids.append(str(user_id))
+                            continue
+                        archive.writestr(_unique_name(filename, used_names), pdf_bytes)
+                    yield stream.drain()
+                refill()
+
+            if failed_ids:
+                archive.writestr('failed_reports.txt', "Reports could not be generated for mentee ids:\n" + "\n".join(failed_ids) + "\n")
+        yield stream.drain()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def bulk_reports_response(mentee_ids, archive_name):
+    pool = get_report_pool()
+    max_in_flight = get_report_worker_count() * 2
+    app = current_app._get_current_object()
+
+    def generate():
+        with app.app_context():
+            yield from stream_reports_zip(mentee_ids, pool, max_in_flight)
+
+    response = Response(generate(), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment;filename={archive_name}'
+    return response
@@ -0,0 +1,209 @@
+import os
+import re
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from flask import Response
+from .. import db
+from ..models import (User, Batch, MenteeProfile, MentorAssignment, Session, AttendanceRecord, LeaveRequest,
+                      AcademicSemesterMarkDetails, HonorsMinorMarksDetails, PlacementInformation, InternshipInformation)
+from .__init__ import timestamp_to_local
+
+EXPORT_TYPES = {
+    'attendance': 'Attendance',
+    'marks': 'Marks',
+    'placements': 'Placements_and_Internships',
+}
+EXPORT_YIELD_PER = 1000
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MARK_COLUMNS = [
+    ('Semester', 'semester'), ('Subject', 'subject_code_name'), ('CIA-1', 'cia_1'), ('CIA-2', 'cia_2'),
+    ('CIA-3', 'cia_3'), ('Overall CIA', 'overall_cia'), ('ESE Attempt-1', 'ese_attempt_1'),
+    ('ESE Attempt-2', 'ese_attempt_2'), ('ESE Attempt-3', 'ese_attempt_3'), ('ESE Attempt-4', 'ese_attempt_4'),
+    ('Grade', 'grade'), ('Attendance %', 'attendance_percentage'),
+    ('Course Acceleration/Deceleration', 'course_acceleration_deceleration'), ('GPA', 'gpa'), ('CGPA', 'cgpa'),
+    ('Suggestions by Mentor', 'suggestions_by_mentor'),
+]
+PLACEMENT_COLUMNS = [
+    ('Company Name', 'company_name'), ('Location', 'company_location'), ('Interview Date', 'interview_date'),
+    ('Rounds Attended', 'rounds_attended'), ('Internship Provided', 'internship_provided'),
+    ('Annual CTC (Rs.)', 'annual_ctc'), ('Stipend (Rs.)', 'stipend_amount'), ('Status', 'interview_status'),
+]
+INTERNSHIP_COLUMNS = [
+    ('Company Name', 'company_name'), ('Duration From', 'duration_from'), ('Duration To', 'duration_to'),
+    ('Sem', 'sem'), ('Domain', 'technology_domain'), ('Project Details', 'internship_project_details'),
+    ('Location', 'company_location'), ('Status', 'internship_status'),
+]
+MENTEE_COLUMNS = ['Reg. No', 'Name', 'Batch']
+
+def _header_row(worksheet, titles):
+    bold = Font(bold=True)
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(worksheet, value=title)
+        cell.font = bold
+        cells.append(cell)
+    return cells
+
+def _sheet_title(title, used_titles):
+    """Excel sheet names are at most 31 characters and cannot contain []:*?/\\."""
+    base = re.sub(r'[\[\]:*?/\\]', '_', title)[:31] or 'Sheet'
+    candidate, counter = base, 1
+    while candidate.lower() in used_titles:
+        counter += 1
+        suffix = f" ({counter})"
+        candidate = base[:31 - len(suffix)] + suffix
+    used_titles.add(candidate.lower())
+    return candidate
+
+def _scope_filter(query, class_id, batch_id):
+    if class_id is not None:
+        query = query.where(MenteeProfile.class_id == class_id)
+    if batch_id is not None:
+        query = query.where(MenteeProfile.batch_id == batch_id)
+    return query
+
+def _stream_partitions(statement):
+    """Runs statement on a server-side cursor where the driver has one and yields lists of at most EXPORT_YIELD_PER rows."""
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_YIELD_PER))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+def _export_batches(class_id, batch_id):
+    query = db.select(Batch.id, Batch.name).order_by(Batch.name, Batch.id)
+    if class_id is not None:
+        query = query.where(Batch.class_id == class_id)
+    if batch_id is not None:
+        query = query.where(Batch.id == batch_id)
+    return db.session.execute(query).all()
+
+def write_attendance_sheets(workbook, class_id=None, batch_id=None):
+    """One mentee x session matrix per batch: P present, A absent, L approved leave, over the batch's completed sessions."""
+    used_titles = set()
+    for current_batch_id, batch_name in _export_batches(class_id, batch_id):
+        worksheet = workbook.create_sheet(_sheet_title(batch_name, used_titles))
+        sessions = db.session.execute(
+            db.select(Session.id, Session.session_number, Session.start_time)
+            .join(MentorAssignment, MentorAssignment.id == Session.mentor_assignment_id)
+            .where(MentorAssignment.batch_id == current_batch_id, Session.status == 'Completed')
+            .order_by(Session.start_time, Session.id)
+        ).all()
+        session_ids = [session_id for session_id, _, _ in sessions]
+        session_titles = [f"S{number} ({timestamp_to_local(start_time, 'date_only')})" for _, number, start_time in sessions]
+        worksheet.append(_header_row(worksheet, MENTEE_COLUMNS + session_titles + ['Present', 'Absent', 'Leave', 'Attendance %']))
+        worksheet.freeze_panes = 'D2'
+
+        mentees = db.select(MenteeProfile.user_id, MenteeProfile.reg_num, User.name)\
+            .join(User, User.id == MenteeProfile.user_id)\
+            .where(MenteeProfile.batch_id == current_batch_id, MenteeProfile.is_active == True)\
+            .order_by(MenteeProfile.reg_num, MenteeProfile.user_id)
+        for partition in _stream_partitions(mentees):
+            mentee_ids = [mentee_id for mentee_id, _, _ in partition]
+            absences, leaves = set(), set()
+            if session_ids:
+                absences = set(db.session.execute(
+                    db.select(AttendanceRecord.mentee_id, AttendanceRecord.session_id).where(
+                        AttendanceRecord.mentee_id.in_(mentee_ids), AttendanceRecord.session_id.in_(session_ids),
+                        AttendanceRecord.status == 'Absent')
+                ).all())
+                leaves = set(db.session.execute(
+                    db.select(LeaveRequest.mentee_id, LeaveRequest.session_id).where(
+                        LeaveRequest.mentee_id.in_(mentee_ids), LeaveRequest.session_id.in_(session_ids),
+                        LeaveRequest.status == 'Approved')
+                ).all())
+
+            for mentee_id, reg_num, name in partition:
+                marks = ['L' if (mentee_id, session_id) in leaves else 'A' if (mentee_id, session_id) in absences else 'P'
+                         for session_id in session_ids]
+                present, absent, leave = marks.count('P'), marks.count('A'), marks.count('L')
+                percentage = round(present * 100 / len(marks), 2) if marks else None
+                worksheet.append([reg_num, name, batch_name] + marks + [present, absent, leave, percentage])
+
+def _write_record_sheet(workbook, title, Model, columns, class_id, batch_id, order_by):
+    worksheet = workbook.create_sheet(title)
+    worksheet.append(_header_row(worksheet, MENTEE_COLUMNS + [column_title for column_title, _ in columns]))
+    worksheet.freeze_panes = 'D2'
+    statement = _scope_filter(
+        db.select(MenteeProfile.reg_num, User.name, Batch.name, *[getattr(Model, field) for _, field in columns])
+        .join(User, User.id == Model.mentee_id)
+        .join(MenteeProfile, MenteeProfile.user_id == Model.mentee_id)
+        .outerjoin(Batch, Batch.id == MenteeProfile.batch_id),
+        class_id, batch_id
+    ).order_by(MenteeProfile.reg_num, *order_by, Model.id)
+    for partition in _stream_partitions(statement):
+        for row in partition:
+            worksheet.append(list(row))
+
+def write_marks_sheets(workbook, class_id=None, batch_id=None):
+    for title, Model in (('Academic Marks', AcademicSemesterMarkDetails), ('Honors-Minor Marks', HonorsMinorMarksDetails)):
+        _write_record_sheet(workbook, title, Model, MARK_COLUMNS, class_id, batch_id, order_by=[Model.semester])
+
+def write_placement_sheets(workbook, class_id=None, batch_id=None):
+    _write_record_sheet(workbook, 'Placements', PlacementInformation, PLACEMENT_COLUMNS, class_id, batch_id,
+                        order_by=[PlacementInformation.interview_date])
+    _write_record_sheet(workbook, 'Internships', InternshipInformation, INTERNSHIP_COLUMNS, class_id, batch_id,
+                        order_by=[InternshipInformation.duration_from])
+
+EXPORT_WRITERS = {
+    'attendance': write_attendance_sheets,
+    'marks': write_marks_sheets,
+    'placements': write_placement_sheets,
+}
+
+def build_export_workbook(export_type, class_id=None, batch_id=None):
+    """Writes the export to a temporary .xlsx file and returns its path; the caller removes it.
+
+    Rows come from yield_per cursors and go straight into openpyxl write-only sheets, which spill to disk,
+    so memory stays flat however many rows there are.
+    """
+    workbook = Workbook(write_only=True)
+    EXPORT_WRITERS[export_type](workbook, class_id=class_id, batch_id=batch_id)
+    if not workbook.worksheets:
+        workbook.create_sheet('No batches')
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as export_file:
+        path = export_file.name
+    try:
+        workbook.save(path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+def _read_chunks(export_file):
+    while True:
+        chunk = export_file.read(EXPORT_STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+def excel_export_response(export_type, filename_prefix, class_id=None, batch_id=None):
+    """Streams the workbook from an open handle whose file is already unlinked, so nothing is left behind
+    even if the body is never read. Where an open file cannot be removed (Windows), it goes when the
+    response is closed."""
+    path = build_export_workbook(export_type, class_id=class_id, batch_id=batch_id)
+    export_file = open(path, 'rb')
+    size = os.fstat(export_file.fileno()).st_size
+    try:
+        os.remove(path)
+        removed = True
+    except PermissionError:
+        removed = False
+
+    def close_export_file():
+        export_file.close()
+        if not removed:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    response = Response(_read_chunks(export_file), mimetype=XLSX_MIMETYPE)
+    response.call_on_close(close_export_file)
+    response.headers['Content-Disposition'] = f'attachment;filename={filename_prefix}_{EXPORT_TYPES[export_type]}.xlsx'
+    response.headers['Content-Length'] = str(size)
+    return response
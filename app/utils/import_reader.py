@@ -0,0 +1,71 @@
+import os
+import pandas as pd
+from openpyxl import load_workbook
+
+ROSTER_CHUNK_SIZE = 5000
+
+class RosterFileError(ValueError):
+    """The uploaded roster cannot be used as-is; the message is shown to the admin."""
+
+def _file_size(file):
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+def _prepare_chunk(df, required_columns, column_aliases):
+    df.columns = [str(column).strip() for column in df.columns]
+    for alias, column in column_aliases.items():
+        if alias in df.columns and column not in df.columns:
+            df.rename(columns={alias: column}, inplace=True)
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise RosterFileError(f"File is missing required columns: {', '.join(sorted(missing_columns))}")
+    return df.dropna(how='all')
+
+def _iter_csv_chunks(file, chunk_size, on_progress):
+    size = _file_size(file) or 1
+    with pd.read_csv(file, dtype=str, chunksize=chunk_size) as reader:
+        for df in reader:
+            yield df
+            on_progress(min(file.tell() / size, 1.0))
+
+def _iter_xlsx_chunks(file, chunk_size, on_progress):
+    """Reads the first sheet row by row with openpyxl's read-only mode, which never builds the whole sheet."""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        # max_row comes from the sheet's dimension record, which some writers omit.
+        total_rows = (worksheet.max_row or 0) - 1
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise RosterFileError("The uploaded file is empty.")
+        columns = ['' if title is None else str(title) for title in header]
+        chunk, rows_read = [], 0
+        for row in rows:
+            chunk.append([None if value is None else str(value) for value in row[:len(columns)]])
+            if len(chunk) == chunk_size:
+                rows_read += len(chunk)
+                yield pd.DataFrame(chunk, columns=columns, dtype=object)
+                on_progress(min(rows_read / total_rows, 1.0) if total_rows > 0 else None)
+                chunk = []
+        if chunk or not rows_read:
+            yield pd.DataFrame(chunk, columns=columns, dtype=object)
+            on_progress(1.0)
+    finally:
+        workbook.close()
+
+def iter_roster_chunks(file, filename, required_columns, column_aliases=None, chunk_size=ROSTER_CHUNK_SIZE, on_progress=None):
+    """Yields an uploaded .csv or .xlsx roster as DataFrames of at most chunk_size rows, every value a string or NaN.
+
+    Column names are stripped and column_aliases ({alias: column}) applied; fully blank rows are dropped.
+    on_progress, if given, is called after each chunk with the fraction of the file read so far, or None when
+    that is unknown. Raises RosterFileError when required columns are missing.
+    """
+    column_aliases = column_aliases or {}
+    on_progress = on_progress or (lambda fraction: None)
+    read_chunks = _iter_csv_chunks if filename.endswith('.csv') else _iter_xlsx_chunks
+    for df in read_chunks(file, chunk_size, on_progress):
+        yield _prepare_chunk(df, required_columns, column_aliases)
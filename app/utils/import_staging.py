@@ -0,0 +1,130 @@
+import gzip
+import json
+import os
+import re
+import secrets
+import time
+from itertools import islice
+from flask import current_app
+
+IMPORT_STAGING_SUBFOLDER = 'import_staging'
+_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9_-]{32}')
+# Upload ids are generated by the browser, so only their shape is checked.
+_UPLOAD_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{16,64}')
+
+def _staging_folder():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], IMPORT_STAGING_SUBFOLDER)
+
+def _staging_paths(token):
+    """Returns (header path, rows path) for a token, or None for anything that is not a well-formed token."""
+    if not token or not _TOKEN_PATTERN.fullmatch(token):
+        return None
+    base = os.path.join(_staging_folder(), token)
+    return f"{base}.json", f"{base}.jsonl.gz"
+
+def _write_json(path, value):
+    with open(path + '.part', 'w', encoding='utf-8') as json_file:
+        json.dump(value, json_file)
+    os.replace(path + '.part', path)
+
+def stage_import(kind, row_chunks, user_id, **context):
+    """Writes validated import rows to a gzipped JSON-lines file and returns the token that identifies it.
+
+    row_chunks is an iterable of row lists, written as they arrive. A JSON header next to the rows records kind,
+    the uploading user, the row count and any context (such as class_id) the confirm route has to check.
+    Stale stagings are swept on the way.
+    """
+    expire_import_stagings()
+    os.makedirs(_staging_folder(), exist_ok=True)
+    token = secrets.token_urlsafe(24)
+    header_path, rows_path = _staging_paths(token)
+    row_count = 0
+    try:
+        with gzip.open(rows_path + '.part', 'wt', encoding='utf-8', compresslevel=5) as staging_file:
+            for rows in row_chunks:
+                for row in rows:
+                    staging_file.write(json.dumps(row) + '\n')
+                row_count += len(rows)
+        os.replace(rows_path + '.part', rows_path)
+    except BaseException:
+        if os.path.exists(rows_path + '.part'):
+            os.remove(rows_path + '.part')
+        raise
+    _write_json(header_path, dict(context, kind=kind, user_id=user_id, row_count=row_count, created_at=time.time()))
+    return token
+
+def load_import_staging(token, kind, user_id):
+    """Returns the staging header, or None when the token is unknown, expired or belongs to another import or user."""
+    paths = _staging_paths(token)
+    if paths is None or not all(os.path.exists(path) for path in paths):
+        return None
+    with open(paths[0], encoding='utf-8') as header_file:
+        header = json.load(header_file)
+    if time.time() - header['created_at'] > current_app.config['IMPORT_STAGING_TTL']:
+        discard_import_staging(token)
+        return None
+    if header.get('kind') != kind or header.get('user_id') != user_id:
+        return None
+    return header
+
+def iter_staged_chunks(token, chunk_size):
+    """Yields the staged rows as lists of at most chunk_size dicts, reading the file incrementally."""
+    with gzip.open(_staging_paths(token)[1], 'rt', encoding='utf-8') as staging_file:
+        rows = (json.loads(line) for line in staging_file)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+def _progress_path(upload_id):
+    if not upload_id or not _UPLOAD_ID_PATTERN.fullmatch(upload_id):
+        return None
+    return os.path.join(_staging_folder(), f"progress-{upload_id}.json")
+
+def write_import_progress(upload_id, user_id, **progress):
+    """Records how far an upload has got so the upload page can poll it; a no-op without a valid upload id."""
+    path = _progress_path(upload_id)
+    if path is None:
+        return
+    os.makedirs(_staging_folder(), exist_ok=True)
+    _write_json(path, dict(progress, user_id=user_id))
+
+def read_import_progress(upload_id, user_id):
+    path = _progress_path(upload_id)
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as progress_file:
+            progress = json.load(progress_file)
+    except (OSError, ValueError):
+        return None
+    if progress.pop('user_id', None) != user_id:
+        return None
+    return progress
+
+def discard_import_progress(upload_id):
+    path = _progress_path(upload_id)
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+def discard_import_staging(token):
+    for path in _staging_paths(token) or ():
+        if os.path.exists(path):
+            os.remove(path)
+
+def expire_import_stagings():
+    """Deletes staging and progress files older than IMPORT_STAGING_TTL and returns how many were removed."""
+    folder = _staging_folder()
+    if not os.path.isdir(folder):
+        return 0
+    cutoff = time.time() - current_app.config['IMPORT_STAGING_TTL']
+    removed = 0
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
@@ -0,0 +1,186 @@
+import pickle
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from .import_reader import iter_roster_chunks
+from .import_staging import stage_import, discard_import_staging, write_import_progress, discard_import_progress
+
+MENTOR_LEVELS = ['BTECH', 'MTECH']
+# At most this many rows of each kind are rendered on the review pages; the counts always cover the whole file.
+ROSTER_REVIEW_LIMIT = 1000
+
+def _clean_column(df, column):
+    return df[column].fillna('').astype(str).str.strip()
+
+def _key_hashes(keys):
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def _repeated_in_file(keys, repeated_hashes, name):
+    """Flags keys that occur more than once in the file: within this frame, or across the whole file when
+    repeated_hashes (from repeated_key_hashes) is given."""
+    if repeated_hashes is None:
+        return keys.duplicated(keep=False)
+    return pd.Series(np.isin(_key_hashes(keys), repeated_hashes[name]), index=keys.index)
+
+def repeated_key_hashes(key_hashes):
+    """Reduces {name: [uint64 hash arrays]} collected chunk by chunk to {name: hashes seen more than once}.
+
+    64-bit hashes keep this at 8 bytes per row, whatever the keys look like.
+    """
+    repeated = {}
+    for name, hash_arrays in key_hashes.items():
+        hashes, counts = np.unique(np.concatenate(hash_arrays), return_counts=True)
+        repeated[name] = hashes[counts > 1]
+    return repeated
+
+def _split_rows(data, error_checks, db_duplicate_mask):
+    """Turns an ordered {message: boolean mask} error matrix into the (valid, invalid, db_duplicates) lists the review pages show."""
+    messages = list(error_checks)
+    error_matrix = np.column_stack([error_checks[message].to_numpy(dtype=bool) for message in messages])
+    has_errors = error_matrix.any(axis=1)
+    is_db_duplicate = db_duplicate_mask.to_numpy(dtype=bool)
+
+    records = data.to_dict('records')
+    valid_rows = [records[i] for i in np.flatnonzero(~is_db_duplicate & ~has_errors)]
+    invalid_rows = [
+        {'data': records[i], 'errors': [messages[j] for j in np.flatnonzero(error_matrix[i])]}
+        for i in np.flatnonzero(~is_db_duplicate & has_errors)
+    ]
+    db_duplicates = [records[i] for i in np.flatnonzero(is_db_duplicate)]
+    return valid_rows, invalid_rows, db_duplicates
+
+def clean_student_rows(df):
+    return pd.DataFrame({'Reg_num': _clean_column(df, 'Reg_num'), 'Name': _clean_column(df, 'Name')})
+
+def student_file_keys(data):
+    return {'Reg_num': data['Reg_num'], 'Name': data['Name'].str.lower()}
+
+def validate_student_rows(df, existing_reg_nums, repeated_hashes=None):
+    """Validates an uploaded student roster with column-wise checks, one error matrix for the whole frame.
+
+    Rows whose Reg_num is already in existing_reg_nums go to the database duplicates list whatever else is wrong with them.
+    Every occurrence of a Reg_num or name repeated within the file is flagged, not only the later ones; pass the
+    file-wide repeated_key_hashes as repeated_hashes when df is only one chunk of the file.
+    """
+    data = clean_student_rows(df)
+    reg_num, name = data['Reg_num'], data['Name']
+    file_keys = student_file_keys(data)
+
+    error_checks = {
+        "Reg_num is missing.": reg_num == '',
+        "Name is missing.": name == '',
+        "Reg_num must be numeric.": ~reg_num.str.fullmatch(r'\d+'),
+        "Name cannot contain numbers.": name.str.contains(r'\d', regex=True),
+        "Reg_num is duplicated within this file.": _repeated_in_file(file_keys['Reg_num'], repeated_hashes, 'Reg_num'),
+        "Name is duplicated within this file.": _repeated_in_file(file_keys['Name'], repeated_hashes, 'Name'),
+    }
+    return _split_rows(data, error_checks, reg_num.isin(existing_reg_nums))
+
+def clean_mentor_rows(df):
+    return pd.DataFrame({
+        'Name': _clean_column(df, 'Name'),
+        'level': _clean_column(df, 'level').str.upper(),
+        'Email': _clean_column(df, 'Email').str.lower(),
+    })
+
+def mentor_file_keys(data):
+    return {'Email': data['Email'][data['Email'] != '']}
+
+def validate_mentor_rows(df, existing_emails, repeated_hashes=None):
+    """Validates an uploaded mentor list the same way; existing_emails must be lowercase."""
+    data = clean_mentor_rows(df)
+    name, level, email = data['Name'], data['level'], data['Email']
+    has_email = email != ''
+    email_domain = email.str.split('@').str[1].fillna('')
+
+    error_checks = {
+        "Name is missing.": name == '',
+        "Name cannot contain numbers.": name.str.contains(r'\d', regex=True),
+        "Level is missing.": level == '',
+        "Level must be 'BTECH' or 'MTECH'.": ~level.isin(MENTOR_LEVELS),
+        "Email is missing.": ~has_email,
+        "Invalid email format.": has_email & ~(email.str.contains('@', regex=False) & email_domain.str.contains('.', regex=False)),
+        "Email is duplicated in this file.": has_email & _repeated_in_file(email, repeated_hashes, 'Email'),
+    }
+    return _split_rows(data, error_checks, has_email & email.isin(existing_emails))
+
+ROSTER_VALIDATORS = {
+    'students': (clean_student_rows, student_file_keys, validate_student_rows),
+    'mentors': (clean_mentor_rows, mentor_file_keys, validate_mentor_rows),
+}
+
+def _spilled_chunks(spill_file):
+    while True:
+        try:
+            yield pickle.load(spill_file)
+        except EOFError:
+            return
+
+def stage_validated_roster(kind, chunks, existing_keys, user_id, on_progress=None, **context):
+    """Validates a roster read chunk by chunk and stages its valid rows, holding one chunk in memory at a time.
+
+    The first pass cleans each chunk, hashes its duplicate keys and spills it to a temporary file; the second
+    validates the spilled chunks against the file-wide repeated keys and streams the valid rows into the staging.
+    on_progress is called with the number of rows validated so far. Returns the review page context.
+    """
+    clean_rows, file_keys, validate_rows = ROSTER_VALIDATORS[kind]
+    key_hashes = {}
+    total_rows = 0
+    review = {'valid_count': 0, 'valid_rows': [], 'invalid_rows': [], 'db_duplicates': [],
+              'invalid_count': 0, 'duplicate_count': 0}
+    with tempfile.TemporaryFile() as spill_file:
+        for df in chunks:
+            data = clean_rows(df)
+            for name, keys in file_keys(data).items():
+                key_hashes.setdefault(name, []).append(_key_hashes(keys))
+            pickle.dump(data, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+            total_rows += len(data)
+        repeated_hashes = repeated_key_hashes(key_hashes)
+        del key_hashes
+        spill_file.seek(0)
+
+        def valid_chunks():
+            validated = 0
+            for data in _spilled_chunks(spill_file):
+                valid_rows, invalid_rows, db_duplicates = validate_rows(data, existing_keys, repeated_hashes)
+                for list_key, count_key, rows in (('valid_rows', 'valid_count', valid_rows),
+                                                  ('invalid_rows', 'invalid_count', invalid_rows),
+                                                  ('db_duplicates', 'duplicate_count', db_duplicates)):
+                    review[list_key].extend(rows[:ROSTER_REVIEW_LIMIT - len(review[list_key])])
+                    review[count_key] += len(rows)
+                validated += len(data)
+                if on_progress:
+                    on_progress(validated, total_rows)
+                yield valid_rows
+
+        review['import_token'] = stage_import(kind, valid_chunks(), user_id, **context)
+    if not review['valid_count']:
+        discard_import_staging(review['import_token'])
+        review['import_token'] = None
+    review['total_rows'] = total_rows
+    return review
+
+def review_roster_upload(kind, file, required_columns, existing_keys, user_id, upload_id=None, column_aliases=None, **context):
+    """Reads, validates and stages an uploaded roster, publishing progress under upload_id while it runs.
+
+    Raises RosterFileError for files that cannot be imported as-is. Returns the stage_validated_roster review
+    context plus the elapsed seconds.
+    """
+    started = time.perf_counter()
+
+    def reading(fraction):
+        write_import_progress(upload_id, user_id, phase='reading',
+                              percent=None if fraction is None else int(fraction * 100))
+
+    def validating(validated, total_rows):
+        write_import_progress(upload_id, user_id, phase='validating', rows=validated, total_rows=total_rows,
+                              percent=int(validated * 100 / total_rows) if total_rows else 100)
+
+    try:
+        chunks = iter_roster_chunks(file, file.filename, required_columns, column_aliases, on_progress=reading)
+        review = stage_validated_roster(kind, chunks, existing_keys, user_id, validating, **context)
+    finally:
+        discard_import_progress(upload_id)
+    review['elapsed'] = time.perf_counter() - started
+    return review
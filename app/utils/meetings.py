@@ -0,0 +1,100 @@
+import datetime
+import hashlib
+import json
+from .. import db
+from ..models import User, Class, Batch, MentorAssignment, Session
+from . import get_local_timezone
+from .scheduling import get_session_duration
+
+# Widest window one request may ask for; a calendar month view needs about six weeks.
+MAX_MEETING_RANGE_DAYS = 92
+
+def _parse_bound(value, name):
+    """A YYYY-MM-DD date means local midnight; an ISO datetime without an offset is local time as well."""
+    try:
+        bound = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an ISO date such as 2026-10-01.") from None
+    if bound.tzinfo is None:
+        bound = get_local_timezone().localize(bound)
+    return bound.astimezone(datetime.timezone.utc)
+
+def parse_meeting_range(args):
+    """Returns the UTC [from, to) window of a meetings request.
+
+    The window is either from/to or, as calendar.js used to send, year and month for the whole local month.
+    Raises ValueError for a malformed, empty or oversized window.
+    """
+    if args.get('from') or args.get('to'):
+        range_start, range_end = _parse_bound(args.get('from'), 'from'), _parse_bound(args.get('to'), 'to')
+    else:
+        try:
+            year, month = int(args['year']), int(args['month'])
+            first_day = datetime.datetime(year, month, 1)
+        except (KeyError, ValueError):
+            raise ValueError("Pass either 'from' and 'to' or 'year' and 'month'.") from None
+        next_month = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+        range_start, range_end = _parse_bound(first_day.isoformat(), 'from'), _parse_bound(next_month.isoformat(), 'to')
+    if range_end <= range_start:
+        raise ValueError("'to' must be after 'from'.")
+    if range_end - range_start > datetime.timedelta(days=MAX_MEETING_RANGE_DAYS):
+        raise ValueError(f"A meetings window can span at most {MAX_MEETING_RANGE_DAYS} days.")
+    return range_start, range_end
+
+def load_meetings(user, range_start, range_end, mentor_id=None, class_id=None, batch_id=None):
+    """The sessions user may see that start in [range_start, range_end), in one query ordered by start time.
+
+    Mentors see the sessions of their assignments and mentees those of their batch; admins see every session,
+    optionally narrowed by mentor, class or batch. The filters reach sessions through
+    ix_sessions_mentor_assignment_id_start_time, so each assignment costs one index range scan.
+    """
+    query = db.select(Session.id, Session.session_number, Session.start_time, Session.effective_status,
+                      Session.mentor_assignment_id, Class.name, Batch.name, User.name)\
+        .join(MentorAssignment, MentorAssignment.id == Session.mentor_assignment_id)\
+        .join(Batch, Batch.id == MentorAssignment.batch_id)\
+        .join(Class, Class.id == Batch.class_id)\
+        .join(User, User.id == MentorAssignment.mentor_id)\
+        .where(Session.start_time >= range_start, Session.start_time < range_end)\
+        .order_by(Session.start_time, Session.id)
+
+    if user.role == 'mentor':
+        query = query.where(MentorAssignment.mentor_id == user.id)
+    elif user.role == 'mentee':
+        profile = user.mentee_profile
+        if profile is None or profile.batch_id is None:
+            return []
+        query = query.where(MentorAssignment.batch_id == profile.batch_id)
+    else:
+        if mentor_id:
+            query = query.where(MentorAssignment.mentor_id == mentor_id)
+        if class_id:
+            query = query.where(Batch.class_id == class_id)
+        if batch_id:
+            query = query.where(MentorAssignment.batch_id == batch_id)
+
+    duration = int(get_session_duration().total_seconds() // 60)
+    meetings = []
+    for session_id, session_number, start_time, status, assignment_id, class_name, batch_name, mentor_name in db.session.execute(query):
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=datetime.timezone.utc)
+        group_name = f"{class_name} - {batch_name}"
+        meetings.append({
+            'id': session_id,
+            'title': f"{group_name} (Session {session_number})",
+            'session_number': session_number,
+            'date_time': start_time.isoformat(),
+            'duration': duration,
+            'status': status,
+            'type': 'Mentoring Session',
+            'assignment_id': assignment_id,
+            'class_name': class_name,
+            'batch_name': batch_name,
+            'mentor_name': mentor_name,
+            'mentee_name': group_name,
+            'participant_name': group_name if user.role == 'mentor' else mentor_name,
+        })
+    return meetings
+
+def meetings_etag(meetings):
+    """A weak validator over the whole payload, derived statuses included, so any visible change yields a new tag."""
+    return hashlib.sha256(json.dumps(meetings, sort_keys=True).encode()).hexdigest()[:32]
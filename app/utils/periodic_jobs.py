@@ -0,0 +1,121 @@
+import heapq
+import os
+import random
+import time
+from flask import current_app
+from sqlalchemy import text
+from .. import db
+from .scheduling import sweep_missed_sessions
+from .report_jobs import expire_report_jobs
+from .import_staging import expire_import_stagings
+from .session_snapshot import prune_sync_history
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Key of the PostgreSQL session-level advisory lock that only one scheduler may hold.
+SCHEDULER_LOCK_KEY = 722_460_981
+SCHEDULER_LOCK_FILE = 'scheduler.lock'
+
+def _sweep_sessions():
+    session_ids = sweep_missed_sessions()
+    return f"marked {len(session_ids)} sessions as Missed" if session_ids else None
+
+def _expire_report_jobs():
+    expired = expire_report_jobs()
+    return f"expired {expired} report jobs" if expired else None
+
+def _expire_import_stagings():
+    removed = expire_import_stagings()
+    return f"removed {removed} stale import files" if removed else None
+
+def _prune_sync_history():
+    operations, changes = prune_sync_history()
+    return f"deleted {operations} sync operations and {changes} session changes" if operations or changes else None
+
+# (name, config key of the interval in seconds, job). A job returns a summary worth printing, or None.
+PERIODIC_JOBS = (
+    ('sweep-sessions', 'SESSION_SWEEP_INTERVAL', _sweep_sessions),
+    ('expire-report-jobs', 'MAINTENANCE_INTERVAL', _expire_report_jobs),
+    ('expire-import-stagings', 'MAINTENANCE_INTERVAL', _expire_import_stagings),
+    ('prune-sync-history', 'MAINTENANCE_INTERVAL', _prune_sync_history),
+)
+
+def acquire_scheduler_lock():
+    """Takes the lock that keeps a second scheduler from running the jobs; returns a release callable, or None.
+
+    PostgreSQL uses an advisory lock held by a dedicated connection, so it covers every host. Other databases,
+    SQLite in practice, are local files, so an exclusive lock on a file in the instance folder is enough. Both
+    are released by the operating system or the server if the process dies.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        connection = db.engine.connect()
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': SCHEDULER_LOCK_KEY}).scalar()
+        connection.commit()
+        if not acquired:
+            connection.close()
+            return None
+
+        def release():
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': SCHEDULER_LOCK_KEY})
+            connection.close()
+        return release
+
+    if fcntl is None:
+        return lambda: None
+    os.makedirs(current_app.instance_path, exist_ok=True)
+    lock_file = open(os.path.join(current_app.instance_path, SCHEDULER_LOCK_FILE), 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file.close
+
+def _jittered(interval, jitter):
+    return interval * random.uniform(1 - jitter, 1 + jitter)
+
+def run_periodic_job(name, job, echo=print):
+    """Runs one job, reporting rather than raising its errors so one failing job does not stop the others."""
+    try:
+        summary = job()
+        if summary:
+            echo(f"{name}: {summary}.")
+    except Exception as e:
+        db.session.rollback()
+        echo(f"{name} failed: {e!r}")
+    finally:
+        db.session.remove()
+
+def run_scheduler(echo=print):
+    """Runs PERIODIC_JOBS on their configured intervals until interrupted.
+
+    Every job runs once at start-up, then again after its interval, stretched or shrunk by up to
+    SCHEDULER_JITTER so that instances restarted together drift apart. While another process holds the
+    scheduler lock this one waits on standby and retries every SCHEDULER_LOCK_RETRY seconds.
+    """
+    config = current_app.config
+    jitter = config['SCHEDULER_JITTER']
+    release = None
+    try:
+        while release is None:
+            release = acquire_scheduler_lock()
+            if release is None:
+                echo("Another scheduler holds the lock; waiting on standby.")
+                time.sleep(_jittered(config['SCHEDULER_LOCK_RETRY'], jitter))
+        echo(f"Running {len(PERIODIC_JOBS)} periodic jobs. Press Ctrl+C to stop.")
+
+        due = [(time.monotonic(), index) for index in range(len(PERIODIC_JOBS))]
+        while True:
+            next_run, index = heapq.heappop(due)
+            time.sleep(max(next_run - time.monotonic(), 0))
+            name, interval_key, job = PERIODIC_JOBS[index]
+            run_periodic_job(name, job, echo)
+            heapq.heappush(due, (time.monotonic() + _jittered(config[interval_key], jitter), index))
+    except KeyboardInterrupt:
+        echo("Stopping the scheduler.")
+    finally:
+        if release is not None:
+            release()
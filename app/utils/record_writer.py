@@ -0,0 +1,133 @@
+from collections import defaultdict
+from datetime import date, datetime
+from sqlalchemy import insert, delete, update, select, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from .. import db
+from ..models import AttendanceRecord
+
+ATTENDANCE_STATUSES = ('Absent', 'Present')
+
+def get_dialect_name():
+    return db.session.get_bind().dialect.name
+
+def upsert_rows(model, rows, conflict_columns, update_columns):
+    """Inserts rows, updating update_columns when conflict_columns already exist.
+
+    Uses native ON CONFLICT on PostgreSQL and SQLite; other dialects fall back to select-then-write.
+    """
+    if not rows:
+        return
+
+    dialect_name = get_dialect_name()
+    if dialect_name in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(model.__table__)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        db.session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        existing = model.query.filter_by(**{column: row[column] for column in conflict_columns}).first()
+        if existing:
+            for column in update_columns:
+                setattr(existing, column, row.get(column))
+        else:
+            db.session.execute(insert(model.__table__), [row])
+    db.session.flush()
+
+def upsert_session_record(model, session_id, mentee_id, values):
+    """Writes the single (session_id, mentee_id) row of a record model in one statement."""
+    columns = {column.name for column in model.__table__.columns} - {'id', 'session_id', 'mentee_id'}
+    row = {key: value for key, value in values.items() if key in columns}
+    update_columns = list(row)
+    row['session_id'] = session_id
+    row['mentee_id'] = mentee_id
+    upsert_rows(model, [row], conflict_columns=['session_id', 'mentee_id'], update_columns=update_columns)
+
+def write_attendance(session_id, status_map):
+    """Applies a {mentee_id: 'Absent' | 'Present'} map with one upsert and one delete."""
+    absent_ids = [mentee_id for mentee_id, status in status_map.items() if status == 'Absent']
+    present_ids = [mentee_id for mentee_id, status in status_map.items() if status == 'Present']
+
+    upsert_rows(
+        AttendanceRecord,
+        [{'session_id': session_id, 'mentee_id': mentee_id, 'status': 'Absent'} for mentee_id in absent_ids],
+        conflict_columns=['session_id', 'mentee_id'],
+        update_columns=['status']
+    )
+    if present_ids:
+        db.session.execute(
+            delete(AttendanceRecord).where(
+                AttendanceRecord.session_id == session_id,
+                AttendanceRecord.mentee_id.in_(present_ids)
+            )
+        )
+
+def coerce_column_value(column, value):
+    """Converts a JSON value to the column's Python type so stored and submitted rows compare equal."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    try:
+        if python_type is date:
+            return date.fromisoformat(str(value)[:10])
+        if python_type is datetime:
+            return datetime.fromisoformat(str(value))
+        return python_type(value)
+    except (TypeError, ValueError):
+        return value
+
+def sync_multi_records(model, session_id, mentee_id, records_data, key_column='subject_code_name'):
+    """Makes the stored rows for (session_id, mentee_id) match records_data with the fewest writes.
+
+    Rows are paired by key_column (the nth submitted row with a key pairs with the nth stored row with
+    that key). Changed pairs are updated, unmatched stored rows deleted and unmatched submitted rows
+    inserted, each as one executemany statement. Returns (inserted, updated, deleted) counts.
+    """
+    table = model.__table__
+    data_columns = [column for column in table.columns if column.name not in ('id', 'session_id', 'mentee_id')]
+
+    desired_rows = []
+    for record_data in records_data:
+        desired_rows.append({column.name: coerce_column_value(column, record_data.get(column.name)) for column in data_columns})
+
+    stored_rows = db.session.execute(
+        select(table).where(table.c.session_id == session_id, table.c.mentee_id == mentee_id).order_by(table.c.id)
+    ).mappings().all()
+
+    stored_by_key = defaultdict(list)
+    for stored in stored_rows:
+        stored_by_key[stored[key_column]].append(stored)
+
+    inserts, updates = [], []
+    for desired in desired_rows:
+        candidates = stored_by_key.get(desired[key_column])
+        if candidates:
+            stored = candidates.pop(0)
+            if any(stored[name] != value for name, value in desired.items()):
+                updates.append(dict(desired, _id=stored['id']))
+        else:
+            inserts.append(dict(desired, session_id=session_id, mentee_id=mentee_id))
+    delete_ids = [stored['id'] for candidates in stored_by_key.values() for stored in candidates]
+
+    if delete_ids:
+        db.session.execute(delete(table).where(table.c.id.in_(delete_ids)))
+    if updates:
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('_id')).values({column.name: bindparam(column.name) for column in data_columns}),
+            updates
+        )
+    if inserts:
+        db.session.execute(insert(table), inserts)
+    return len(inserts), len(updates), len(delete_ids)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from flask import current_app, send_file
+from .report_generator import (REPORT_LAYOUT_VERSION, load_mentee_report_data, render_mentee_report, report_filename,
+                               profile_picture_path)
+
+def get_report_cache_dir():
+    return current_app.config['REPORT_CACHE_FOLDER']
+
+def _hash_row(digest, model_instance, exclude=()):
+    values = [getattr(model_instance, column.name) for column in model_instance.__table__.columns if column.name not in exclude]
+    digest.update(json.dumps(values, default=str).encode())
+    digest.update(b'\n')
+
+def report_fingerprint(report_data):
+    """Hashes every value the report renders, so any change to the mentee's data yields a new key."""
+    digest = hashlib.sha256(f"layout:{REPORT_LAYOUT_VERSION}\n".encode())
+    _hash_row(digest, report_data.user, exclude=('password_hash',))
+    _hash_row(digest, report_data.profile)
+    for Model, records in report_data.records.items():
+        digest.update(Model.__tablename__.encode())
+        for record in records:
+            _hash_row(digest, record)
+    digest.update(b'marks')
+    for record in report_data.marks:
+        _hash_row(digest, record)
+    digest.update(b'meetings')
+    for record, start_time in report_data.meetings:
+        _hash_row(digest, record)
+        digest.update(str(start_time).encode())
+
+    picture_path = profile_picture_path(report_data.user)
+    if os.path.exists(picture_path):
+        digest.update(f"picture:{os.path.getmtime(picture_path)}".encode())
+    return digest.hexdigest()[:32]
+
+def get_or_render_report(report_data):
+    """Returns (path, fingerprint) of the cached PDF for report_data, rendering and storing it on a miss."""
+    fingerprint = report_fingerprint(report_data)
+    mentee_dir = os.path.join(get_report_cache_dir(), str(report_data.user.id))
+    path = os.path.join(mentee_dir, f"{fingerprint}.pdf")
+
+    if os.path.exists(path):
+        try:
+            os.utime(path)
+            return path, fingerprint
+        except FileNotFoundError:
+            pass
+
+    pdf_bytes, _ = render_mentee_report(report_data)
+    os.makedirs(mentee_dir, exist_ok=True)
+    # Write to a temp file and rename so concurrent readers never see a partial PDF.
+    with tempfile.NamedTemporaryFile(dir=mentee_dir, suffix='.tmp', delete=False) as temp_file:
+        temp_file.write(pdf_bytes)
+    os.replace(temp_file.name, path)
+    _record_report_write(path, len(pdf_bytes))
+    return path, fingerprint
+
+def open_cached_report(report_data):
+    """Returns (open binary file, fingerprint). The open handle stays readable even if the entry is evicted."""
+    for _ in range(2):
+        path, fingerprint = get_or_render_report(report_data)
+        try:
+            return open(path, 'rb'), fingerprint
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(f"Report cache entry for mentee {report_data.user.id} was evicted twice in a row.")
+
+# Running estimate of the cache size in this process, so a miss does not have to walk the whole cache.
+# Other processes write and invalidate too, so the estimate is reconciled by a full scan every
+# REPORT_CACHE_SCAN_EVERY writes and whenever it exceeds REPORT_CACHE_MAX_BYTES.
+_cache_usage = {'bytes': None, 'writes': 0}
+
+# A scan evicts down to this fraction of the limit, so a bulk export scans once per few percent of the
+# cache instead of on every write once the cache is full.
+REPORT_CACHE_LOW_WATER = 0.9
+
+def _record_report_write(path, size):
+    max_bytes = current_app.config.get('REPORT_CACHE_MAX_BYTES')
+    if not max_bytes:
+        return
+    _cache_usage['writes'] += 1
+    if _cache_usage['bytes'] is not None:
+        _cache_usage['bytes'] += size
+    if (_cache_usage['bytes'] is None or _cache_usage['bytes'] > max_bytes
+            or _cache_usage['writes'] >= current_app.config['REPORT_CACHE_SCAN_EVERY']):
+        enforce_report_cache_limit(keep_path=path)
+
+def enforce_report_cache_limit(keep_path=None):
+    """Evicts least recently used reports until the cache fits in REPORT_CACHE_MAX_BYTES.
+
+    keep_path, the report just written, counts towards the total but is never evicted. Once over the limit
+    the cache is trimmed to REPORT_CACHE_LOW_WATER of it.
+    """
+    max_bytes = current_app.config.get('REPORT_CACHE_MAX_BYTES')
+    cache_dir = get_report_cache_dir()
+    if not max_bytes or not os.path.isdir(cache_dir):
+        return
+
+    entries, total_size = [], 0
+    for dir_path, _, file_names in os.walk(cache_dir):
+        for file_name in file_names:
+            if not file_name.endswith('.pdf'):
+                continue
+            path = os.path.join(dir_path, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            total_size += stat.st_size
+            if path != keep_path:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+    if total_size > max_bytes:
+        target_size = max_bytes * REPORT_CACHE_LOW_WATER
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total_size -= size
+            if total_size <= target_size:
+                break
+    _cache_usage.update(bytes=total_size, writes=0)
+
+def invalidate_mentee_report(mentee_id):
+    """Drops every cached report for a mentee. Called from the write paths that change report content."""
+    shutil.rmtree(os.path.join(get_report_cache_dir(), str(mentee_id)), ignore_errors=True)
+
+def mentee_report_response(user_id):
+    """Serves a mentee's full report from the cache with an ETag, or None if the mentee has no report."""
+    report_data = load_mentee_report_data([user_id]).get(user_id)
+    if report_data is None:
+        return None
+    pdf_file, fingerprint = open_cached_report(report_data)
+    response = send_file(pdf_file, mimetype='application/pdf', as_attachment=True, download_name=report_filename(report_data),
+                         etag=fingerprint, conditional=True, max_age=0)
+    response.cache_control.private = True
+    return response
@@ -1,7 +1,12 @@
+import copy
+import io
+import os
+import threading
 from fpdf import FPDF
+from fpdf.fonts import SubsetMap
+from fpdf.image_datastructures import RasterImageInfo
+from fpdf.image_parsing import get_img_info, load_image
 from flask import current_app
-import os
-import io
 from datetime import datetime, date
 from .. import db
 from ..models import (User, MenteeProfile, Session, MentorAssignment, PlacementInformation, ResearchRecord, 
@@ -10,25 +15,136 @@ from ..models import (User, MenteeProfile, Session, MentorAssignment, PlacementI
                      HonorsMinorMarksDetails)
 from .__init__ import timestamp_to_local
 
+REPORT_FONT_FILES = {'': 'Poppins-Regular.ttf', 'B': 'Poppins-Bold.ttf', 'I': 'Poppins-Italic.ttf'}
+
+_report_resources = None
+_report_resources_lock = threading.Lock()
+
+class ReportResources:
+    """Fonts and watermark for ReportPDF, parsed once per process and shared by every report.
+
+    fpdf2 subsets a document's fonts in place when it writes the PDF, so each document gets a copy of the
+    parsed font with its own subset map and its own (lazily loaded) fontTools object. The copies fill in
+    fpdf2 internals, which is why requirements.txt pins fpdf2: the sharing is checked once per process by
+    rendering a scratch document, and if that or any later copy fails, documents fall back to the public
+    add_font() and image() calls, which parse the files per document.
+    """
+    def __init__(self, root_path):
+        font_dir = os.path.join(root_path, 'static', 'fonts')
+        self.fonts = {}
+        self.font_bytes = {}
+        self.font_paths = {}
+        try:
+            scratch_pdf = FPDF()
+            for style, file_name in REPORT_FONT_FILES.items():
+                font_path = os.path.join(font_dir, file_name)
+                scratch_pdf.add_font('Poppins', style, font_path)
+                with open(font_path, 'rb') as font_file:
+                    self.font_bytes[f"poppins{style}"] = font_file.read()
+                self.font_paths[style] = font_path
+            self.fonts = dict(scratch_pdf.fonts)
+        except RuntimeError:
+            self.fonts = {}
+
+        self.watermark_path = os.path.join(root_path, 'static', 'img', 'watermark.png')
+        self.watermark_info = None
+        if os.path.exists(self.watermark_path):
+            self.watermark_info = get_img_info(self.watermark_path, load_image(self.watermark_path), 'AUTO')
+        self.shared = self._sharing_works()
+
+    def _sharing_works(self):
+        try:
+            pdf = FPDF()
+            self.add_fonts_to(pdf)
+            pdf.add_page()
+            if self.fonts:
+                pdf.set_font('Poppins', '', 10)
+                pdf.cell(text='Report resources check')
+            if self.watermark_info is not None:
+                self.add_watermark_to(pdf)
+                pdf.image(self.watermark_path, x=10, y=10, w=10, h=10)
+            pdf.output()
+            return True
+        except Exception as e:
+            current_app.logger.warning("Sharing parsed report fonts failed, parsing them per report instead: %r", e)
+            return False
+
+    def add_fonts_to(self, pdf):
+        fonts = {}
+        for fontkey, template in self.fonts.items():
+            font = copy.copy(template)
+            font.i = len(pdf.fonts) + len(fonts) + 1
+            font.ttfont = type(template.ttfont)(io.BytesIO(self.font_bytes[fontkey]), recalcTimestamp=False, lazy=True)
+            font._hbfont = None
+            font.biggest_size_pt = 0
+            font.missing_glyphs = []
+            font.subset = SubsetMap(font)
+            fonts[fontkey] = font
+        pdf.fonts.update(fonts)
+
+    def add_watermark_to(self, pdf):
+        """Registers the decoded watermark in pdf's image cache, so pdf.image() embeds it as one XObject without reading the file."""
+        if self.watermark_path in pdf.image_cache.images:
+            return
+        info = RasterImageInfo(self.watermark_info)
+        info['i'] = len(pdf.image_cache.images) + 1
+        info['usages'] = 0
+        info['iccp_i'] = None
+        iccp = info.get('iccp')
+        if iccp is not None:
+            info['iccp_i'] = pdf.image_cache.icc_profiles.setdefault(iccp, len(pdf.image_cache.icc_profiles))
+            info['iccp'] = None
+        pdf.image_cache.images[self.watermark_path] = info
+
+    def install_fonts(self, pdf):
+        if self.shared:
+            try:
+                self.add_fonts_to(pdf)
+                return
+            except Exception as e:
+                current_app.logger.warning("Copying shared report fonts failed, parsing them instead: %r", e)
+        for style, font_path in self.font_paths.items():
+            pdf.add_font('Poppins', style, font_path)
+
+    def install_watermark(self, pdf):
+        """Best effort: if the decoded watermark cannot be registered, pdf.image() loads the file itself."""
+        if not self.shared:
+            return
+        try:
+            self.add_watermark_to(pdf)
+        except Exception as e:
+            current_app.logger.warning("Registering the shared watermark failed, loading it per report instead: %r", e)
+
+def get_report_resources():
+    """Returns this process's report resources, parsing them on first use."""
+    global _report_resources
+    with _report_resources_lock:
+        if _report_resources is None:
+            _report_resources = ReportResources(current_app.root_path)
+        return _report_resources
+
+def clear_report_resources():
+    global _report_resources
+    with _report_resources_lock:
+        _report_resources = None
+
 class ReportPDF(FPDF):
     def __init__(self, orientation='P', unit='mm', format='A4'):
         super().__init__(orientation, unit, format)
         self.set_auto_page_break(auto=False, margin=15)
-        self.watermark_path = os.path.join(current_app.root_path, 'static', 'img', 'watermark.png')
-        
-        font_dir = os.path.join(current_app.root_path, 'static', 'fonts')
-        
-        try:
-            self.add_font('Poppins', '', os.path.join(font_dir, 'Poppins-Regular.ttf'), uni=True)
-            self.add_font('Poppins', 'B', os.path.join(font_dir, 'Poppins-Bold.ttf'), uni=True)
-            self.add_font('Poppins', 'I', os.path.join(font_dir, 'Poppins-Italic.ttf'), uni=True)
+        self.resources = get_report_resources()
+        self.watermark_path = self.resources.watermark_path
+
+        if self.resources.fonts:
+            self.resources.install_fonts(self)
             self.current_font_family = 'Poppins'
-        except RuntimeError:
+        else:
             self.set_font('Arial', '', 10)
             self.current_font_family = 'Arial'
 
     def add_watermark(self):
-        if os.path.exists(self.watermark_path):
+        if self.resources.watermark_info is not None:
+            self.resources.install_watermark(self)
             page_w = self.w
             page_h = self.h
             img_w = 100
@@ -99,19 +215,75 @@ class ReportPDF(FPDF):
 
         self.set_y(y1 + 14)
 
-def generate_mentee_full_report(user_id):
-    mentee_user = User.query.filter_by(id=user_id, role='mentee').first()
-    if not mentee_user or not mentee_user.mentee_profile:
-        return None, None
-    mentee_profile = mentee_user.mentee_profile
+# Bump when the layout changes so cached reports are not served for the old layout.
+REPORT_LAYOUT_VERSION = 1
+REPORT_RECORD_MODELS = [PlacementInformation, ResearchRecord, InternshipInformation, CocurricularActivityRecord,
+                        ExtracurricularActivityRecord, AwardsAndAchievements]
+REPORT_DATA_CHUNK_SIZE = 500
+
+class MenteeReportData:
+    """Everything the full report renders for one mentee, loaded up front."""
+    def __init__(self, user, profile):
+        self.user = user
+        self.profile = profile
+        self.records = {Model: [] for Model in REPORT_RECORD_MODELS}
+        self.marks = []
+        self.meetings = []
+
+def load_mentee_report_data(user_ids):
+    """Returns {user_id: MenteeReportData} for the mentees among user_ids.
+
+    Runs one query per table for each chunk of REPORT_DATA_CHUNK_SIZE mentees, however many mentees are asked for.
+    """
+    user_ids = list(user_ids)
+    report_data = {}
+    for offset in range(0, len(user_ids), REPORT_DATA_CHUNK_SIZE):
+        chunk = user_ids[offset:offset + REPORT_DATA_CHUNK_SIZE]
+
+        rows = db.session.query(User, MenteeProfile).join(MenteeProfile, MenteeProfile.user_id == User.id)\
+            .filter(User.id.in_(chunk), User.role == 'mentee').all()
+        chunk_data = {user.id: MenteeReportData(user, profile) for user, profile in rows}
+        if not chunk_data:
+            continue
+        mentee_ids = list(chunk_data)
+
+        for Model in REPORT_RECORD_MODELS:
+            for record in Model.query.filter(Model.mentee_id.in_(mentee_ids)).order_by(Model.id).all():
+                chunk_data[record.mentee_id].records[Model].append(record)
+
+        marks = AcademicSemesterMarkDetails.query.filter(AcademicSemesterMarkDetails.mentee_id.in_(mentee_ids))\
+            .order_by(AcademicSemesterMarkDetails.id).all()
+        for record in marks:
+            chunk_data[record.mentee_id].marks.append(record)
+
+        meetings = db.session.query(MentorMeetingDetails, Session.start_time)\
+            .join(Session, Session.id == MentorMeetingDetails.session_id)\
+            .filter(MentorMeetingDetails.mentee_id.in_(mentee_ids))\
+            .order_by(Session.start_time, MentorMeetingDetails.id).all()
+        for record, start_time in meetings:
+            chunk_data[record.mentee_id].meetings.append((record, start_time))
+
+        report_data.update(chunk_data)
+    return report_data
+
+def report_filename(report_data):
+    latest_academic_record = max(report_data.marks, key=lambda r: r.id) if report_data.marks else None
+    semester_for_filename = latest_academic_record.semester if latest_academic_record and latest_academic_record.semester else "Full_Report"
+    return f"{report_data.user.name.replace(' ', '_')}_{report_data.profile.reg_num}_{semester_for_filename}.pdf"
+
+def profile_picture_path(mentee_user):
+    profile_pic_path = mentee_user.profile_picture[1:] if mentee_user.profile_picture.startswith('/') else mentee_user.profile_picture
+    return os.path.join(current_app.root_path, profile_pic_path)
+
+def render_mentee_report(report_data):
+    """Lays out the full mentee report from preloaded data. Never queries the database."""
+    mentee_user = report_data.user
+    mentee_profile = report_data.profile
 
     pdf = ReportPDF()
     current_font_family = pdf.current_font_family
 
-    latest_academic_record = AcademicSemesterMarkDetails.query.filter_by(mentee_id=user_id).order_by(AcademicSemesterMarkDetails.id.desc()).first()
-    semester_for_filename = latest_academic_record.semester if latest_academic_record and latest_academic_record.semester else "Full_Report"
-    
-    filename = f"{mentee_user.name.replace(' ', '_')}_{mentee_profile.reg_num}_{semester_for_filename}.pdf"
+    filename = report_filename(report_data)
 
     pdf.add_page('P')
     pdf.add_watermark()
@@ -143,8 +315,7 @@ def generate_mentee_full_report(user_id):
     pdf.cell(0, 7, mentee_profile.department if mentee_profile.department else 'N/A', 'B')
     pdf.ln(8)
     
-    profile_pic_path = mentee_user.profile_picture[1:] if mentee_user.profile_picture.startswith('/') else mentee_user.profile_picture
-    full_profile_pic_path = os.path.join(current_app.root_path, profile_pic_path)
+    full_profile_pic_path = profile_picture_path(mentee_user)
     if os.path.exists(full_profile_pic_path):
         pdf.image(full_profile_pic_path, x=pdf.w - 40, y=30, w=30, h=40)
     
@@ -257,7 +428,7 @@ def generate_mentee_full_report(user_id):
         pdf.add_page('L')
         pdf.add_watermark()
         pdf.chapter_title(title)
-        records = Model.query.filter_by(mentee_id=user_id).all()
+        records = report_data.records.get(Model, [])
         
         x_start = (pdf.w - sum(widths)) / 2
         pdf.set_x(x_start)
@@ -354,10 +525,10 @@ def generate_mentee_full_report(user_id):
                  {'award_achievement_name': None, 'award_achievement_type': None, 'conducted_by': None, 'date': lambda d: timestamp_to_local(d, 'date_only') if d else ''},
                  [15, 80, 60, 80, 25])
                  
-    semesters = db.session.query(AcademicSemesterMarkDetails.semester).filter_by(mentee_id=user_id).distinct().order_by(AcademicSemesterMarkDetails.semester).all()
-    for sem in semesters:
-        semester_name = sem[0]
-        if not semester_name: continue
+    marks_by_semester = {}
+    for record in report_data.marks:
+        marks_by_semester.setdefault(record.semester, []).append(record)
+    for semester_name in sorted(name for name in marks_by_semester if name):
         pdf.add_page('L')
         pdf.add_watermark()
         pdf.chapter_title(f'ACADEMIC SEMESTER MARK DETAILS - {semester_name.upper()}')
@@ -370,7 +541,7 @@ def generate_mentee_full_report(user_id):
         pdf.academic_marks_header(col_widths)
         
         pdf.set_font(current_font_family, '', 7)
-        records = AcademicSemesterMarkDetails.query.filter_by(mentee_id=user_id, semester=semester_name).all()
+        records = marks_by_semester[semester_name]
         for i, r in enumerate(records):
             pdf.set_x(x_start)
             pdf.cell(col_widths['s_no'], 6, str(i+1), 1, 0, 'C')
@@ -411,7 +582,7 @@ def generate_mentee_full_report(user_id):
     pdf.add_page('L')
     pdf.add_watermark()
     pdf.chapter_title('Mentor Meeting Details')
-    meeting_records = MentorMeetingDetails.query.filter_by(mentee_id=user_id).join(Session).order_by(Session.start_time).all()
+    meeting_records = report_data.meetings
     
     headers = ['S. No', 'Date of Meeting', 'Points Discussed', 'Remarks Given', 'Mentee Signature', 'Mentor Signature']
     widths = [10, 30, 80, 80, 30, 30]
@@ -427,10 +598,10 @@ def generate_mentee_full_report(user_id):
     pdf.set_font(current_font_family, '', 8)
     meeting_data = []
     if meeting_records:
-        for i, r in enumerate(meeting_records):
+        for i, (r, session_start_time) in enumerate(meeting_records):
             meeting_data.append([
                 i+1, 
-                timestamp_to_local(r.session.start_time, 'date_only') if r.session else '',
+                timestamp_to_local(session_start_time, 'date_only'),
                 r.points_discussed or '',
                 r.remarks_given or '',
                 '', ''
@@ -469,5 +640,13 @@ def generate_mentee_full_report(user_id):
                 pdf.cell(widths[i], 10, '', 1)
             pdf.ln()
 
-    return_file = io.BytesIO(pdf.output(dest='S').encode('latin-1'))
-    return return_file.getvalue(), filename
\ No newline at end of file
+    # fpdf2 returns a bytearray; the legacy PyFPDF API returned a latin-1 str.
+    output = pdf.output(dest='S')
+    pdf_bytes = output.encode('latin-1') if isinstance(output, str) else bytes(output)
+    return pdf_bytes, filename
+
+def generate_mentee_full_report(user_id):
+    report_data = load_mentee_report_data([user_id]).get(user_id)
+    if report_data is None:
+        return None, None
+    return render_mentee_report(report_data)
@@ -0,0 +1,263 @@
+import datetime
+import multiprocessing
+import os
+import shutil
+import signal
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app
+from .. import db
+from ..models import ReportJob, User, Class, Batch, MenteeProfile, MentorAssignment
+from .bulk_reports import REPORTS_PER_TASK, _init_report_worker, _render_reports, _unique_name, get_mentee_ids
+
+REPORT_JOB_TYPES = ('mentee', 'class', 'batch')
+ACTIVE_JOB_STATUSES = ('Queued', 'Running')
+FINISHED_JOB_STATUSES = ('Completed', 'Failed')
+# How often the worker loop requeues stalled jobs and deletes expired artifacts, in seconds.
+REPORT_JOB_MAINTENANCE_INTERVAL = 60
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def _as_utc(value):
+    """SQLite hands back naive datetimes; everything here is stored in UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+def can_request_report(user, job_type, target_id):
+    """Admins may export anything; mentors their assigned mentees and batches; mentees only their own report."""
+    if job_type not in REPORT_JOB_TYPES:
+        return False
+    if user.role == 'admin':
+        return True
+    if user.role == 'mentee':
+        return job_type == 'mentee' and target_id == user.id
+    if user.role != 'mentor':
+        return False
+
+    if job_type == 'mentee':
+        batch_id = db.session.query(MenteeProfile.batch_id).filter_by(user_id=target_id).scalar()
+    elif job_type == 'batch':
+        batch_id = target_id
+    else:
+        return False
+    return batch_id is not None and db.session.query(MentorAssignment.query.filter_by(
+        mentor_id=user.id, batch_id=batch_id, is_active=True).exists()).scalar()
+
+def report_job_mentee_ids(job_type, target_id):
+    if job_type == 'mentee':
+        exists = db.session.query(User.query.filter_by(id=target_id, role='mentee').exists()).scalar()
+        return [target_id] if exists else []
+    if job_type == 'class':
+        return get_mentee_ids(class_id=target_id)
+    return get_mentee_ids(batch_id=target_id)
+
+def report_job_archive_name(job_type, target_id):
+    if job_type == 'class':
+        target_class = db.session.get(Class, target_id)
+        return f"{target_class.name.replace(' ', '_')}_reports.zip"
+    batch = db.session.get(Batch, target_id)
+    return f"{batch.class_model.name.replace(' ', '_')}_{batch.name.replace(' ', '_')}_reports.zip"
+
+def submit_report_job(user, job_type, target_id):
+    """Queues a report job, or returns the requester's queued or running job for the same target."""
+    job = ReportJob.query.filter(
+        ReportJob.requested_by == user.id, ReportJob.job_type == job_type, ReportJob.target_id == target_id,
+        ReportJob.status.in_(ACTIVE_JOB_STATUSES)
+    ).order_by(ReportJob.id.desc()).first()
+    if job:
+        return job
+    job = ReportJob(job_type=job_type, target_id=target_id, requested_by=user.id, status='Queued')
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def report_job_status(job):
+    progress = 100 if job.status == 'Completed' else (
+        int(job.completed_items * 100 / job.total_items) if job.total_items else 0)
+    return {
+        'id': job.id,
+        'job_type': job.job_type,
+        'target_id': job.target_id,
+        'status': job.status,
+        'progress': progress,
+        'completed_items': job.completed_items,
+        'total_items': job.total_items,
+        'message': job.message,
+        'expires_at': _as_utc(job.expires_at).isoformat() if job.expires_at else None,
+    }
+
+def report_job_artifact_available(job):
+    return (job.status == 'Completed' and job.artifact_path and os.path.exists(job.artifact_path)
+            and (job.expires_at is None or _as_utc(job.expires_at) > _now()))
+
+def claim_next_report_job():
+    """Moves the oldest queued job to Running and returns its id, or None when the queue is empty.
+
+    The conditional UPDATE only succeeds for one claimant, so several worker loops can share the table.
+    """
+    while True:
+        job_id = db.session.query(ReportJob.id).filter_by(status='Queued').order_by(ReportJob.id).limit(1).scalar()
+        if job_id is None:
+            db.session.rollback()
+            return None
+        now = _now()
+        claimed = ReportJob.query.filter_by(id=job_id, status='Queued').update(
+            {'status': 'Running', 'started_at': now, 'updated_at': now, 'completed_items': 0},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return job_id
+
+def cancel_report_job(job_id):
+    """Cancels a job no worker has claimed yet; returns False when it is already running or finished."""
+    cancelled = ReportJob.query.filter_by(id=job_id, status='Queued').update(
+        {'status': 'Cancelled', 'finished_at': _now()}, synchronize_session=False
+    )
+    db.session.commit()
+    return bool(cancelled)
+
+def _update_job(job_id, **values):
+    values['updated_at'] = _now()
+    ReportJob.query.filter_by(id=job_id).update(values, synchronize_session=False)
+    db.session.commit()
+
+def finish_report_job(job_id, status, message=None, artifact_path=None, artifact_name=None):
+    now = _now()
+    _update_job(job_id, status=status, message=message, artifact_path=artifact_path, artifact_name=artifact_name,
+                finished_at=now, expires_at=now + datetime.timedelta(seconds=current_app.config['REPORT_JOB_TTL']))
+
+def run_report_job(job_id):
+    """Runs in a worker process: renders the job's reports into its artifact, recording progress per group."""
+    try:
+        job = db.session.get(ReportJob, job_id)
+        job_type, target_id = job.job_type, job.target_id
+        mentee_ids = report_job_mentee_ids(job_type, target_id)
+        if not mentee_ids:
+            finish_report_job(job_id, 'Failed', "There are no active mentees to generate reports for.")
+            return
+        _update_job(job_id, total_items=len(mentee_ids))
+
+        job_dir = os.path.join(current_app.config['REPORT_JOB_FOLDER'], str(job_id))
+        os.makedirs(job_dir, exist_ok=True)
+
+        if job_type == 'mentee':
+            _, pdf_bytes, filename = _render_reports(mentee_ids)[0]
+            if pdf_bytes is None:
+                finish_report_job(job_id, 'Failed', "Could not generate report for this mentee.")
+                return
+            artifact_name = filename
+            artifact_path = os.path.join(job_dir, 'report.pdf')
+            with open(artifact_path + '.part', 'wb') as artifact_file:
+                artifact_file.write(pdf_bytes)
+            _update_job(job_id, completed_items=1)
+        else:
+            artifact_name = report_job_archive_name(job_type, target_id)
+            artifact_path = os.path.join(job_dir, 'reports.zip')
+            used_names, failed_ids, completed = set(), [], 0
+            with zipfile.ZipFile(artifact_path + '.part', 'w', zipfile.ZIP_STORED) as archive:
+                for offset in range(0, len(mentee_ids), REPORTS_PER_TASK):
+                    for user_id, pdf_bytes, filename in _render_reports(mentee_ids[offset:offset + REPORTS_PER_TASK]):
+                        if pdf_bytes is None:
+                            failed_ids.append(str(user_id))
+                        else:
+                            archive.writestr(_unique_name(filename, used_names), pdf_bytes)
+                        completed += 1
+                    _update_job(job_id, completed_items=completed)
+                if failed_ids:
+                    archive.writestr('failed_reports.txt', "Reports could not be generated for mentee ids:\n" + "\n".join(failed_ids) + "\n")
+
+        os.replace(artifact_path + '.part', artifact_path)
+        finish_report_job(job_id, 'Completed', artifact_path=artifact_path, artifact_name=artifact_name)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Report job %s failed: %s", job_id, e)
+        finish_report_job(job_id, 'Failed', "Report generation failed. Please try again.")
+    finally:
+        db.session.remove()
+
+def requeue_stale_report_jobs():
+    """Puts Running jobs whose worker stopped reporting progress back in the queue."""
+    cutoff = _now() - datetime.timedelta(seconds=current_app.config['REPORT_JOB_STALE_AFTER'])
+    requeued = ReportJob.query.filter(ReportJob.status == 'Running', ReportJob.updated_at < cutoff).update(
+        {'status': 'Queued', 'completed_items': 0}, synchronize_session=False
+    )
+    db.session.commit()
+    return requeued
+
+def expire_report_jobs():
+    """Deletes the artifacts of finished jobs past their expiry and marks the jobs Expired.
+
+    Jobs still Queued after REPORT_JOB_TTL were abandoned by a page that gave up waiting for a worker;
+    they are expired as well, so a worker started later does not render reports nobody will download.
+    """
+    now = _now()
+    jobs = ReportJob.query.filter(ReportJob.status.in_(FINISHED_JOB_STATUSES), ReportJob.expires_at < now).all()
+    for job in jobs:
+        shutil.rmtree(os.path.join(current_app.config['REPORT_JOB_FOLDER'], str(job.id)), ignore_errors=True)
+        job.status = 'Expired'
+        job.artifact_path = None
+    abandoned = ReportJob.query.filter(
+        ReportJob.status == 'Queued',
+        ReportJob.created_at < now - datetime.timedelta(seconds=current_app.config['REPORT_JOB_TTL'])
+    ).update({'status': 'Expired', 'finished_at': now}, synchronize_session=False)
+    db.session.commit()
+    return len(jobs) + abandoned
+
+def _init_job_worker():
+    # Ctrl+C reaches the whole process group; let running jobs finish while the loop shuts down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_report_worker()
+
+def _start_job_pool(worker_count):
+    return ProcessPoolExecutor(max_workers=worker_count, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_job_worker)
+
+def run_report_workers(worker_count, poll_interval, echo=print):
+    """Claims queued jobs and runs them on worker_count processes until interrupted."""
+    pool = _start_job_pool(worker_count)
+    in_flight = {}
+    last_maintenance = None
+    echo(f"Running report jobs on {worker_count} worker processes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            if last_maintenance is None or time.monotonic() - last_maintenance >= REPORT_JOB_MAINTENANCE_INTERVAL:
+                requeued, expired = requeue_stale_report_jobs(), expire_report_jobs()
+                if requeued or expired:
+                    echo(f"Requeued {requeued} stalled jobs, expired {expired} jobs.")
+                last_maintenance = time.monotonic()
+
+            pool_broken = False
+            for future in [future for future in in_flight if future.done()]:
+                job_id = in_flight.pop(future)
+                if future.exception() is not None:
+                    # Jobs catch their own errors, so this means a worker process died and took the pool with it.
+                    finish_report_job(job_id, 'Failed', "The report worker stopped unexpectedly.")
+                    echo(f"Report job {job_id} failed: {future.exception()!r}")
+                    pool_broken = True
+                else:
+                    echo(f"Report job {job_id} finished.")
+            if pool_broken:
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _start_job_pool(worker_count)
+
+            while len(in_flight) < worker_count:
+                job_id = claim_next_report_job()
+                if job_id is None:
+                    break
+                in_flight[pool.submit(run_report_job, job_id)] = job_id
+                echo(f"Report job {job_id} started.")
+
+            db.session.remove()
+            if in_flight:
+                wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        echo(f"Stopping; waiting for {len(in_flight)} running jobs to finish.")
+    finally:
+        pool.shutdown(wait=True)
+        db.session.remove()
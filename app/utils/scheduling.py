@@ -0,0 +1,162 @@
+import bisect
+import datetime
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import insert, update
+from .. import db
+from ..models import Session, MentorAssignment, Batch, Class, Holiday
+from . import timestamp_to_local, get_local_timezone
+
+# A collision message names this many conflicts and summarises the rest.
+COLLISION_MESSAGE_LIMIT = 3
+# Recurrences stop looking for free dates after this many weeks, however many dates are excluded.
+MAX_SCHEDULE_WEEKS = 520
+MAX_INTERVAL_WEEKS = 4
+
+ScheduleCollision = namedtuple('ScheduleCollision', 'proposed_start existing_start session_id class_name batch_name')
+
+def get_session_duration():
+    return datetime.timedelta(minutes=current_app.config['SESSION_DURATION_MINUTES'])
+
+def _as_utc(value):
+    """SQLite hands back naive datetimes; session times are stored in UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+def load_mentor_sessions(mentor_id, window_start, window_end, duration, exclude_assignment_id=None):
+    """Returns the mentor's sessions that can overlap [window_start, window_end), sorted by start time, in one query."""
+    query = db.select(Session.id, Session.start_time, Class.name, Batch.name)\
+        .join(MentorAssignment, MentorAssignment.id == Session.mentor_assignment_id)\
+        .join(Batch, Batch.id == MentorAssignment.batch_id)\
+        .join(Class, Class.id == Batch.class_id)\
+        .where(MentorAssignment.mentor_id == mentor_id,
+               Session.start_time > window_start - duration,
+               Session.start_time < window_end)\
+        .order_by(Session.start_time, Session.id)
+    if exclude_assignment_id is not None:
+        query = query.where(MentorAssignment.id != exclude_assignment_id)
+    return db.session.execute(query).all()
+
+def find_schedule_collisions(mentor_id, proposed_starts, exclude_assignment_id=None, duration=None):
+    """Returns a ScheduleCollision for every pair of a proposed session and an existing session of the mentor that overlap.
+
+    Sessions are the intervals [start, start + duration). The existing sessions in the proposed series' time span
+    are loaded once, already sorted, and each proposed start bisects into them, so m proposed sessions against
+    n existing ones cost O((n + m) log n) plus one row per reported collision. exclude_assignment_id leaves out
+    the sessions of an assignment that is being rescheduled.
+    """
+    if not proposed_starts:
+        return []
+    duration = duration or get_session_duration()
+    proposed_starts = sorted(_as_utc(start) for start in proposed_starts)
+    existing = load_mentor_sessions(mentor_id, proposed_starts[0], proposed_starts[-1] + duration, duration,
+                                    exclude_assignment_id)
+    existing_starts = [_as_utc(start_time) for _, start_time, _, _ in existing]
+
+    collisions = []
+    for proposed_start in proposed_starts:
+        # Equal-length intervals overlap exactly when their starts are less than one duration apart.
+        first = bisect.bisect_right(existing_starts, proposed_start - duration)
+        last = bisect.bisect_left(existing_starts, proposed_start + duration)
+        for (session_id, _, class_name, batch_name), existing_start in zip(existing[first:last], existing_starts[first:last]):
+            collisions.append(ScheduleCollision(proposed_start, existing_start, session_id, class_name, batch_name))
+    return collisions
+
+def collision_message(collisions):
+    if not collisions:
+        return None
+    # Several proposed sessions can overlap the same existing one; name each existing session once.
+    conflicting = list({collision.session_id: collision for collision in collisions}.values())
+    described = [f"{collision.class_name} - {collision.batch_name} on {timestamp_to_local(collision.existing_start, 'full')}"
+                 for collision in conflicting[:COLLISION_MESSAGE_LIMIT]]
+    message = f"Schedule conflict detected! Mentor is already assigned to {'; '.join(described)}"
+    if len(conflicting) > COLLISION_MESSAGE_LIMIT:
+        message += f" and {len(conflicting) - COLLISION_MESSAGE_LIMIT} more overlapping sessions"
+    return message + "."
+
+def collision_to_dict(collision):
+    return {
+        'proposed_start': collision.proposed_start.isoformat(),
+        'existing_start': collision.existing_start.isoformat(),
+        'session_id': collision.session_id,
+        'class_name': collision.class_name,
+        'batch_name': collision.batch_name,
+    }
+
+def is_third_saturday(d):
+    return d.weekday() == 5 and 15 <= d.day <= 21
+
+def load_holiday_dates(start_date):
+    """The institution holidays on or after start_date, as a set for constant-time exclusion checks."""
+    return {holiday_date for holiday_date, in db.session.query(Holiday.date).filter(Holiday.date >= start_date)}
+
+def generate_session_dates(start_date, weekdays, count, interval_weeks=1, excluded_dates=frozenset()):
+    """Dates of an RRULE-style FREQ=WEEKLY;INTERVAL=interval_weeks;BYDAY=weekdays;COUNT=count series.
+
+    The series starts at the first selected weekday on or after start_date and steps interval_weeks at a time
+    from that week. Excluded dates and third Saturdays are skipped without using up the count, as before.
+    """
+    weekdays = sorted(set(weekdays))
+    first_date = min(start_date + datetime.timedelta(days=(weekday - start_date.weekday()) % 7) for weekday in weekdays)
+    first_week = first_date - datetime.timedelta(days=first_date.weekday())
+    dates = []
+    for week in range(0, MAX_SCHEDULE_WEEKS, interval_weeks):
+        for weekday in weekdays:
+            session_date = first_week + datetime.timedelta(weeks=week, days=weekday)
+            if session_date < start_date or session_date in excluded_dates or is_third_saturday(session_date):
+                continue
+            dates.append(session_date)
+            if len(dates) == count:
+                return dates
+    return dates
+
+def parse_schedule(values, weekdays):
+    """Reads a schedule from form or JSON values; weekdays is the list of selected day_of_week values.
+
+    Raises ValueError, with a message fit for the admin, for malformed or out-of-range input.
+    """
+    try:
+        schedule = {
+            'start_date': datetime.datetime.strptime(values['start_date'], '%Y-%m-%d').date(),
+            'weekdays': sorted({int(weekday) for weekday in weekdays if weekday not in (None, '')}),
+            'session_time': datetime.datetime.strptime(values['time'], '%H:%M').time(),
+            'num_weeks': int(values['num_weeks']),
+            'interval_weeks': int(values.get('interval_weeks') or 1),
+        }
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid schedule data.") from None
+    if not schedule['weekdays'] or not all(0 <= weekday <= 6 for weekday in schedule['weekdays']):
+        raise ValueError("Select at least one valid day of the week.")
+    if not 1 <= schedule['interval_weeks'] <= MAX_INTERVAL_WEEKS:
+        raise ValueError(f"Sessions can repeat every 1 to {MAX_INTERVAL_WEEKS} weeks.")
+    if schedule['num_weeks'] < 1:
+        raise ValueError("The number of weeks must be at least 1.")
+    return schedule
+
+def build_schedule(start_date, weekdays, session_time, num_weeks, interval_weeks=1):
+    """UTC start times for num_weeks meeting weeks, one session on each selected weekday, skipping holidays."""
+    dates = generate_session_dates(start_date, weekdays, num_weeks * len(weekdays), interval_weeks,
+                                   load_holiday_dates(start_date))
+    local_timezone = get_local_timezone()
+    return [local_timezone.localize(datetime.datetime.combine(session_date, session_time)).astimezone(datetime.timezone.utc)
+            for session_date in dates]
+
+def insert_sessions(assignment_id, start_times):
+    """Creates an assignment's sessions, numbered from 1, with one executemany insert. Returns how many."""
+    if not start_times:
+        return 0
+    db.session.execute(insert(Session.__table__), [
+        {'mentor_assignment_id': assignment_id, 'session_number': number, 'start_time': start_time, 'status': 'Upcoming'}
+        for number, start_time in enumerate(start_times, 1)
+    ])
+    return len(start_times)
+
+def sweep_missed_sessions(now=None):
+    """Marks every Upcoming session that ended before now as Missed with one set-based UPDATE; returns their ids."""
+    cutoff = (now or datetime.datetime.now(datetime.timezone.utc)) - get_session_duration()
+    statement = update(Session).where(Session.status == 'Upcoming', Session.start_time < cutoff)\
+        .values(status='Missed').returning(Session.id)
+    session_ids = db.session.execute(statement, execution_options={'synchronize_session': False}).scalars().all()
+    db.session.commit()
+    return session_ids
@@ -0,0 +1,199 @@
+from collections import defaultdict
+from datetime import datetime, date, timedelta, timezone
+from flask import current_app
+from sqlalchemy import func, insert, update, delete, or_
+from .. import db
+from ..models import User, MenteeProfile, LeaveRequest, AttendanceRecord, Session, SessionChange, SyncOperation
+from .__init__ import timestamp_to_local
+from .scheduling import get_session_duration
+
+def model_to_dict(model_instance):
+    d = {}
+    for column in model_instance.__table__.columns:
+        val = getattr(model_instance, column.name)
+        if isinstance(val, (datetime, date)):
+            d[column.name] = val.isoformat()
+        else:
+            d[column.name] = val
+    return d
+
+def load_batch_mentees(batch_id):
+    """Returns (user_id, name) pairs for a batch, ordered by name, in one query."""
+    return db.session.query(User.id, User.name)\
+        .join(MenteeProfile, MenteeProfile.user_id == User.id)\
+        .filter(MenteeProfile.batch_id == batch_id)\
+        .order_by(User.name).all()
+
+def load_session_records(session_id, models_to_check, mentee_ids=None):
+    """Loads every record type for a session with one query per model, grouped by mentee_id."""
+    records_by_mentee = defaultdict(dict)
+    for name, model in models_to_check.items():
+        query = model.query.filter(model.session_id == session_id)
+        if mentee_ids is not None:
+            if not mentee_ids:
+                continue
+            query = query.filter(model.mentee_id.in_(mentee_ids))
+        for record in query.order_by(model.id).all():
+            records_by_mentee[record.mentee_id].setdefault(name, []).append(model_to_dict(record))
+    return records_by_mentee
+
+def load_attendance_status(session_id, mentee_ids=None):
+    """Returns {mentee_id: status_info} for mentees with an approved leave or marked absent."""
+    leave_query = LeaveRequest.query.filter(LeaveRequest.session_id == session_id, LeaveRequest.status == 'Approved')
+    absent_query = db.session.query(AttendanceRecord.mentee_id).filter(
+        AttendanceRecord.session_id == session_id, AttendanceRecord.status == 'Absent'
+    )
+    if mentee_ids is not None:
+        leave_query = leave_query.filter(LeaveRequest.mentee_id.in_(mentee_ids))
+        absent_query = absent_query.filter(AttendanceRecord.mentee_id.in_(mentee_ids))
+
+    status_map = {}
+    for mentee_id, in absent_query.all():
+        status_map[mentee_id] = { "status": "Marked Absent", "details": "Marked as absent by mentor."}
+    for approved_leave in leave_query.all():
+        status_map[approved_leave.mentee_id] = { "status": "Leave Approved", "details": f"Requested on {timestamp_to_local(approved_leave.requested_at, 'date_only')}, Approved on {timestamp_to_local(approved_leave.actioned_at, 'date_only')}"}
+    return status_map
+
+def present_status():
+    return { "status": "Present", "details": ""}
+
+def build_session_details(session, models_to_check, mentees=None):
+    """Builds the {mentee_id: {name, records, attendance}} structure used by the session details pages.
+
+    The number of queries is fixed by the number of record models, not by the batch size.
+    """
+    if mentees is None:
+        mentees = load_batch_mentees(session.assignment.batch_id)
+    mentee_ids = [mentee_id for mentee_id, _ in mentees]
+
+    records_by_mentee = load_session_records(session.id, models_to_check, mentee_ids)
+    status_map = load_attendance_status(session.id, mentee_ids)
+
+    all_data = {}
+    for mentee_id, name in mentees:
+        all_data[mentee_id] = {
+            'name': name,
+            'records': records_by_mentee.get(mentee_id, {}),
+            'attendance': status_map.get(mentee_id, present_status())
+        }
+    return all_data
+
+def _next_session_version(session_id):
+    """Increments the session's change counter and returns the new value.
+
+    The UPDATE locks the session row until the caller commits, so versions of one session commit in the order
+    they were handed out: once a client has seen version N, every change up to N is visible as well. A global
+    sequence such as the change id gives no such guarantee, because a lower id can commit after a higher one.
+    """
+    statement = update(Session).where(Session.id == session_id)\
+        .values(change_version=Session.change_version + 1).returning(Session.change_version)
+    return db.session.execute(statement, execution_options={'synchronize_session': False}).scalar_one()
+
+def record_session_change(session_id, mentee_id):
+    """Bumps the session version for a mentee. Committed together with the caller's write."""
+    db.session.add(SessionChange(session_id=session_id, mentee_id=mentee_id, version=_next_session_version(session_id)))
+
+def record_session_changes(session_id, mentee_ids):
+    if mentee_ids:
+        version = _next_session_version(session_id)
+        db.session.execute(insert(SessionChange), [{'session_id': session_id, 'mentee_id': mentee_id, 'version': version}
+                                                   for mentee_id in mentee_ids])
+
+def get_session_version(session_id):
+    return db.session.query(Session.change_version).filter(Session.id == session_id).scalar() or 0
+
+def get_changed_mentee_ids(session_id, since_version):
+    """Returns the ids of mentees changed after since_version, or None if some of those changes were pruned.
+
+    Every version of a session has at least one change, so the log is complete exactly when it still holds
+    since_version + 1.
+    """
+    rows = db.session.query(SessionChange.mentee_id, func.min(SessionChange.version)).filter(
+        SessionChange.session_id == session_id, SessionChange.version > since_version
+    ).group_by(SessionChange.mentee_id).all()
+    if not rows or min(version for _, version in rows) != since_version + 1:
+        return None
+    return [mentee_id for mentee_id, _ in rows]
+
+def prune_sync_history(now=None):
+    """Deletes sync operations older than SYNC_OPERATION_RETENTION and the change log of sessions that ended more
+    than SESSION_CHANGE_RETENTION ago; returns (operations, changes) deleted.
+
+    The session version lives on the session row, so it does not move when its changes are deleted.
+    """
+    config = current_app.config
+    now = now or datetime.now(timezone.utc)
+    operations = db.session.execute(
+        delete(SyncOperation).where(SyncOperation.created_at < now - timedelta(seconds=config['SYNC_OPERATION_RETENTION'])),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+
+    ended_before = now - timedelta(seconds=config['SESSION_CHANGE_RETENTION'])
+    ended_sessions = db.select(Session.id).where(or_(
+        Session.actual_end_time < ended_before,
+        Session.start_time < ended_before - get_session_duration()
+    ))
+    changes = db.session.execute(
+        delete(SessionChange).where(SessionChange.session_id.in_(ended_sessions)),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+    return operations, changes
+
+def load_live_attendance(session_id, mentee_ids):
+    """Returns {mentee_id: {is_absent, has_leave, leave_status}} in the shape the live session screen uses."""
+    attendance = {mentee_id: {'is_absent': False, 'has_leave': False, 'leave_status': None} for mentee_id in mentee_ids}
+    if not mentee_ids:
+        return attendance
+
+    leave_requests = LeaveRequest.query.filter(
+        LeaveRequest.session_id == session_id, LeaveRequest.mentee_id.in_(mentee_ids)
+    ).order_by(LeaveRequest.id).all()
+    for leave_request in leave_requests:
+        entry = attendance[leave_request.mentee_id]
+        entry['leave_status'] = leave_request.status
+        if leave_request.status == 'Approved':
+            entry['has_leave'] = True
+            entry['is_absent'] = True
+
+    absent_rows = db.session.query(AttendanceRecord.mentee_id).filter(
+        AttendanceRecord.session_id == session_id,
+        AttendanceRecord.mentee_id.in_(mentee_ids),
+        AttendanceRecord.status == 'Absent'
+    ).all()
+    for mentee_id, in absent_rows:
+        attendance[mentee_id]['is_absent'] = True
+    return attendance
+
+def build_live_snapshot(session, models_to_check, since_version=None):
+    """Builds the live session payload for every mentee in the batch, or only those changed after since_version."""
+    version = get_session_version(session.id)
+    batch_mentee_ids = [mentee_id for mentee_id, _ in load_batch_mentees(session.assignment.batch_id)]
+
+    if since_version is not None and since_version > version:
+        # Not a version of this session (a cursor from before versions were per session); start over.
+        since_version = None
+    if since_version is None:
+        mentee_ids = batch_mentee_ids
+    elif since_version == version:
+        mentee_ids = []
+    else:
+        changed_ids = get_changed_mentee_ids(session.id, since_version)
+        if changed_ids is None:
+            # Part of the log was pruned, so only a full snapshot brings the client up to date.
+            since_version = None
+            mentee_ids = batch_mentee_ids
+        else:
+            changed_ids = set(changed_ids)
+            mentee_ids = [mentee_id for mentee_id in batch_mentee_ids if mentee_id in changed_ids]
+
+    records_by_mentee = load_session_records(session.id, models_to_check, mentee_ids)
+    attendance = load_live_attendance(session.id, mentee_ids)
+
+    mentees = {}
+    for mentee_id in mentee_ids:
+        mentees[mentee_id] = {
+            'attendance': attendance[mentee_id],
+            'records': records_by_mentee.get(mentee_id, {})
+        }
+    return {'version': version, 'full': since_version is None, 'mentees': mentees}
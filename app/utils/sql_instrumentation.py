@@ -0,0 +1,85 @@
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from .. import db
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_fingerprint(statement):
+    """Normalizes a SQL statement so queries that differ only by literals or IN-list length compare equal."""
+    fingerprint = _STRING_LITERAL.sub('?', statement)
+    fingerprint = _NUMBER_LITERAL.sub('?', fingerprint)
+    fingerprint = _PLACEHOLDER_LIST.sub('(?)', fingerprint)
+    return _WHITESPACE.sub(' ', fingerprint).strip()
+
+def get_request_sql_stats():
+    """Returns the current request's {'count', 'duration', 'fingerprints'} stats, or None outside a request."""
+    if not has_request_context():
+        return None
+    if 'sql_stats' not in g:
+        g.sql_stats = {'count': 0, 'duration': 0.0, 'fingerprints': Counter()}
+    return g.sql_stats
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    stats = get_request_sql_stats()
+    if stats is None:
+        return
+    stats['count'] += 1
+    stats['duration'] += elapsed
+    stats['fingerprints'][statement_fingerprint(statement)] += 1
+
+def init_sql_instrumentation(app):
+    """Records query count, DB time and repeated statements per request when SQL_INSTRUMENTATION is on.
+
+    Results go to a Server-Timing header and a debug log line; a statement shape that runs more than
+    SQL_REPEAT_WARN_THRESHOLD times in one request is logged as a likely N+1.
+    """
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started_at = time.perf_counter()
+        get_request_sql_stats()
+
+    @app.after_request
+    def report_sql_stats(response):
+        stats = get_request_sql_stats()
+        total_ms = (time.perf_counter() - g.get('request_started_at', time.perf_counter())) * 1000
+        db_ms = stats['duration'] * 1000
+
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.1f};desc="{stats["count"]} queries", app;dur={total_ms:.1f}'
+        )
+        app.logger.debug(
+            "%s %s %s: %d queries, %.1f ms in DB, %.1f ms total",
+            request.method, request.path, response.status_code, stats['count'], db_ms, total_ms
+        )
+
+        threshold = app.config.get('SQL_REPEAT_WARN_THRESHOLD', 10)
+        for fingerprint, repeats in stats['fingerprints'].most_common():
+            if repeats <= threshold:
+                break
+            app.logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                request.method, request.path, repeats, fingerprint[:300]
+            )
+        return response
@@ -0,0 +1,234 @@
+import random
+import time
+from datetime import datetime, date, timedelta, timezone
+from itertools import islice
+from sqlalchemy import insert, func, text
+from werkzeug.security import generate_password_hash
+from .. import db
+from ..models import (User, MentorProfile, MenteeProfile, Class, Batch, MentorAssignment, Session, AttendanceRecord,
+                      LeaveRequest, Notification, PlacementInformation, ResearchRecord, AcademicSemesterMarkDetails,
+                      MentorMeetingDetails, AwardsAndAchievements, CocurricularActivityRecord,
+                      ExtracurricularActivityRecord, InternshipInformation)
+
+SYNTHETIC_CLASS_PREFIX = 'SYN'
+
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Ananya', 'Vihaan', 'Saanvi', 'Arjun', 'Meera', 'Kabir', 'Riya',
+               'Rohan', 'Kavya', 'Aditya', 'Nisha', 'Siddharth', 'Pooja', 'Karthik', 'Sneha', 'Rahul', 'Priya']
+LAST_NAMES = ['Sharma', 'Iyer', 'Reddy', 'Nair', 'Menon', 'Gupta', 'Rao', 'Pillai', 'Das', 'Joseph',
+              'Kumar', 'Singh', 'Patel', 'Thomas', 'Shetty', 'Bose', 'Verma', 'Mathew', 'Kulkarni', 'Hegde']
+DEPARTMENTS = ['Computer Science', 'Electronics', 'Mechanical', 'Civil', 'Mathematics', 'Commerce']
+COMPANIES = ['Infosys', 'Wipro', 'TCS', 'Accenture', 'Deloitte', 'Bosch', 'Siemens', 'Oracle']
+GRADES = ['O', 'A+', 'A', 'B+', 'B', 'C', 'P']
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+def bulk_insert(model, rows, chunk_size):
+    """Inserts an iterable of row dicts with one executemany per chunk. Returns the number of rows."""
+    total = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return total
+        db.session.execute(insert(model.__table__), chunk)
+        total += len(chunk)
+
+def reset_id_sequences(models):
+    """Moves PostgreSQL id sequences past explicitly inserted ids."""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for model in models:
+        table_name = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), COALESCE((SELECT MAX(id) FROM {table_name}), 1))"
+        ))
+
+def split_evenly(total, parts):
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+def random_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def synthetic_data_exists():
+    return db.session.query(Class.id).filter(Class.name.like(f"{SYNTHETIC_CLASS_PREFIX} %")).first() is not None
+
+def single_record_row(rng, model, session_date):
+    if model is PlacementInformation:
+        return {'company_name': rng.choice(COMPANIES), 'company_location': 'Bengaluru', 'interview_date': session_date,
+                'rounds_attended': rng.randint(1, 5), 'internship_provided': rng.random() < 0.3,
+                'annual_ctc': round(rng.uniform(3, 18), 1), 'interview_status': rng.choice(['Selected', 'Rejected', 'Pending'])}
+    if model is ResearchRecord:
+        return {'title': f"Study {rng.randint(1, 9999)}", 'publication_name': 'Journal of Applied Research',
+                'publication_date': session_date, 'publication_type': rng.choice(['Journal', 'Conference']),
+                'publication_status': rng.choice(['Published', 'Under Review'])}
+    if model is MentorMeetingDetails:
+        return {'points_discussed': 'Academic progress and attendance.', 'remarks_given': rng.choice(['Good', 'Needs improvement'])}
+    if model is AwardsAndAchievements:
+        return {'award_achievement_name': f"Award {rng.randint(1, 500)}", 'award_achievement_type': rng.choice(['Academic', 'Sports']),
+                'conducted_by': 'University', 'date': session_date}
+    if model in (CocurricularActivityRecord, ExtracurricularActivityRecord):
+        return {'activity_name': f"Activity {rng.randint(1, 500)}", 'activity_type': rng.choice(['Workshop', 'Club', 'Sports']),
+                'conducted_by': 'Student Council', 'date': session_date}
+    return {'company_name': rng.choice(COMPANIES), 'duration_from': session_date, 'duration_to': session_date + timedelta(weeks=8),
+            'sem': str(rng.randint(1, 8)), 'technology_domain': rng.choice(DEPARTMENTS), 'company_location': 'Bengaluru',
+            'internship_status': rng.choice(['Completed', 'Ongoing'])}
+
+SINGLE_RECORD_MODELS = [PlacementInformation, ResearchRecord, MentorMeetingDetails, AwardsAndAchievements,
+                        CocurricularActivityRecord, ExtracurricularActivityRecord, InternshipInformation]
+
+def generate_synthetic_data(seed=42, classes=200, mentees=50000, mentors=800, weeks=104, batch_size=25,
+                            absence_rate=0.08, leave_rate=0.02, record_rate=0.05, notifications_per_user=2,
+                            semesters=2, subjects_per_semester=4, anchor_date=None, password='password',
+                            chunk_size=5000, echo=print):
+    """Bulk-loads a deterministic dataset. The same seed and anchor_date produce the same rows (bar the password salt).
+
+    Half of the weekly sessions fall before anchor_date (completed or missed, with attendance, leave and
+    record rows) and half after it (upcoming). Returns {table_name: row_count}.
+    """
+    rng = random.Random(seed)
+    anchor_date = anchor_date or date.today()
+    password_hash = generate_password_hash(password)
+    counts = {}
+
+    def load(model, rows):
+        started = time.perf_counter()
+        inserted = bulk_insert(model, rows, chunk_size)
+        elapsed = time.perf_counter() - started
+        counts[model.__tablename__] = counts.get(model.__tablename__, 0) + inserted
+        echo(f"  {model.__tablename__}: {inserted} rows in {elapsed:.1f}s")
+
+    next_user_id = next_id(User)
+    mentor_ids = list(range(next_user_id, next_user_id + mentors))
+    mentee_ids = list(range(next_user_id + mentors, next_user_id + mentors + mentees))
+    load(User, (
+        {'id': user_id, 'email': f"mentor{n}@synthetic.local", 'password_hash': password_hash, 'role': 'mentor',
+         'name': random_name(rng), 'is_active': True, 'must_change_password': False}
+        for n, user_id in enumerate(mentor_ids, 1)
+    ))
+    load(MentorProfile, (
+        {'user_id': user_id, 'department': rng.choice(DEPARTMENTS), 'level': 'Assistant Professor',
+         'cabin_block': 'Block I', 'cabin_floor': str(rng.randint(1, 5)), 'cabin_number': str(rng.randint(100, 599)),
+         'profile_complete': True}
+        for user_id in mentor_ids
+    ))
+
+    first_class_id = next_id(Class)
+    class_ids = list(range(first_class_id, first_class_id + classes))
+    load(Class, ({'id': class_id, 'name': f"{SYNTHETIC_CLASS_PREFIX} {n:04d}", 'is_archived': False}
+                 for n, class_id in enumerate(class_ids, 1)))
+
+    batch_rows, mentee_batches, batch_mentees = [], [], {}
+    next_batch_id = next_id(Batch)
+    mentee_iter = iter(mentee_ids)
+    for class_id, class_size in zip(class_ids, split_evenly(mentees, classes)):
+        batch_count = max(1, -(-class_size // batch_size))
+        for n, batch_members in enumerate(split_evenly(class_size, batch_count), 1):
+            batch_id = next_batch_id
+            next_batch_id += 1
+            batch_rows.append({'id': batch_id, 'name': f"Batch {n}", 'class_id': class_id, 'is_active': True})
+            batch_mentees[batch_id] = list(islice(mentee_iter, batch_members))
+            mentee_batches.extend((mentee_id, class_id, batch_id) for mentee_id in batch_mentees[batch_id])
+    load(Batch, batch_rows)
+
+    load(User, (
+        {'id': mentee_id, 'email': None, 'password_hash': password_hash, 'role': 'mentee', 'name': random_name(rng),
+         'is_active': True, 'must_change_password': False}
+        for mentee_id in mentee_ids
+    ))
+    load(MenteeProfile, (
+        {'user_id': mentee_id, 'reg_num': f"{SYNTHETIC_CLASS_PREFIX}{mentee_id:08d}", 'year_of_joining': anchor_date.year - rng.randint(0, 3),
+         'programme': 'B.Tech', 'department': rng.choice(DEPARTMENTS), 'semester': str(rng.randint(1, 8)),
+         'gpa': round(rng.uniform(5, 10), 2), 'class_id': class_id, 'batch_id': batch_id, 'is_active': True,
+         'profile_complete': True}
+        for mentee_id, class_id, batch_id in mentee_batches
+    ))
+
+    first_assignment_id = next_id(MentorAssignment)
+    assignments = [(first_assignment_id + n, mentor_ids[n % mentors], batch['id']) for n, batch in enumerate(batch_rows)]
+    load(MentorAssignment, ({'id': assignment_id, 'mentor_id': mentor_id, 'batch_id': batch_id, 'is_temporary': False, 'is_active': True}
+                            for assignment_id, mentor_id, batch_id in assignments))
+
+    past_weeks = weeks // 2
+    first_week = anchor_date - timedelta(days=anchor_date.weekday(), weeks=past_weeks)
+    completed_sessions = []
+
+    def session_rows():
+        session_id = next_id(Session)
+        for assignment_id, _, batch_id in assignments:
+            weekday, hour = rng.randint(0, 5), rng.choice([4, 5, 6, 8, 9])
+            for week in range(weeks):
+                start_time = datetime.combine(first_week + timedelta(days=weekday, weeks=week), datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=hour)
+                row = {'id': session_id, 'mentor_assignment_id': assignment_id, 'session_number': week + 1,
+                       'start_time': start_time, 'status': 'Upcoming', 'actual_start_time': None, 'actual_end_time': None}
+                if week < past_weeks:
+                    if rng.random() < 0.9:
+                        row.update(status='Completed', actual_start_time=start_time + timedelta(minutes=rng.randint(0, 10)),
+                                   actual_end_time=start_time + timedelta(minutes=rng.randint(40, 60)))
+                        completed_sessions.append((session_id, batch_id, start_time))
+                    else:
+                        row['status'] = 'Missed'
+                yield row
+                session_id += 1
+    load(Session, session_rows())
+
+    attendance_rows, leave_rows = [], []
+    for session_id, batch_id, start_time in completed_sessions:
+        for mentee_id in batch_mentees[batch_id]:
+            draw = rng.random()
+            if draw < leave_rate:
+                leave_rows.append({'session_id': session_id, 'mentee_id': mentee_id, 'reason': 'Medical appointment',
+                                   'status': rng.choice(['Approved', 'Approved', 'Declined', 'Pending']),
+                                   'requested_at': start_time - timedelta(days=1), 'actioned_at': start_time - timedelta(hours=12)})
+            elif draw < leave_rate + absence_rate:
+                attendance_rows.append({'session_id': session_id, 'mentee_id': mentee_id, 'status': 'Absent'})
+    load(AttendanceRecord, attendance_rows)
+    load(LeaveRequest, leave_rows)
+    del attendance_rows, leave_rows
+
+    record_rows = {model: [] for model in SINGLE_RECORD_MODELS}
+    for session_id, batch_id, start_time in completed_sessions:
+        for mentee_id in batch_mentees[batch_id]:
+            if rng.random() < record_rate:
+                model = rng.choice(SINGLE_RECORD_MODELS)
+                row = single_record_row(rng, model, start_time.date())
+                row.update(session_id=session_id, mentee_id=mentee_id)
+                record_rows[model].append(row)
+    for model, rows in record_rows.items():
+        load(model, rows)
+    del record_rows
+
+    sessions_by_batch = {}
+    for session_id, batch_id, _ in completed_sessions:
+        sessions_by_batch.setdefault(batch_id, []).append(session_id)
+
+    def mark_rows():
+        for batch_id, member_ids in batch_mentees.items():
+            batch_sessions = sessions_by_batch.get(batch_id)
+            if not batch_sessions:
+                continue
+            for mentee_id in member_ids:
+                for semester in range(1, semesters + 1):
+                    session_id = batch_sessions[min(len(batch_sessions) - 1, (semester - 1) * len(batch_sessions) // semesters)]
+                    gpa = round(rng.uniform(5, 10), 2)
+                    for subject in range(1, subjects_per_semester + 1):
+                        cia = [round(rng.uniform(10, 25), 1) for _ in range(3)]
+                        yield {'session_id': session_id, 'mentee_id': mentee_id, 'semester': f"Semester {semester}",
+                               'subject_code_name': f"CS{semester}{subject:02d} Subject {subject}",
+                               'cia_1': cia[0], 'cia_2': cia[1], 'cia_3': cia[2], 'overall_cia': round(sum(cia) / 3, 1),
+                               'ese_attempt_1': round(rng.uniform(30, 100), 1), 'grade': rng.choice(GRADES),
+                               'attendance_percentage': round(rng.uniform(65, 100), 1), 'gpa': gpa, 'cgpa': gpa}
+    load(AcademicSemesterMarkDetails, mark_rows())
+
+    notification_start = datetime.combine(first_week, datetime.min.time(), tzinfo=timezone.utc)
+    notification_span = int(timedelta(weeks=past_weeks or 1).total_seconds())
+    load(Notification, (
+        {'user_id': user_id, 'message': rng.choice(['Your leave request has been Approved.', 'A new session has been scheduled.',
+                                                    'Your mentor has updated your records.']),
+         'is_read': rng.random() < 0.7, 'timestamp': notification_start + timedelta(seconds=rng.randint(0, notification_span))}
+        for user_id in mentor_ids + mentee_ids
+        for _ in range(notifications_per_user)
+    ))
+
+    reset_id_sequences([User, Class, Batch, MentorAssignment, Session])
+    return counts
@@ -0,0 +1,64 @@
+"""Per-report render time with and without the shared ReportPDF resources.
+
+    python -m benchmarks.report_render [--reports 20] [--rounds 3]
+
+"cold" clears the process-level font/watermark registry before every report, which is what each report paid
+before the registry existed; "warm" parses them once and reuses them. Data is loaded up front, so only
+rendering is timed.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from .run import create_fixture_app
+
+def time_renders(report_data, cold):
+    from app.utils.report_generator import clear_report_resources, render_mentee_report
+
+    timings = []
+    for data in report_data:
+        if cold:
+            clear_report_resources()
+        started = time.perf_counter()
+        render_mentee_report(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=20, help='Mentee reports rendered per round.')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_fixture_app(os.path.join(tmp_dir, 'benchmark.db'))
+        with app.app_context():
+            from app import db
+            from app.models import MenteeProfile
+            from app.utils.report_generator import load_mentee_report_data, render_mentee_report
+
+            user_ids = [user_id for user_id, in db.session.query(MenteeProfile.user_id)
+                        .order_by(MenteeProfile.user_id).limit(args.reports)]
+            report_data = [load_mentee_report_data(user_ids)[user_id] for user_id in user_ids]
+            render_mentee_report(report_data[0])
+
+            results = {'cold': [], 'warm': []}
+            for _ in range(args.rounds):
+                for mode in ('cold', 'warm'):
+                    results[mode].extend(time_renders(report_data, cold=(mode == 'cold')))
+
+            for mode, timings in results.items():
+                print(f"{mode:5s} {len(timings):4d} reports  mean {statistics.mean(timings):7.2f} ms  "
+                      f"p50 {statistics.median(timings):7.2f} ms  min {min(timings):7.2f} ms")
+            saved = statistics.median(results['cold']) - statistics.median(results['warm'])
+            print(f"Shared resources save {saved:.2f} ms per report "
+                  f"({saved / statistics.median(results['cold']) * 100:.1f}%).")
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Endpoint benchmarks against a seeded SQLite fixture.
+
+    python -m benchmarks.run record [--output benchmarks/baseline.json]
+    python -m benchmarks.run compare [--baseline benchmarks/baseline.json] [--gate-latency --latency-tolerance 25]
+
+record writes p50/p95 latency, query count and peak traced memory per endpoint. compare reruns the suite
+and exits non-zero when an endpoint runs more queries than its baseline budget. Query counts are
+deterministic; latency depends on the machine, so p95 changes are only reported unless --gate-latency is
+given, which needs at least MIN_LATENCY_ITERATIONS iterations and fails when p95 grows by more than the
+tolerance (in percent).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# Fewer timed requests than this make p95 too noisy to fail a run on.
+MIN_LATENCY_ITERATIONS = 100
+FIXTURE = dict(seed=7, classes=6, mentees=600, mentors=12, weeks=40, batch_size=25, anchor_date=date(2026, 1, 5))
+
+def create_fixture_app(db_path):
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_path}"
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ['REPORT_CACHE_FOLDER'] = os.path.join(os.path.dirname(db_path), 'report_cache')
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import create_app, db
+    from app.models import User
+    from app.utils.synthetic_data import generate_synthetic_data
+
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+        generate_synthetic_data(echo=lambda message: None, **FIXTURE)
+        admin = User(name='Benchmark Admin', email='admin@benchmark.local', role='admin')
+        admin.set_password('admin')
+        db.session.add(admin)
+        db.session.commit()
+    return app
+
+def pick_fixture_ids(app):
+    from app import db
+    from app.models import User, Batch, MentorAssignment, Session, MenteeProfile
+
+    with app.app_context():
+        admin_id = db.session.query(User.id).filter_by(role='admin').scalar()
+        batch = Batch.query.order_by(Batch.id).first()
+        assignment = MentorAssignment.query.filter_by(batch_id=batch.id, is_active=True).first()
+        session = Session.query.filter_by(mentor_assignment_id=assignment.id, status='Completed').order_by(Session.id).first()
+        mentee_id = db.session.query(MenteeProfile.user_id).filter_by(batch_id=batch.id).order_by(MenteeProfile.user_id).limit(1).scalar()
+        return dict(admin=admin_id, mentor=assignment.mentor_id, mentee=mentee_id,
+                    class_id=batch.class_id, batch_id=batch.id, session_id=session.id)
+
+# Cases that clear the report cache before every request, so they measure a render rather than a cache hit.
+UNCACHED_CASES = {'admin.download_mentee_report (uncached)'}
+
+def benchmark_cases(ids):
+    """(name, role, endpoint, url kwargs) for every endpoint under budget."""
+    return [
+        ('api.filter_users', 'admin', 'api.filter_users', {'role': 'mentee', 'class_id': ids['class_id']}),
+        ('admin.manage_classes', 'admin', 'admin.manage_classes', {}),
+        ('admin.manage_class', 'admin', 'admin.manage_class', {'class_id': ids['class_id']}),
+        ('admin.session_details', 'admin', 'admin.session_details', {'session_id': ids['session_id']}),
+        ('mentor.sessions', 'mentor', 'mentor.sessions', {}),
+        ('mentee.dashboard', 'mentee', 'mentee.dashboard', {}),
+        ('api.get_session_records', 'mentor', 'api.get_session_records', {'session_id': ids['session_id'], 'mentee_id': ids['mentee']}),
+        ('admin.download_mentee_report', 'admin', 'admin.download_mentee_report', {'user_id': ids['mentee']}),
+        ('admin.download_mentee_report (uncached)', 'admin', 'admin.download_mentee_report', {'user_id': ids['mentee']}),
+        ('mentor.download_report', 'mentor', 'mentor.download_report', {'user_id': ids['mentee']}),
+        ('mentee.download_mentee_full_report', 'mentee', 'mentee.download_mentee_full_report', {}),
+    ]
+
+def logged_in_client(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+    return client
+
+def run_suite(iterations, warmup):
+    from flask import url_for
+    from sqlalchemy import event
+    from app import db
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_fixture_app(os.path.join(tmp_dir, 'benchmark.db'))
+        ids = pick_fixture_ids(app)
+        with app.app_context():
+            engine = db.engine
+        query_counter = {'count': 0}
+
+        def count_query(*args):
+            query_counter['count'] += 1
+        event.listen(engine, 'before_cursor_execute', count_query)
+
+        results = {}
+        for name, role, endpoint, url_kwargs in benchmark_cases(ids):
+            with app.test_request_context():
+                url = url_for(endpoint, **url_kwargs)
+            client = logged_in_client(app, ids[role])
+
+            def prepare():
+                if name in UNCACHED_CASES:
+                    shutil.rmtree(app.config['REPORT_CACHE_FOLDER'], ignore_errors=True)
+
+            for _ in range(warmup):
+                prepare()
+                client.get(url)
+
+            prepare()
+            query_counter['count'] = 0
+            response = client.get(url)
+            queries = query_counter['count']
+            if response.status_code != 200:
+                raise RuntimeError(f"{name} returned HTTP {response.status_code} for {url}")
+
+            timings = []
+            for _ in range(iterations):
+                prepare()
+                started = time.perf_counter()
+                client.get(url).get_data()
+                timings.append((time.perf_counter() - started) * 1000)
+
+            prepare()
+            tracemalloc.start()
+            client.get(url).get_data()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            timings.sort()
+            results[name] = {
+                'url': url,
+                'queries': queries,
+                'p50_ms': round(statistics.median(timings), 2),
+                'p95_ms': round(timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))], 2),
+                'peak_kib': round(peak / 1024, 1),
+            }
+            print(f"{name:40s} {queries:5d} queries  p50 {results[name]['p50_ms']:8.2f} ms  "
+                  f"p95 {results[name]['p95_ms']:8.2f} ms  peak {results[name]['peak_kib']:9.1f} KiB")
+
+        event.remove(engine, 'before_cursor_execute', count_query)
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    return results
+
+def compare_results(baseline, current, latency_tolerance, gate_latency=False):
+    """Returns (regressions, notes). Regressions fail the run and are empty when every endpoint is within
+    budget; notes report p95 growth beyond the tolerance that is not gated."""
+    regressions, notes = [], []
+    for name, base in baseline['endpoints'].items():
+        result = current.get(name)
+        if result is None:
+            regressions.append(f"{name}: missing from the current run")
+            continue
+        if result['queries'] > base['queries']:
+            regressions.append(f"{name}: {result['queries']} queries, budget is {base['queries']}")
+        latency_limit = base['p95_ms'] * (1 + latency_tolerance / 100)
+        if result['p95_ms'] > latency_limit:
+            message = (f"{name}: p95 {result['p95_ms']} ms, limit is {latency_limit:.2f} ms "
+                       f"({base['p95_ms']} ms + {latency_tolerance}%)")
+            (regressions if gate_latency else notes).append(message)
+    return regressions, notes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', choices=['record', 'compare'])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--output', default=BASELINE_PATH, help='Where record writes the baseline.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline compare reads.')
+    parser.add_argument('--latency-tolerance', type=float, default=25.0, help='Allowed p95 growth in percent.')
+    parser.add_argument('--gate-latency', action='store_true',
+                        help='Fail compare on p95 growth as well as on query counts.')
+    args = parser.parse_args(argv)
+    if args.mode == 'compare' and args.gate_latency and args.iterations < MIN_LATENCY_ITERATIONS:
+        parser.error(f"--gate-latency needs --iterations {MIN_LATENCY_ITERATIONS} or more.")
+
+    results = run_suite(args.iterations, args.warmup)
+
+    if args.mode == 'record':
+        baseline = {
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'fixture': {key: str(value) for key, value in FIXTURE.items()},
+            'iterations': args.iterations,
+            'endpoints': results,
+        }
+        with open(args.output, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.output}")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions, notes = compare_results(baseline, results, args.latency_tolerance, args.gate_latency)
+    if notes:
+        print("Latency above tolerance (not gated; baselines are machine-specific):")
+        for message in notes:
+            print(f"  {message}")
+    if regressions:
+        print("Regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("All endpoints are within their query budget" + (" and latency tolerance." if args.gate_latency else "."))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
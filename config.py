@@ -9,4 +9,22 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
-    SOCKETIO_KWARGS = {'cors_allowed_origins': '*'}
\ No newline at end of file
+    SOCKETIO_KWARGS = {'cors_allowed_origins': '*'}
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    SQL_REPEAT_WARN_THRESHOLD = int(os.environ.get('SQL_REPEAT_WARN_THRESHOLD', 10))
+    REPORT_EXPORT_WORKERS = int(os.environ.get('REPORT_EXPORT_WORKERS', 0)) or None
+    IMPORT_HASH_WORKERS = int(os.environ.get('IMPORT_HASH_WORKERS', 0)) or None
+    IMPORT_STAGING_TTL = int(os.environ.get('IMPORT_STAGING_TTL', 60 * 60))
+    SESSION_DURATION_MINUTES = int(os.environ.get('SESSION_DURATION_MINUTES', 60))
+    SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', 60))
+    MAINTENANCE_INTERVAL = int(os.environ.get('MAINTENANCE_INTERVAL', 60 * 60))
+    SYNC_OPERATION_RETENTION = int(os.environ.get('SYNC_OPERATION_RETENTION', 7 * 24 * 60 * 60))
+    SESSION_CHANGE_RETENTION = int(os.environ.get('SESSION_CHANGE_RETENTION', 24 * 60 * 60))
+    SCHEDULER_JITTER = float(os.environ.get('SCHEDULER_JITTER', 0.1))
+    SCHEDULER_LOCK_RETRY = int(os.environ.get('SCHEDULER_LOCK_RETRY', 30))
+    REPORT_CACHE_FOLDER = os.environ.get('REPORT_CACHE_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'reports')
+    REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    REPORT_CACHE_SCAN_EVERY = int(os.environ.get('REPORT_CACHE_SCAN_EVERY', 100))
+    REPORT_JOB_FOLDER = os.environ.get('REPORT_JOB_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'report_jobs')
+    REPORT_JOB_TTL = int(os.environ.get('REPORT_JOB_TTL', 24 * 60 * 60))
+    REPORT_JOB_STALE_AFTER = int(os.environ.get('REPORT_JOB_STALE_AFTER', 15 * 60))
\ No newline at end of file
@@ -1,35 +1,23 @@
 from dotenv import load_dotenv
 import click
-from datetime import datetime, timedelta, timezone
 
 load_dotenv()
 
 from app import create_app, db
-from app.models import Session
+from app.utils.scheduling import sweep_missed_sessions
 
 app = create_app()
 
 @app.cli.command("update-sessions")
 def update_session_statuses():
-    now = datetime.now(timezone.utc)
-    one_hour_ago = now - timedelta(hours=1)
-
-    missed_sessions = Session.query.filter(
-        Session.status == 'Upcoming',
-        Session.start_time < one_hour_ago
-    ).all()
-
-    if not missed_sessions:
-        click.echo("No sessions to update.")
-        return
-
-    for session in missed_sessions:
-        session.status = 'Missed'
-        click.echo(f"Marked session ID {session.id} for batch {session.assignment.batch.name} as Missed.")
-    
+    """Marks overdue Upcoming sessions as Missed once. `flask scheduler run` does this continuously."""
     try:
-        db.session.commit()
-        click.echo(f"Successfully updated {len(missed_sessions)} sessions.")
+        session_ids = sweep_missed_sessions()
     except Exception as e:
         db.session.rollback()
-        click.echo(f"An error occurred: {e}")
\ No newline at end of file
+        click.echo(f"An error occurred: {e}")
+        return
+    if not session_ids:
+        click.echo("No sessions to update.")
+        return
+    click.echo(f"Successfully marked {len(session_ids)} sessions as Missed.")
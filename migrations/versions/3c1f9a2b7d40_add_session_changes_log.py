@@ -0,0 +1,37 @@
+"""Add session_changes log for live session snapshot deltas
+
+Revision ID: 3c1f9a2b7d40
+Revises: 8fef205bc98a
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a2b7d40'
+down_revision = '8fef205bc98a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('session_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('mentee_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['mentee_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('session_changes', schema=None) as batch_op:
+        batch_op.create_index('ix_session_changes_session_id_id', ['session_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('session_changes', schema=None) as batch_op:
+        batch_op.drop_index('ix_session_changes_session_id_id')
+
+    op.drop_table('session_changes')
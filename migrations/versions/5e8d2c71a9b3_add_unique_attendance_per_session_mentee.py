@@ -0,0 +1,31 @@
+"""Add unique (session_id, mentee_id) constraint on attendance_records
+
+Revision ID: 5e8d2c71a9b3
+Revises: 3c1f9a2b7d40
+Create Date: 2026-10-18 11:04:52.871330
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8d2c71a9b3'
+down_revision = '3c1f9a2b7d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the latest row for any (session_id, mentee_id) pair before enforcing uniqueness.
+    op.execute(
+        "DELETE FROM attendance_records WHERE id NOT IN "
+        "(SELECT MAX(id) FROM attendance_records GROUP BY session_id, mentee_id)"
+    )
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.create_unique_constraint('_attendance_session_mentee_uc', ['session_id', 'mentee_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.drop_constraint('_attendance_session_mentee_uc', type_='unique')
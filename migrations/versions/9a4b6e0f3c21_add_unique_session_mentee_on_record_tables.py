@@ -0,0 +1,43 @@
+"""Add unique (session_id, mentee_id) constraints on single-record tables
+
+Revision ID: 9a4b6e0f3c21
+Revises: 5e8d2c71a9b3
+Create Date: 2026-10-18 11:48:09.113562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4b6e0f3c21'
+down_revision = '5e8d2c71a9b3'
+branch_labels = None
+depends_on = None
+
+SINGLE_RECORD_TABLES = {
+    'placement_information': '_placement_session_mentee_uc',
+    'research_records': '_research_session_mentee_uc',
+    'mentor_meeting_details': '_meeting_session_mentee_uc',
+    'awards_and_achievements': '_awards_session_mentee_uc',
+    'cocurricular_activity_records': '_cocurricular_session_mentee_uc',
+    'extracurricular_activity_records': '_extracurricular_session_mentee_uc',
+    'internship_information': '_internship_session_mentee_uc',
+}
+
+
+def upgrade():
+    for table_name, constraint_name in SINGLE_RECORD_TABLES.items():
+        # The API only ever kept one row per (session_id, mentee_id); drop older duplicates left by concurrent saves.
+        op.execute(
+            f"DELETE FROM {table_name} WHERE id NOT IN "
+            f"(SELECT MAX(id) FROM {table_name} GROUP BY session_id, mentee_id)"
+        )
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_unique_constraint(constraint_name, ['session_id', 'mentee_id'])
+
+
+def downgrade():
+    for table_name, constraint_name in SINGLE_RECORD_TABLES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_constraint(constraint_name, type_='unique')
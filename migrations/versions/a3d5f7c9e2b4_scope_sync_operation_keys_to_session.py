@@ -0,0 +1,44 @@
+"""Make sync operation idempotency keys unique per session
+
+Revision ID: a3d5f7c9e2b4
+Revises: f1a6c3e8d027
+Create Date: 2026-10-18 21:32:17.604913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d5f7c9e2b4'
+down_revision = 'f1a6c3e8d027'
+branch_labels = None
+depends_on = None
+
+
+# The original constraint was unnamed. PostgreSQL named it itself; on SQLite the batch copy names the
+# reflected constraint through this convention so it can be dropped.
+NAMING_CONVENTION = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+
+def _global_key_constraint_name():
+    if op.get_bind().dialect.name == 'postgresql':
+        return 'sync_operations_idempotency_key_key'
+    return 'uq_sync_operations_idempotency_key'
+
+
+def upgrade():
+    with op.batch_alter_table('sync_operations', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(_global_key_constraint_name(), type_='unique')
+        batch_op.create_unique_constraint('_sync_operation_session_key_uc', ['session_id', 'idempotency_key'])
+
+
+def downgrade():
+    # A key may now repeat across sessions; keep the oldest row of each before making keys global again.
+    op.execute(
+        "DELETE FROM sync_operations WHERE id NOT IN "
+        "(SELECT MIN(id) FROM sync_operations GROUP BY idempotency_key)"
+    )
+    with op.batch_alter_table('sync_operations', schema=None) as batch_op:
+        batch_op.drop_constraint('_sync_operation_session_key_uc', type_='unique')
+        batch_op.create_unique_constraint(_global_key_constraint_name(), ['idempotency_key'])
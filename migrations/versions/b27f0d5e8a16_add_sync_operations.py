@@ -0,0 +1,38 @@
+"""Add sync_operations for idempotent live session sync
+
+Revision ID: b27f0d5e8a16
+Revises: 9a4b6e0f3c21
+Create Date: 2026-10-18 12:37:44.590216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27f0d5e8a16'
+down_revision = '9a4b6e0f3c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sync_operations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('idempotency_key', sa.String(length=64), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('idempotency_key')
+    )
+    with op.batch_alter_table('sync_operations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sync_operations_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sync_operations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sync_operations_created_at'))
+
+    op.drop_table('sync_operations')
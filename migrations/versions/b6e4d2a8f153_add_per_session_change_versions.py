@@ -0,0 +1,50 @@
+"""Version session changes with a per-session counter
+
+Revision ID: b6e4d2a8f153
+Revises: a3d5f7c9e2b4
+Create Date: 2026-10-18 22:05:41.228739
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e4d2a8f153'
+down_revision = 'a3d5f7c9e2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_version', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('session_changes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=True))
+
+    # Number each session's existing changes 1, 2, ... in id order, so versions are contiguous from the start.
+    op.execute(
+        "UPDATE session_changes SET version = ("
+        "SELECT numbered.version FROM ("
+        "SELECT id, ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY id) AS version FROM session_changes"
+        ") numbered WHERE numbered.id = session_changes.id)"
+    )
+    op.execute(
+        "UPDATE sessions SET change_version = "
+        "(SELECT MAX(version) FROM session_changes WHERE session_changes.session_id = sessions.id) "
+        "WHERE id IN (SELECT session_id FROM session_changes)"
+    )
+
+    with op.batch_alter_table('session_changes', schema=None) as batch_op:
+        batch_op.alter_column('version', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_index('ix_session_changes_session_id_id')
+        batch_op.create_index('ix_session_changes_session_id_version', ['session_id', 'version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('session_changes', schema=None) as batch_op:
+        batch_op.drop_index('ix_session_changes_session_id_version')
+        batch_op.create_index('ix_session_changes_session_id_id', ['session_id', 'id'], unique=False)
+        batch_op.drop_column('version')
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_column('change_version')
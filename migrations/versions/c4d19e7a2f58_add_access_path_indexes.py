@@ -0,0 +1,52 @@
+"""Add composite indexes for session/mentee access paths
+
+Revision ID: c4d19e7a2f58
+Revises: b27f0d5e8a16
+Create Date: 2026-10-18 14:05:42.760391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d19e7a2f58'
+down_revision = 'b27f0d5e8a16'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns, extra create_index kwargs)
+INDEXES = [
+    ('ix_placement_information_mentee_id_session_id', 'placement_information', ['mentee_id', 'session_id'], {}),
+    ('ix_research_records_mentee_id_session_id', 'research_records', ['mentee_id', 'session_id'], {}),
+    ('ix_mentor_meeting_details_mentee_id_session_id', 'mentor_meeting_details', ['mentee_id', 'session_id'], {}),
+    ('ix_awards_and_achievements_mentee_id_session_id', 'awards_and_achievements', ['mentee_id', 'session_id'], {}),
+    ('ix_cocurricular_activity_records_mentee_id_session_id', 'cocurricular_activity_records', ['mentee_id', 'session_id'], {}),
+    ('ix_extracurricular_activity_records_mentee_id_session_id', 'extracurricular_activity_records', ['mentee_id', 'session_id'], {}),
+    ('ix_internship_information_mentee_id_session_id', 'internship_information', ['mentee_id', 'session_id'], {}),
+    ('ix_academic_semester_mark_details_session_id_mentee_id', 'academic_semester_mark_details', ['session_id', 'mentee_id'], {}),
+    ('ix_academic_semester_mark_details_mentee_id_semester', 'academic_semester_mark_details', ['mentee_id', 'semester'], {}),
+    ('ix_honors_minor_marks_details_session_id_mentee_id', 'honors_minor_marks_details', ['session_id', 'mentee_id'], {}),
+    ('ix_honors_minor_marks_details_mentee_id_semester', 'honors_minor_marks_details', ['mentee_id', 'semester'], {}),
+    ('ix_attendance_records_mentee_id', 'attendance_records', ['mentee_id'], {}),
+    ('ix_leave_requests_session_id_mentee_id', 'leave_requests', ['session_id', 'mentee_id'], {}),
+    ('ix_leave_requests_mentee_id', 'leave_requests', ['mentee_id'], {}),
+    ('ix_sessions_mentor_assignment_id_start_time', 'sessions', ['mentor_assignment_id', 'start_time'], {}),
+    ('ix_mentor_assignments_batch_id_is_active', 'mentor_assignments', ['batch_id', 'is_active'], {}),
+    ('ix_mentor_assignments_active_batch_id', 'mentor_assignments', ['batch_id'],
+     {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}),
+]
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction, so build the indexes in autocommit mode.
+    # Other dialects ignore the postgresql_concurrently flag.
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns, kwargs in INDEXES:
+            op.create_index(index_name, table_name, columns, unique=False, postgresql_concurrently=True, **kwargs)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns, kwargs in reversed(INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
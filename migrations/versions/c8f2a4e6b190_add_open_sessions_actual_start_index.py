@@ -0,0 +1,31 @@
+"""Add a partial index on the actual start time of open sessions
+
+Revision ID: c8f2a4e6b190
+Revises: b6e4d2a8f153
+Create Date: 2026-10-18 23:41:26.907354
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2a4e6b190'
+down_revision = 'b6e4d2a8f153'
+branch_labels = None
+depends_on = None
+
+
+OPEN_STATUSES = sa.text("status IN ('Upcoming', 'In Progress')")
+
+
+def upgrade():
+    # Started sessions stay Live until they are ended, so live lookups also reach them through this index.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sessions_open_actual_start_time', 'sessions', ['actual_start_time'], unique=False,
+                        postgresql_concurrently=True, postgresql_where=OPEN_STATUSES, sqlite_where=OPEN_STATUSES)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sessions_open_actual_start_time', table_name='sessions', postgresql_concurrently=True)
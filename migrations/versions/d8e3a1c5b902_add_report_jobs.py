@@ -0,0 +1,51 @@
+"""Add report_jobs for the background report queue
+
+Revision ID: d8e3a1c5b902
+Revises: c4d19e7a2f58
+Create Date: 2026-10-18 16:21:09.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e3a1c5b902'
+down_revision = 'c4d19e7a2f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_type', sa.String(length=50), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('total_items', sa.Integer(), nullable=False),
+    sa.Column('completed_items', sa.Integer(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('artifact_path', sa.String(length=255), nullable=True),
+    sa.Column('artifact_name', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_report_jobs_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index('ix_report_jobs_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index('ix_report_jobs_requested_by', ['requested_by'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_jobs_requested_by')
+        batch_op.drop_index('ix_report_jobs_status_id')
+        batch_op.drop_index(batch_op.f('ix_report_jobs_expires_at'))
+
+    op.drop_table('report_jobs')
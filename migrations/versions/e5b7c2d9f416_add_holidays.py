@@ -0,0 +1,30 @@
+"""Add holidays for the institution calendar
+
+Revision ID: e5b7c2d9f416
+Revises: d8e3a1c5b902
+Create Date: 2026-10-18 19:02:44.531870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c2d9f416'
+down_revision = 'd8e3a1c5b902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('holidays',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('date')
+    )
+
+
+def downgrade():
+    op.drop_table('holidays')
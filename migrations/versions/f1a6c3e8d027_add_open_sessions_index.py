@@ -0,0 +1,31 @@
+"""Add a partial index on the start time of open sessions
+
+Revision ID: f1a6c3e8d027
+Revises: e5b7c2d9f416
+Create Date: 2026-10-18 20:14:09.318552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a6c3e8d027'
+down_revision = 'e5b7c2d9f416'
+branch_labels = None
+depends_on = None
+
+
+OPEN_STATUSES = sa.text("status IN ('Upcoming', 'In Progress')")
+
+
+def upgrade():
+    # Built concurrently, like the other access-path indexes, so a large sessions table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sessions_open_start_time', 'sessions', ['start_time'], unique=False,
+                        postgresql_concurrently=True, postgresql_where=OPEN_STATUSES, sqlite_where=OPEN_STATUSES)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sessions_open_start_time', table_name='sessions', postgresql_concurrently=True)